@@ -0,0 +1,87 @@
+"""취소 가능한 백그라운드 분석 작업 관리 (가장 최근 작업의 결과만 전달)"""
+import threading
+
+class AnalysisCancelled(Exception):
+    """작업이 취소되어 중단됨"""
+    def __init__(self):
+        super().__init__("작업이 취소되었습니다.")
+
+class CancelToken:
+    """작업 취소 요청 표시. 작업은 단계/청크 사이마다 check()를 호출합니다."""
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """취소 요청이 있으면 AnalysisCancelled 발생"""
+        if self._event.is_set():
+            raise AnalysisCancelled()
+
+class JobManager:
+    """
+    작업을 백그라운드 스레드에서 실행합니다. 작업마다 번호와 취소 토큰을 부여하고,
+    새 작업을 시작하면 이전 작업을 취소합니다. 완료 콜백은 메인 스레드에서 실행되며
+    그사이 새 작업이 시작되었거나 취소된 작업의 결과는 버립니다.
+    """
+    def __init__(self, dispatch):
+        self.dispatch = dispatch  # 메인 스레드에서 함수 실행을 예약하는 함수 (예: lambda f: root.after(0, f))
+        self._lock = threading.Lock()
+        self._job_id = 0
+        self._token = None
+
+    @property
+    def running(self):
+        with self._lock:
+            return self._token is not None
+
+    def submit(self, work, on_done, on_error=None, cleanup=None):
+        """
+        work(token)을 백그라운드에서 실행하고 작업 번호를 반환합니다.
+        on_done(결과)/on_error(예외)는 이 작업이 여전히 최신일 때만 호출되고,
+        cleanup()은 결과를 버리는 경우에도 항상 호출됩니다. (진행 창 닫기 등)
+        """
+        with self._lock:
+            if self._token is not None:
+                self._token.cancel()
+            self._job_id += 1
+            job_id = self._job_id
+            token = self._token = CancelToken()
+
+        def run():
+            try:
+                result = work(token)
+            except AnalysisCancelled:
+                self.dispatch(lambda: self._finish(job_id, cleanup, None))
+            except Exception as e:
+                # except 블록이 끝나면 e가 지워지므로 예약하는 함수에 값으로 묶어 둠
+                self.dispatch(lambda error=e: self._finish(job_id, cleanup, on_error, error))
+            else:
+                self.dispatch(lambda: self._finish(job_id, cleanup, on_done, result))
+
+        threading.Thread(target=run, daemon=True).start()
+        return job_id
+
+    def cancel(self):
+        """실행 중인 작업 취소 (이후 도착하는 결과는 버려짐)"""
+        with self._lock:
+            if self._token is not None:
+                self._token.cancel()
+                self._token = None
+                self._job_id += 1
+
+    def _finish(self, job_id, cleanup, callback, *args):
+        """메인 스레드에서 실행: 최신 작업의 결과만 콜백으로 전달"""
+        if cleanup:
+            cleanup()
+        with self._lock:
+            if job_id != self._job_id:
+                return # 더 새로운 작업이 있거나 취소된 작업
+            self._token = None
+        if callback:
+            callback(*args)
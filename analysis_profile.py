@@ -0,0 +1,191 @@
+"""분석 단계별 소요 시간/처리 행 수/메모리 사용량 측정 (선택 기능)"""
+import json
+import time
+import threading
+from datetime import datetime
+
+# 표시 순서 및 이름
+STAGE_LABELS = {
+    'encoding': '인코딩 감지',
+    'read': '파일 읽기',
+    'date_filter': '날짜 필터',
+    'columns': '컬럼 찾기',
+    'cleaning': '값 정리',
+    'groupby': '그룹 집계',
+    'formatting': '결과 변환',
+}
+
+class StageProfile:
+    """한 단계의 누적 측정값 (스트리밍처럼 여러 번 실행되면 합산)"""
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.rows_in = 0
+        self.rows_out = 0
+        self.peak_bytes = 0
+
+    def rows(self, rows_in=None, rows_out=None):
+        """처리한 입력/출력 행 수 기록"""
+        if rows_in is not None:
+            self.rows_in += int(rows_in)
+        if rows_out is not None:
+            self.rows_out += int(rows_out)
+
+    @property
+    def rows_per_s(self):
+        rows = self.rows_in or self.rows_out
+        return rows / self.seconds if rows and self.seconds > 0 else None
+
+    def to_dict(self):
+        return {
+            'stage': self.name,
+            'calls': self.calls,
+            'seconds': round(self.seconds, 6),
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'rows_per_s': round(self.rows_per_s) if self.rows_per_s else None,
+            'peak_bytes': self.peak_bytes,
+        }
+
+class _NullStage:
+    """측정하지 않을 때 사용하는 빈 단계 (호출 비용만 있음)"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def rows(self, rows_in=None, rows_out=None):
+        pass
+
+NULL_STAGE = _NullStage()
+
+# tracemalloc은 프로세스 전체에 하나뿐이므로 메모리를 측정 중인 분석 수를 세어,
+# 측정이 직접 시작한 추적은 마지막 측정이 끝날 때만 중지합니다.
+_tracing_lock = threading.Lock()
+_tracing_profiles = 0
+_started_tracing = False
+
+def _begin_tracing():
+    global _tracing_profiles, _started_tracing
+    # 메모리 측정을 쓸 때만 불러옴 (pickle 등을 함께 불러와 프로그램 시작을 늦추지 않도록)
+    import tracemalloc
+    with _tracing_lock:
+        if _tracing_profiles == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _tracing_profiles += 1
+
+def _end_tracing():
+    global _tracing_profiles, _started_tracing
+    import tracemalloc
+    with _tracing_lock:
+        _tracing_profiles -= 1
+        if _tracing_profiles == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+def _reset_peak():
+    """
+    최대 메모리 초기화. 측정 중인 분석이 이것 하나이고 추적도 직접 시작한 경우에만 초기화합니다.
+    (다른 분석이나 외부에서 시작한 추적의 최대값을 지우지 않도록, 그 밖에는 이전 최대값이 포함될 수 있음)
+    """
+    import tracemalloc
+    with _tracing_lock:
+        if _tracing_profiles == 1 and _started_tracing and hasattr(tracemalloc, 'reset_peak'): # Python 3.9 이상
+            tracemalloc.reset_peak()
+
+class _StageTimer:
+    def __init__(self, profile, stage):
+        self.profile = profile
+        self.stage = stage
+
+    def __enter__(self):
+        if self.profile.trace_memory:
+            import tracemalloc
+            _reset_peak()
+            self._base = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+        return self.stage
+
+    def __exit__(self, *exc):
+        self.stage.seconds += time.perf_counter() - self._start
+        self.stage.calls += 1
+        if self.profile.trace_memory:
+            import tracemalloc
+            # 단계 시작 시점보다 추가로 사용한 최대 메모리
+            self.stage.peak_bytes = max(self.stage.peak_bytes, tracemalloc.get_traced_memory()[1] - self._base)
+        return False
+
+class AnalysisProfile:
+    """
+    분석 한 번의 단계별 측정 결과.
+    trace_memory가 True면 tracemalloc으로 단계별 최대 메모리를 측정합니다. (측정 중에는 분석이 느려짐)
+    """
+    def __init__(self, label, file_path=None, trace_memory=True):
+        self.label = label
+        self.file_path = file_path
+        self.started_at = datetime.now()
+        self.stages = {}
+        self.total_seconds = 0.0
+        self.trace_memory = trace_memory
+        self._tracing = False
+        self._start = None
+
+    def start(self):
+        if self.trace_memory and not self._tracing:
+            _begin_tracing()
+            self._tracing = True
+        self._start = time.perf_counter()
+        return self
+
+    def finish(self):
+        self.total_seconds = time.perf_counter() - self._start
+        if self._tracing:
+            _end_tracing()
+            self._tracing = False
+
+    def stage(self, name):
+        """단계 측정 컨텍스트 (with 블록 안에서 반환된 단계에 행 수 기록)"""
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = StageProfile(name)
+        return _StageTimer(self, stage)
+
+    def ordered_stages(self):
+        """파이프라인 순서로 정렬한 단계 목록 (알 수 없는 단계는 뒤에)"""
+        order = list(STAGE_LABELS)
+        return sorted(self.stages.values(),
+                      key=lambda stage: order.index(stage.name) if stage.name in order else len(order))
+
+    def to_dict(self):
+        return {
+            'label': self.label,
+            'file': self.file_path,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'total_seconds': round(self.total_seconds, 6),
+            'trace_memory': self.trace_memory,
+            'stages': [stage.to_dict() for stage in self.ordered_stages()],
+        }
+
+    def format_text(self):
+        """사람이 읽기 쉬운 표 형식"""
+        lines = [
+            f"[{self.started_at:%Y-%m-%d %H:%M:%S}] {self.label} - {self.file_path or ''}",
+            f"  전체 {self.total_seconds:.3f}초",
+            f"  {'단계':<10} {'횟수':>5} {'시간(초)':>10} {'입력 행':>12} {'출력 행':>12} {'행/초':>12} {'최대 메모리':>12}",
+        ]
+        for stage in self.ordered_stages():
+            rate = f"{stage.rows_per_s:,.0f}" if stage.rows_per_s else '-'
+            peak = f"{stage.peak_bytes / 1048576:,.1f} MB" if self.trace_memory else '-'
+            lines.append(
+                f"  {STAGE_LABELS.get(stage.name, stage.name):<10} {stage.calls:>5} {stage.seconds:>10.3f} "
+                f"{stage.rows_in:>12,} {stage.rows_out:>12,} {rate:>12} {peak:>12}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path):
+        """로그 파일에 JSON 한 줄로 추가"""
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.to_dict(), ensure_ascii=False) + "\n")
@@ -1,11 +1,17 @@
 import sys
 import os
 import json
+import time
+import shutil
+import hashlib
+import http.client
 import urllib.request
+import urllib.error
 import tempfile
 import zipfile
 import subprocess
 import logging
+from collections import deque
 from packaging.version import parse as parse_version
 
 # PyInstaller로 빌드된 실행 파일의 경로를 올바르게 찾기 위함
@@ -26,6 +32,27 @@ GH_OWNER = 'dionysus11-source'
 GH_REPO = 'stock-analyzer-2025'
 # Github Release에 포함된 배포용 압축 파일 이름
 RELEASE_ASSET_NAME = 'stock.zip'
+# 변경된 파일만 받는 증분 업데이트용 매니페스트 (파일별 SHA-256/크기).
+# 각 파일은 같은 릴리즈에 SHA-256 값을 이름으로 하는 에셋으로 첨부됨 (build_release_manifest 참고)
+MANIFEST_ASSET_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+# 업데이트 확인 요청 제한 시간 (초, 느리거나 끊긴 네트워크에서 무한 대기 방지)
+UPDATE_CHECK_TIMEOUT = 5
+RELEASES_API_URL = f"https://api.github.com/repos/{GH_OWNER}/{GH_REPO}/releases/latest"
+
+# 마지막 릴리즈 응답과 ETag/Last-Modified, 확인 시각 (updater.log와 같은 폴더)
+UPDATE_CACHE_FILE = os.path.join(APP_DIR, 'update_cache.json')
+# 마지막 확인 후 이 시간(초) 안에는 서버에 묻지 않고 저장된 응답 사용
+UPDATE_CHECK_TTL = 6 * 60 * 60
+# 업데이트 파일 다운로드 시 응답 대기 제한 시간(초) 및 한 번에 읽을 크기
+DOWNLOAD_TIMEOUT = 30
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+# 연결이 끊기면 받은 위치부터 이어받기를 다시 시도하는 횟수
+DOWNLOAD_RETRIES = 5
+# 받다 만 파일(.part)을 보관하는 폴더 (다음 업데이트 시도에서 이어받음)
+UPDATE_DOWNLOAD_DIR = os.path.join(tempfile.gettempdir(), 'stock-analyzer-update')
+# 다운로드 속도 계산에 사용할 최근 구간 (초)
+RATE_WINDOW_SECONDS = 5
 
 def get_current_version():
     """_version.py에서 현재 버전을 읽어옵니다."""
@@ -37,41 +64,128 @@ def get_current_version():
         logging.error(f"Could not import __version__: {e}")
         return "0.0.0"
 
-def check_for_updates():
+def load_update_cache(cache_file=None):
+    """저장된 릴리즈 응답 캐시를 읽습니다. 없거나 손상되었으면 None"""
+    cache_file = cache_file or UPDATE_CACHE_FILE
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if isinstance(cache, dict) and isinstance(cache.get('release'), dict):
+            return cache
+    except (OSError, ValueError):
+        pass
+    return None
+
+def save_update_cache(cache, cache_file=None):
+    """릴리즈 응답 캐시 저장 (임시 파일에 쓴 뒤 교체, 실패해도 업데이트 확인에는 영향 없음)"""
+    cache_file = cache_file or UPDATE_CACHE_FILE
+    tmp_path = f"{cache_file}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_file)
+    except OSError as e:
+        logging.warning(f"Could not save update cache: {e}")
+
+def _release_summary(release_data):
+    """캐시에 저장할 릴리즈 정보 (업데이트 확인에 필요한 항목만)"""
+    return {
+        'tag_name': release_data['tag_name'],
+        'body': release_data.get('body'),
+        'assets': [
+            {'name': asset['name'], 'browser_download_url': asset['browser_download_url'],
+             'size': asset.get('size'), 'digest': asset.get('digest')}
+            for asset in release_data.get('assets', [])
+        ],
+    }
+
+def fetch_latest_release(api_url=None, timeout=None, ttl=None, cache_file=None):
+    """
+    최신 릴리즈 정보를 반환합니다. (실패하면 None)
+    마지막 확인 후 ttl초가 지나지 않았으면 요청하지 않고 저장된 응답을 사용하고,
+    지났으면 저장된 ETag/Last-Modified로 조건부 요청을 보내 304(변경 없음)면 저장된 응답을 다시 사용합니다.
+    (Github는 304 응답을 요청 한도에 포함하지 않음)
+    인자를 생략하면 RELEASES_API_URL, UPDATE_CHECK_TIMEOUT, UPDATE_CHECK_TTL, UPDATE_CACHE_FILE을 사용합니다.
+    """
+    api_url = api_url or RELEASES_API_URL
+    timeout = UPDATE_CHECK_TIMEOUT if timeout is None else timeout
+    ttl = UPDATE_CHECK_TTL if ttl is None else ttl
+    cache = load_update_cache(cache_file)
+    now = time.time()
+    if cache and ttl and 0 <= now - cache.get('checked_at', 0) < ttl:
+        logging.info(f"Using cached release info (checked {now - cache['checked_at']:.0f}s ago, TTL {ttl}s)")
+        return cache['release']
+
+    headers = {'Accept': 'application/vnd.github+json'}
+    if cache and cache.get('etag'):
+        headers['If-None-Match'] = cache['etag']
+    if cache and cache.get('last_modified'):
+        headers['If-Modified-Since'] = cache['last_modified']
+
+    logging.info(f"Checking for updates at {api_url}")
+    try:
+        request = urllib.request.Request(api_url, headers=headers)
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            release_data = _release_summary(json.loads(response.read().decode()))
+            cache = {
+                'checked_at': now,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'release': release_data,
+            }
+    except urllib.error.HTTPError as e:
+        if e.code != 304 or not cache:
+            logging.error(f"Error checking for updates: HTTP {e.code}")
+            return None
+        logging.info("Release info not modified (HTTP 304), using cached response.")
+        cache['checked_at'] = now
+    except Exception as e:
+        logging.error(f"An error occurred while checking for updates: {e}", exc_info=True)
+        return None
+
+    save_update_cache(cache, cache_file)
+    return cache['release']
+
+def check_for_updates(timeout=None, ttl=None):
     """
     Github에서 새 릴리즈를 확인합니다.
     업데이트가 있으면 최신 버전 정보를 반환하고, 없으면 None을 반환합니다.
+    timeout(초, 기본 UPDATE_CHECK_TIMEOUT) 안에 응답이 없으면 실패로 기록하고 None을 반환합니다.
+    ttl(초, 기본 UPDATE_CHECK_TTL) 안에 다시 확인하면 저장된 응답을 사용합니다. (0이면 항상 서버에 확인)
     """
     current_version_str = get_current_version()
     current_version = parse_version(current_version_str)
 
-    api_url = f"https://api.github.com/repos/{GH_OWNER}/{GH_REPO}/releases/latest"
-    logging.info(f"Checking for updates at {api_url}")
+    release_data = fetch_latest_release(timeout=timeout, ttl=ttl)
+    if release_data is None:
+        return None
 
     try:
-        with urllib.request.urlopen(api_url) as response:
-            if response.status != 200:
-                logging.error(f"Error checking for updates: HTTP {response.status}")
-                return None
-            
-            release_data = json.loads(response.read().decode())
-            latest_version_str = release_data['tag_name'].lstrip('v')
-            latest_version = parse_version(latest_version_str)
-
-            logging.info(f"Current version: {current_version}, Latest version: {latest_version}")
-
-            if latest_version > current_version:
-                logging.info("New version found.")
-                for asset in release_data['assets']:
-                    if asset['name'] == RELEASE_ASSET_NAME:
-                        logging.info(f"Found release asset '{RELEASE_ASSET_NAME}' with download URL.")
-                        return {
-                            "latest_version": latest_version_str,
-                            "download_url": asset['browser_download_url'],
-                            "release_notes": release_data['body']
-                        }
-                logging.error(f"Release asset '{RELEASE_ASSET_NAME}' not found in the latest release.")
-                return None
+        latest_version_str = release_data['tag_name'].lstrip('v')
+        latest_version = parse_version(latest_version_str)
+
+        logging.info(f"Current version: {current_version}, Latest version: {latest_version}")
+
+        if latest_version > current_version:
+            logging.info("New version found.")
+            assets = {asset['name']: asset for asset in release_data['assets']}
+            if RELEASE_ASSET_NAME in assets:
+                logging.info(f"Found release asset '{RELEASE_ASSET_NAME}' with download URL.")
+                if MANIFEST_ASSET_NAME in assets:
+                    logging.info(f"Found release manifest '{MANIFEST_ASSET_NAME}' (delta update available).")
+                archive = assets[RELEASE_ASSET_NAME]
+                # Github는 에셋의 SHA-256을 'sha256:...' 형식의 digest로 제공 (없으면 크기만 확인)
+                digest = archive.get('digest') or ''
+                return {
+                    "latest_version": latest_version_str,
+                    "download_url": archive['browser_download_url'],
+                    "download_size": archive.get('size'),
+                    "download_sha256": digest[len('sha256:'):] if digest.startswith('sha256:') else None,
+                    "manifest_url": assets[MANIFEST_ASSET_NAME]['browser_download_url'] if MANIFEST_ASSET_NAME in assets else None,
+                    "release_notes": release_data['body']
+                }
+            logging.error(f"Release asset '{RELEASE_ASSET_NAME}' not found in the latest release.")
+            return None
 
     except Exception as e:
         logging.error(f"An error occurred while checking for updates: {e}", exc_info=True)
@@ -80,24 +194,250 @@ def check_for_updates():
     logging.info("Application is up to date.")
     return None
 
-def download_and_install_update(download_url):
+def file_sha256(path):
+    """파일의 SHA-256 (16진수 문자열)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(DOWNLOAD_CHUNK_BYTES), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def build_release_manifest(dist_dir, out_dir, version):
+    """
+    배포 폴더(dist/main)의 모든 파일에 대해 SHA-256/크기를 기록한 manifest.json을 out_dir에 만들고,
+    각 파일을 SHA-256 값을 이름으로 out_dir에 복사합니다. (out_dir의 파일을 모두 릴리즈 에셋으로 첨부)
+    반환값: manifest 사전
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    files = {}
+    for folder, _, names in os.walk(dist_dir):
+        for name in names:
+            path = os.path.join(folder, name)
+            sha256 = file_sha256(path)
+            files[os.path.relpath(path, dist_dir).replace(os.sep, '/')] = {'sha256': sha256, 'size': os.path.getsize(path)}
+            blob_path = os.path.join(out_dir, sha256)
+            if not os.path.exists(blob_path):
+                shutil.copyfile(path, blob_path)
+
+    manifest = {'manifest_version': MANIFEST_VERSION, 'version': str(version).lstrip('v'), 'files': files}
+    with open(os.path.join(out_dir, MANIFEST_ASSET_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    return manifest
+
+def _manifest_path(app_dir, rel_path):
+    """매니페스트의 상대 경로를 설치 폴더 기준 경로로 변환 (폴더 밖을 가리키는 경로는 거부)"""
+    parts = rel_path.split('/')
+    if not rel_path or rel_path.startswith('/') or os.path.isabs(rel_path) or '..' in parts or ':' in rel_path:
+        raise ValueError(f"Invalid path in manifest: {rel_path!r}")
+    return os.path.join(app_dir, *parts)
+
+def changed_files(manifest, app_dir=None):
+    """
+    설치된 파일과 매니페스트를 비교하여 새로 받아야 하는 (상대 경로, 항목) 목록을 반환합니다.
+    크기가 다르면 해시를 계산하지 않고 변경된 것으로 봅니다.
+    """
+    app_dir = app_dir or APP_DIR
+    changed = []
+    for rel_path, entry in sorted(manifest['files'].items()):
+        path = _manifest_path(app_dir, rel_path)
+        if (not os.path.isfile(path) or os.path.getsize(path) != entry['size']
+                or file_sha256(path) != entry['sha256']):
+            changed.append((rel_path, entry))
+    return changed
+
+class TransferProgress:
+    """
+    여러 파일에 걸친 다운로드 진행률. 받은 바이트가 늘 때마다
+    callback(받은 바이트, 전체 바이트, 초당 바이트, 남은 초)를 호출합니다. (속도/남은 시간은 모르면 None)
+    속도는 최근 RATE_WINDOW_SECONDS초 동안 받은 양으로 계산합니다. (이어받은 부분은 제외)
+    """
+    def __init__(self, total, callback=None):
+        self.total = total
+        self.done = 0
+        self.callback = callback
+        self._transferred = 0
+        self._samples = deque([(time.monotonic(), 0)])
+
+    def skip(self, count):
+        """이미 받아 둔 부분 (속도 계산에서 제외)"""
+        self.done += count
+        self._report()
+
+    def update(self, count):
+        self.done += count
+        self._transferred += count
+        now = time.monotonic()
+        self._samples.append((now, self._transferred))
+        while len(self._samples) > 2 and now - self._samples[0][0] > RATE_WINDOW_SECONDS:
+            self._samples.popleft()
+        self._report()
+
+    @property
+    def rate(self):
+        (t0, b0), (t1, b1) = self._samples[0], self._samples[-1]
+        return (b1 - b0) / (t1 - t0) if t1 > t0 else None
+
+    def _report(self):
+        if not self.callback:
+            return
+        rate = self.rate
+        eta = (self.total - self.done) / rate if rate and self.total else None
+        self.callback(self.done, self.total, rate, eta)
+
+def download_file(url, dest_path, sha256=None, size=None, progress=None, timeout=None, retries=None):
+    """
+    url을 dest_path로 내려받습니다. 받는 중에는 dest_path.part에 기록하고,
+    연결이 끊기면 HTTP Range 요청으로 받은 위치부터 이어받습니다. (이전 시도에서 남은 .part도 이어받음)
+    SHA-256은 받는 동안 계산하며, sha256/size가 주어지면 끝난 뒤 확인하여 다르면 .part를 지우고 예외를 발생시킵니다.
+    """
+    timeout = timeout or DOWNLOAD_TIMEOUT
+    retries = DOWNLOAD_RETRIES if retries is None else retries
+    progress = progress or TransferProgress(size)
+    part_path = f"{dest_path}.part"
+    os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+
+    if sha256 and os.path.isfile(dest_path) and file_sha256(dest_path) == sha256:
+        progress.skip(os.path.getsize(dest_path))
+        return dest_path
+
+    # 이전에 받다 만 부분의 해시를 이어서 계산
+    digest = hashlib.sha256()
+    received = 0
+    if os.path.isfile(part_path):
+        if size is not None and os.path.getsize(part_path) > size:
+            os.remove(part_path)
+        else:
+            with open(part_path, 'rb') as f:
+                for block in iter(lambda: f.read(DOWNLOAD_CHUNK_BYTES), b''):
+                    digest.update(block)
+                    received += len(block)
+            if received:
+                logging.info(f"Resuming {url} from byte {received:,}")
+                progress.skip(received)
+
+    failures = 0
+    while size is None or received < size:
+        headers = {'Range': f"bytes={received}-"} if received else {}
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout) as response:
+                if received and response.status != 206:
+                    # 서버가 이어받기를 지원하지 않음: 처음부터 다시 받음
+                    logging.warning(f"Server ignored Range request for {url}, restarting download")
+                    progress.skip(-received)
+                    digest = hashlib.sha256()
+                    received = 0
+                if size is None and response.headers.get('Content-Length'):
+                    size = received + int(response.headers['Content-Length'])
+                    if progress.total is None:
+                        progress.total = size
+                with open(part_path, 'ab' if received else 'wb') as f:
+                    for block in iter(lambda: response.read(DOWNLOAD_CHUNK_BYTES), b''):
+                        f.write(block)
+                        digest.update(block)
+                        received += len(block)
+                        progress.update(len(block))
+            if size is None:
+                break # 크기를 알 수 없으면 연결이 정상 종료된 시점을 끝으로 봄
+            if received < size:
+                raise http.client.IncompleteRead(b'', size - received)
+        except urllib.error.HTTPError as e:
+            if e.code == 416 and size is not None and received >= size:
+                break # 이미 모두 받음
+            if e.code == 416 and os.path.exists(part_path):
+                os.remove(part_path) # 받아 둔 부분이 서버의 파일과 맞지 않음
+            if e.code < 500 and e.code not in (408, 429):
+                raise Exception(f"Download failed for {url}: HTTP {e.code}")
+            error = e
+        except (OSError, http.client.HTTPException) as e:
+            # 연결 끊김, 시간 초과, 응답이 중간에 끝남 등은 받은 위치부터 다시 시도
+            error = e
+        else:
+            continue
+        failures += 1
+        if failures > retries:
+            raise Exception(f"Download failed for {url} after {retries} retries at byte {received:,}: {error}")
+        logging.warning(f"Download interrupted at byte {received:,} ({error}), retrying ({failures}/{retries})")
+        time.sleep(min(2 ** (failures - 1), 10))
+
+    if (size is not None and received != size) or (sha256 and digest.hexdigest() != sha256):
+        os.remove(part_path)
+        raise Exception(f"Integrity check failed for {url}: {received:,} bytes, sha256 {digest.hexdigest()}")
+    os.replace(part_path, dest_path)
+    return dest_path
+
+def download_delta_update(manifest_url, stage_dir, expected_version=None, app_dir=None, progress_callback=None):
+    """
+    매니페스트를 받아 설치된 파일과 다른 파일만 stage_dir에 같은 폴더 구조로 내려받습니다.
+    각 파일은 매니페스트와 같은 폴더의 SHA-256 이름 에셋에서 받으며 받은 뒤 해시를 확인합니다.
+    받은 파일은 UPDATE_DOWNLOAD_DIR에 해시 이름으로 받아 두므로 중단되어도 다음 시도에서 이어받습니다.
+    progress_callback: TransferProgress 참고
+    반환값: (받은 파일 수, 받은 바이트 수)
+    """
+    with urllib.request.urlopen(manifest_url, timeout=DOWNLOAD_TIMEOUT) as response:
+        manifest = json.loads(response.read().decode())
+    if manifest.get('manifest_version') != MANIFEST_VERSION:
+        raise Exception(f"Unsupported manifest version: {manifest.get('manifest_version')}")
+    if expected_version and manifest.get('version') != str(expected_version).lstrip('v'):
+        raise Exception(f"Manifest is for version {manifest.get('version')}, expected {expected_version}")
+
+    base_url = manifest_url.rsplit('/', 1)[0] + '/'
+    changed = changed_files(manifest, app_dir)
+    os.makedirs(stage_dir, exist_ok=True) # 바뀐 파일이 없어도 업데이트 스크립트가 복사할 폴더는 있어야 함
+    total_bytes = sum(entry['size'] for _, entry in changed)
+    logging.info(f"Delta update: {len(changed)} of {len(manifest['files'])} files changed ({total_bytes:,} bytes)")
+
+    blob_dir = os.path.join(UPDATE_DOWNLOAD_DIR, 'blobs')
+    progress = TransferProgress(total_bytes, progress_callback)
+    blobs = set()
+    for rel_path, entry in changed:
+        blob_path = download_file(base_url + entry['sha256'], os.path.join(blob_dir, entry['sha256']),
+                                  entry['sha256'], entry['size'], progress)
+        dest_path = _manifest_path(stage_dir, rel_path)
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        shutil.copyfile(blob_path, dest_path)
+        blobs.add(blob_path)
+
+    # 모두 준비되었으면 받아 둔 파일은 더 이상 필요 없음
+    for blob_path in blobs:
+        os.remove(blob_path)
+    return len(changed), total_bytes
+
+def download_and_install_update(download_url, manifest_url=None, expected_version=None,
+                                download_size=None, download_sha256=None, progress_callback=None):
     """
     업데이트를 다운로드하고 설치를 준비합니다.
+    manifest_url이 있으면 변경된 파일만 받고, 실패하면 전체 압축 파일(download_url)로 대신합니다.
+    압축 파일은 이어받기가 되며 download_size/download_sha256이 있으면 받은 뒤 확인합니다.
+    progress_callback(받은 바이트, 전체 바이트, 초당 바이트, 남은 초)은 작업 스레드에서 호출됩니다.
     성공하면 업데이트 스크립트 경로를 반환하고, 실패하면 None을 반환합니다.
     """
     try:
         temp_dir = tempfile.mkdtemp()
         logging.info(f"Created temporary directory: {temp_dir}")
-        zip_path = os.path.join(temp_dir, RELEASE_ASSET_NAME)
+        extract_dir = os.path.join(temp_dir, 'extracted')
+
+        if manifest_url:
+            try:
+                count, total_bytes = download_delta_update(manifest_url, extract_dir, expected_version,
+                                                           progress_callback=progress_callback)
+                logging.info(f"Staged {count} changed files ({total_bytes:,} bytes) in {extract_dir}")
+                return create_update_script(extract_dir, temp_dir)
+            except Exception as e:
+                logging.warning(f"Delta update failed, falling back to full download: {e}", exc_info=True)
+                shutil.rmtree(extract_dir, ignore_errors=True)
+
+        # 버전별 고정 경로에 받아 중단되어도 다음 시도에서 이어받음
+        zip_path = os.path.join(UPDATE_DOWNLOAD_DIR, f"{expected_version or 'latest'}-{RELEASE_ASSET_NAME}")
 
         logging.info(f"Downloading update from {download_url} to {zip_path}")
-        urllib.request.urlretrieve(download_url, zip_path)
+        download_file(download_url, zip_path, download_sha256, download_size,
+                      TransferProgress(download_size, progress_callback))
 
-        extract_dir = os.path.join(temp_dir, 'extracted')
         os.makedirs(extract_dir, exist_ok=True)
         logging.info(f"Extracting update to {extract_dir}")
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
             zip_ref.extractall(extract_dir)
+        os.remove(zip_path)
         
         update_script_path = create_update_script(extract_dir, temp_dir)
         return update_script_path
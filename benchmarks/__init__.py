@@ -0,0 +1,7 @@
+"""성능 측정용 벤치마크 (합성 Magic Split CSV 생성 및 단계별 시간 측정)
+
+    python -m benchmarks.generate out.csv 1000000 --encoding euc-kr
+    python -m benchmarks.run --rows 10000 1000000 --output bench.json
+    python -m benchmarks.run --rows 10000 --compare bench.json
+    python -m benchmarks.memory --rows 5000000 --output memory.json
+"""
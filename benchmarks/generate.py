@@ -0,0 +1,114 @@
+"""Magic Split 매매내역 형식의 합성 CSV 생성기"""
+import os
+import argparse
+
+COLUMNS = ['날짜', '종목명', '코드', '매매구분', '수량', '단가', '평가손익']
+# 넓은 내보내기 파일을 흉내 내는 추가 컬럼 (분석에는 쓰이지 않음, 부족하면 번호를 붙여 반복)
+EXTRA_COLUMNS = ['계좌', '주문번호', '수수료', '세금', '매수금액', '매도금액', '보유수량', '평균단가', '메모']
+ENCODINGS = ['euc-kr', 'utf-8-sig']
+# 한 번에 만들어 기록할 행 수 (천만 행도 메모리 사용량이 일정하도록)
+WRITE_CHUNK_ROWS = 500_000
+
+_KRW_STOCKS = [
+    ('삼성전자', '005930'), ('SK하이닉스', '000660'), ('LG에너지솔루션', '373220'),
+    ('삼성바이오로직스', '207940'), ('현대차', '005380'), ('기아', '000270'),
+    ('셀트리온', '068270'), ('NAVER', '035420'), ('카카오', '035720'), ('POSCO홀딩스', '005490'),
+]
+_USD_STOCKS = [
+    ('애플', 'AAPL'), ('마이크로소프트', 'MSFT'), ('엔비디아', 'NVDA'), ('테슬라', 'TSLA'),
+    ('아마존', 'AMZN'), ('알파벳', 'GOOGL'), ('메타', 'META'), ('브로드컴', 'AVGO'),
+]
+
+def make_stocks(count, usd_ratio, rng):
+    """(종목명, 코드, 통화) 목록 생성 (실제 종목 뒤에 합성 종목을 덧붙임)"""
+    n_usd = int(round(count * usd_ratio))
+    krw = list(_KRW_STOCKS)
+    while len(krw) < count - n_usd:
+        krw.append((f"국내종목{len(krw):04d}", f"{100000 + len(krw) * 7:06d}"))
+    usd = list(_USD_STOCKS)
+    while len(usd) < n_usd:
+        # 알파벳 코드만 USD로 분류되므로 숫자 없이 생성
+        letters = rng.choice(list('ABCDEFGHIJKLMNOPQRSTUVWXYZ'), size=4)
+        usd.append((f"해외종목{len(usd):04d}", ''.join(letters) + chr(ord('A') + len(usd) % 26)))
+    stocks = [(name, code, 'KRW') for name, code in krw[:count - n_usd]]
+    stocks += [(name, code, 'USD') for name, code in usd[:n_usd]]
+    return stocks
+
+def extra_column_names(count):
+    """추가 컬럼 이름 count개"""
+    return [EXTRA_COLUMNS[i % len(EXTRA_COLUMNS)] + (str(i // len(EXTRA_COLUMNS) + 1) if i >= len(EXTRA_COLUMNS) else '')
+            for i in range(count)]
+
+def generate_csv(path, rows, encoding='euc-kr', seed=0, stock_count=200, usd_ratio=0.3,
+                 start_date='2020-01-01', days=1800, comma_ratio=0.9, blank_ratio=0.005, extra_columns=0):
+    """
+    합성 매매내역 CSV를 생성합니다.
+    날짜는 파일 순서대로 증가하며, 평가손익은 대부분 천 단위 쉼표 형식(따옴표로 감쌈)이고
+    일부는 쉼표 없는 숫자이거나 빈 값입니다. extra_columns개의 (분석에 쓰지 않는) 컬럼을 덧붙일 수 있습니다.
+    반환값: 파일 크기(바이트)
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    stocks = make_stocks(stock_count, usd_ratio, rng)
+    names = np.array([s[0] for s in stocks], dtype=object)
+    codes = np.array([s[1] for s in stocks], dtype=object)
+    is_usd = np.array([s[2] == 'USD' for s in stocks])
+    trade_types = np.array(['매수', '매도'], dtype=object)
+    base = np.datetime64(start_date)
+    extras = extra_column_names(extra_columns)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding=encoding, newline='') as f:
+        # 0행이어도 헤더는 기록되도록 최소 한 번 실행
+        for written in range(0, max(rows, 1), WRITE_CHUNK_ROWS):
+            n = min(WRITE_CHUNK_ROWS, rows - written)
+            # 파일 전체에서 날짜가 단조 증가하도록 구간을 나눠 정렬
+            day_lo = days * written // max(rows, 1)
+            day_hi = max(day_lo + 1, days * (written + n) // max(rows, 1))
+            dates = base + np.sort(rng.integers(day_lo, day_hi, size=n)).astype('timedelta64[D]')
+
+            stock_idx = rng.integers(0, len(stocks), size=n)
+            usd = is_usd[stock_idx]
+            price = np.where(usd, rng.integers(10, 900, size=n), rng.integers(1_000, 900_000, size=n))
+            profit = np.where(usd, rng.integers(-2_000, 3_000, size=n), rng.integers(-3_000_000, 5_000_000, size=n))
+
+            profit_text = pd.Series(profit).map('{:,}'.format).to_numpy(dtype=object)
+            plain = rng.random(n) >= comma_ratio
+            profit_text[plain] = profit[plain].astype(str)
+            profit_text[rng.random(n) < blank_ratio] = ''
+
+            chunk = pd.DataFrame({
+                '날짜': pd.DatetimeIndex(dates).strftime('%Y.%m.%d'),
+                '종목명': names[stock_idx],
+                '코드': codes[stock_idx],
+                '매매구분': trade_types[rng.integers(0, 2, size=n)],
+                '수량': rng.integers(1, 200, size=n),
+                '단가': price,
+                '평가손익': profit_text,
+                # 숫자 컬럼과 짧은 문자열 컬럼을 번갈아 배치
+                **{name: rng.integers(0, 1_000_000, size=n) if i % 3 else np.char.add('M', rng.integers(0, 1000, size=n).astype(str))
+                   for i, name in enumerate(extras)},
+            }, columns=COLUMNS + extras)
+            chunk.to_csv(f, header=written == 0, index=False)
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 Magic Split CSV 생성")
+    parser.add_argument('path')
+    parser.add_argument('rows', type=int)
+    parser.add_argument('--encoding', choices=ENCODINGS, default='euc-kr')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--stocks', type=int, default=200, help="종목 수")
+    parser.add_argument('--usd-ratio', type=float, default=0.3, help="해외(USD) 종목 비율")
+    parser.add_argument('--extra-columns', type=int, default=0, help="분석에 쓰지 않는 추가 컬럼 수 (넓은 내보내기 파일)")
+    args = parser.parse_args(argv)
+
+    size = generate_csv(args.path, args.rows, args.encoding, args.seed, args.stocks, args.usd_ratio,
+                        extra_columns=args.extra_columns)
+    print(f"{args.path}: {args.rows:,}행, {size / 1048576:,.1f} MB ({args.encoding})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""프로그램 시작 경로의 모듈 불러오기 시간 측정 (python -X importtime 결과 요약)"""
+import os
+import sys
+import json
+import argparse
+import platform
+import subprocess
+import importlib.util
+from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# main.py가 첫 화면을 표시하기 전에 불러오는 모듈
+STARTUP_MODULES = ['main', 'ui_components', 'file_handler', 'data_analyzer', 'trade_ledger', '_version']
+# 설치되어 있을 때만 시작 경로에 포함 (드래그 앤 드롭 루트 창)
+OPTIONAL_STARTUP_MODULES = ['tkinterdnd2']
+# 첫 화면 이후(또는 백그라운드)에 불러와야 하는 무거운 모듈
+DEFERRED_MODULES = ['pandas', 'numpy', 'tkcalendar', 'babel', 'pyarrow', 'packaging', 'tracemalloc', 'uuid']
+DEFAULT_BUDGET_MS = 150
+
+def parse_importtime(text):
+    """-X importtime 출력을 [{'module', 'self_us', 'cumulative_us', 'depth'}] 목록으로 변환 (불러온 순서)"""
+    entries = []
+    for line in text.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue # 제목 줄
+        name = parts[2].rstrip()
+        indent = len(name) - len(name.lstrip())
+        entries.append({
+            'module': name.strip(),
+            'self_us': int(parts[0]),
+            'cumulative_us': int(parts[1]),
+            'depth': max(indent - 1, 0) // 2,
+        })
+    return entries
+
+def measure(modules, python=None):
+    """새 인터프리터에서 modules를 불러와 importtime 항목 목록 반환"""
+    code = "import " + ", ".join(modules)
+    proc = subprocess.run([python or sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=ROOT_DIR, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise Exception(f"모듈 불러오기 실패 ({code}):\n{proc.stderr[-2000:]}")
+    return parse_importtime(proc.stderr)
+
+def _total_ms(entries):
+    return sum(e['cumulative_us'] for e in entries if e['depth'] == 0) / 1000
+
+def startup_report(repeat=5, top=15, python=None):
+    """
+    시작 경로 모듈의 불러오기 시간을 repeat회 측정하여 가장 빠른 실행 기준으로 요약합니다.
+    시작 경로에 섞여 들어온 무거운 모듈과, 그 모듈들을 따로 불러올 때의 비용도 함께 기록합니다.
+    """
+    modules = STARTUP_MODULES + [m for m in OPTIONAL_STARTUP_MODULES if importlib.util.find_spec(m)]
+    entries = min((measure(modules, python) for _ in range(max(repeat, 1))), key=_total_ms)
+    loaded = {e['module'] for e in entries}
+
+    deferred_costs = {}
+    for module in DEFERRED_MODULES:
+        if importlib.util.find_spec(module) is None:
+            continue
+        deferred_costs[module] = round(min(_total_ms(measure([module], python)) for _ in range(max(repeat // 2, 1))), 1)
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'modules': modules,
+        'total_ms': round(_total_ms(entries), 1),
+        'module_count': len(entries),
+        'top_self_ms': [
+            {'module': e['module'], 'self_ms': round(e['self_us'] / 1000, 2), 'cumulative_ms': round(e['cumulative_us'] / 1000, 2)}
+            for e in sorted(entries, key=lambda e: e['self_us'], reverse=True)[:top]
+        ],
+        'deferred_loaded': [m for m in DEFERRED_MODULES if m in loaded],
+        'deferred_costs_ms': deferred_costs,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="시작 경로 모듈 불러오기 시간 측정")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help="자체 시간 기준 상위 모듈 수")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS, help="시작 경로 불러오기 시간 한도")
+    parser.add_argument('-o', '--output', help="결과 JSON 파일")
+    args = parser.parse_args(argv)
+
+    report = startup_report(args.repeat, args.top)
+    report['budget_ms'] = args.budget_ms
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    print(f"시작 경로 불러오기: {report['total_ms']:.1f}ms (한도 {args.budget_ms:.0f}ms, 모듈 {report['module_count']}개)",
+          file=sys.stderr)
+    for module, ms in report['deferred_costs_ms'].items():
+        mark = ' <-- 시작 경로에서 불러옴' if module in report['deferred_loaded'] else ''
+        print(f"  지연 로딩 {module:12} {ms:8.1f}ms{mark}", file=sys.stderr)
+
+    over_budget = report['total_ms'] > args.budget_ms
+    return 1 if over_budget or report['deferred_loaded'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""분석용으로 읽은 DataFrame의 컬럼별 메모리 사용량 비교 (이전 방식 읽기 vs 타입 지정 읽기)"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+from datetime import datetime
+
+# 저장소 루트의 모듈을 불러올 수 있도록 경로 추가 (python -m benchmarks.memory 외의 실행 대비)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.generate import generate_csv, ENCODINGS
+
+DEFAULT_ROWS = 5_000_000
+# legacy: 전체 컬럼을 타입 추론으로 읽음 (평가손익/종목명/코드/매매구분/날짜는 object)
+# typed: 분석 컬럼만 category/float64/datetime으로 읽음 (DataAnalyzer._read_frame)
+MODES = ['legacy', 'typed']
+
+def _read(mode, path, encoding):
+    from data_analyzer import DataAnalyzer
+    analyzer = DataAnalyzer(use_sidecar=False)
+    pd = analyzer._load_pandas()
+    if mode == 'legacy':
+        return pd.read_csv(path, encoding=encoding)
+    return analyzer._read_frame(path, encoding)
+
+def measure(path, encoding):
+    """모드별 읽기 시간과 컬럼별 메모리 사용량(deep, 바이트)"""
+    result = {}
+    for mode in MODES:
+        start = time.perf_counter()
+        df = _read(mode, path, encoding)
+        seconds = time.perf_counter() - start
+        usage = df.memory_usage(deep=True, index=False)
+        result[mode] = {
+            'seconds': round(seconds, 3),
+            'total_bytes': int(usage.sum()),
+            'columns': {str(col): {'dtype': str(df[col].dtype), 'bytes': int(usage[col])} for col in df.columns},
+        }
+        del df
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="분석용 DataFrame 메모리 사용량 비교")
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS)
+    parser.add_argument('--encoding', choices=ENCODINGS, default='euc-kr')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', help="생성한 CSV를 보관할 폴더 (다음 실행에서 재사용)")
+    parser.add_argument('--csv', help="합성 CSV 대신 측정할 파일 (--encoding으로 읽음)")
+    parser.add_argument('-o', '--output', help="결과 JSON 파일")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = args.csv
+        if path is None:
+            data_dir = args.data_dir or tmp_dir
+            os.makedirs(data_dir, exist_ok=True)
+            path = os.path.join(data_dir, f"trades_{args.rows}_{args.encoding}_{args.seed}.csv")
+            if not os.path.exists(path):
+                print(f"생성 중: {path}", file=sys.stderr)
+                generate_csv(path, args.rows, args.encoding, args.seed)
+        modes = measure(path, args.encoding)
+
+    legacy, typed = modes['legacy']['total_bytes'], modes['typed']['total_bytes']
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'file': args.csv or os.path.basename(path),
+        'rows': args.rows if args.csv is None else None,
+        'encoding': args.encoding,
+        'modes': modes,
+        'reduction': round(1 - typed / legacy, 4) if legacy else None,
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    for mode in MODES:
+        m = modes[mode]
+        print(f"{mode:7} {m['total_bytes'] / 1048576:10,.1f} MB  읽기 {m['seconds']:7.2f}s", file=sys.stderr)
+        for col, c in m['columns'].items():
+            print(f"    {col:8} {c['dtype'][:24]:24} {c['bytes'] / 1048576:10,.1f} MB", file=sys.stderr)
+    if report['reduction'] is not None:
+        print(f"메모리 사용량 {report['reduction']:.1%} 감소", file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
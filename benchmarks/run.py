@@ -0,0 +1,157 @@
+"""분석/병합 단계별 시간 측정 후 JSON으로 저장 (버전 간 성능 비교용)"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import tempfile
+from datetime import datetime
+
+# 저장소 루트의 모듈을 불러올 수 있도록 경로 추가 (python -m benchmarks.run 외의 실행 대비)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.generate import generate_csv, ENCODINGS
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+BENCHMARKS = ['get_date_range', 'analyze_csv', 'analyze_csv_dated', 'get_statistics', 'merge']
+# 비교 시 이 비율 이상 느려지면 회귀로 표시
+REGRESSION_RATIO = 1.10
+
+def _measure(func, repeat):
+    """func를 repeat회 실행한 소요 시간(초) 목록"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+def _date_window(path):
+    """기간 분석에 사용할 구간 (전체 기간의 가운데 절반)"""
+    from data_analyzer import DataAnalyzer
+    min_date, max_date = DataAnalyzer(use_sidecar=False).get_date_range(path)
+    lo, hi = datetime.strptime(min_date, '%Y-%m-%d'), datetime.strptime(max_date, '%Y-%m-%d')
+    span = hi - lo
+    return (lo + span / 4).strftime('%Y-%m-%d'), (hi - span / 4).strftime('%Y-%m-%d')
+
+def bench_file(path, repeat, work_dir):
+    """
+    파일 하나에 대한 벤치마크. 각 실행은 새 DataAnalyzer(디스크 캐시 없음)를 사용하므로
+    매번 파일을 처음부터 읽는 시간이 측정됩니다. (get_statistics는 분석 결과가 있는 상태에서 측정)
+    """
+    from data_analyzer import DataAnalyzer
+    from csv_merger import merge_csv_files
+
+    start_date, end_date = _date_window(path)
+    analyzed = DataAnalyzer(use_sidecar=False)
+    analyzed.analyze_csv(path)
+    merged_path = os.path.join(work_dir, 'merged.csv')
+
+    cases = {
+        'get_date_range': lambda: DataAnalyzer(use_sidecar=False).get_date_range(path),
+        'analyze_csv': lambda: DataAnalyzer(use_sidecar=False).analyze_csv(path),
+        'analyze_csv_dated': lambda: DataAnalyzer(use_sidecar=False).analyze_csv(
+            path, start_date=start_date, end_date=end_date),
+        'get_statistics': analyzed.get_statistics,
+        # 같은 파일을 두 번 병합하여 절반이 중복인 경우를 측정
+        'merge': lambda: merge_csv_files([path, path], merged_path),
+    }
+    return {name: _measure(func, repeat) for name, func in cases.items()}
+
+def run(rows_list, encodings, repeat=3, data_dir=None, seed=0):
+    """크기/인코딩 조합별 벤치마크를 실행하여 결과 사전 반환"""
+    import pandas as pd
+    from _version import __version__
+
+    data_dir = data_dir or os.path.join(tempfile.gettempdir(), 'stock-analyzer-bench')
+    os.makedirs(data_dir, exist_ok=True)
+
+    report = {
+        'version': __version__,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeat': repeat,
+        'cases': [],
+    }
+
+    for rows in rows_list:
+        for encoding in encodings:
+            path = os.path.join(data_dir, f"trades_{rows}_{encoding}_{seed}.csv")
+            if not os.path.exists(path):
+                print(f"생성 중: {path}", file=sys.stderr)
+                generate_csv(path, rows, encoding, seed)
+            size = os.path.getsize(path)
+
+            with tempfile.TemporaryDirectory() as work_dir:
+                timings = bench_file(path, repeat, work_dir)
+
+            for name in BENCHMARKS:
+                times = timings[name]
+                best = min(times)
+                case = {
+                    'benchmark': name,
+                    'rows': rows,
+                    'encoding': encoding,
+                    'bytes': size,
+                    'seconds': [round(t, 6) for t in times],
+                    'best': round(best, 6),
+                    'median': round(statistics.median(times), 6),
+                }
+                if name != 'get_statistics' and best > 0:
+                    case['rows_per_s'] = round(rows * (2 if name == 'merge' else 1) / best)
+                report['cases'].append(case)
+                print(f"{name:18} {rows:>10,}행 {encoding:9} best {best:8.3f}s  median {case['median']:8.3f}s",
+                      file=sys.stderr)
+    return report
+
+def compare(report, baseline):
+    """기준 결과와 비교하여 (벤치마크, 행 수, 인코딩, 기준, 현재, 비율) 목록 반환"""
+    base = {(c['benchmark'], c['rows'], c['encoding']): c['best'] for c in baseline['cases']}
+    rows = []
+    for case in report['cases']:
+        key = (case['benchmark'], case['rows'], case['encoding'])
+        if key in base and base[key] > 0:
+            rows.append(key + (base[key], case['best'], case['best'] / base[key]))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="주식 분석기 벤치마크")
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS, help="행 수 (예: 10000 10000000)")
+    parser.add_argument('--encodings', nargs='+', choices=ENCODINGS, default=ENCODINGS)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', help="생성한 CSV를 보관할 폴더 (다음 실행에서 재사용)")
+    parser.add_argument('-o', '--output', help="결과 JSON 파일")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON 파일")
+    args = parser.parse_args(argv)
+
+    report = run(args.rows, args.encodings, args.repeat, args.data_dir, args.seed)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\n기준: {baseline.get('version')} ({baseline.get('timestamp')})", file=sys.stderr)
+        regressions = 0
+        for name, rows, encoding, old, new, ratio in compare(report, baseline):
+            mark = ' <-- 느려짐' if ratio >= REGRESSION_RATIO else ''
+            regressions += bool(mark)
+            print(f"{name:18} {rows:>10,}행 {encoding:9} {old:8.3f}s -> {new:8.3f}s ({ratio:5.2f}x){mark}",
+                  file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""GUI 없이 분석/병합/날짜 범위 조회를 실행하는 명령줄 진입점 (tkinter를 사용하지 않음)
+
+사용 예:
+    python cli.py analyze TradingHistory.csv --start 2024-01-01 --format csv -o result.csv
+    python cli.py merge a.csv b.csv -o merged.csv
+    python cli.py --timing daterange TradingHistory.csv
+"""
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import contextlib
+
+_STARTED = time.perf_counter()
+
+# 종료 코드
+EXIT_OK = 0
+EXIT_ERROR = 1          # 분석/병합 중 오류
+EXIT_USAGE = 2          # 잘못된 인자 (argparse 기본값과 동일)
+EXIT_NOT_FOUND = 3      # 입력 파일 없음
+EXIT_INTERRUPTED = 130  # Ctrl+C
+
+RESULT_COLUMNS = ['종목명', '평가손익', '매도 횟수', '통화']
+
+class _Timer:
+    """단계별 소요 시간 기록 (--timing 사용 시 stderr로 JSON 출력)"""
+    def __init__(self):
+        # 인자 해석까지 끝난 시점 (프로세스 시작부터 여기까지가 시작 비용)
+        self.command_started = time.perf_counter()
+        self.stages = {}
+
+    def run(self, name, func, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.stages[name] = round(time.perf_counter() - start, 6)
+
+    def report(self, input_bytes=0):
+        elapsed = sum(self.stages.values())
+        report = {
+            'startup_s': round(self.command_started - _STARTED, 6),
+            'stages_s': self.stages,
+            'total_s': round(time.perf_counter() - _STARTED, 6),
+        }
+        if input_bytes:
+            report['input_mb'] = round(input_bytes / 1048576, 3)
+            work = elapsed - self.stages.get('import', 0)
+            if work > 0:
+                report['throughput_mb_s'] = round(input_bytes / 1048576 / work, 3)
+        return report
+
+def _check_files(paths):
+    """입력 파일 존재 확인 (없으면 메시지 출력 후 False)"""
+    missing = [path for path in paths if not os.path.isfile(path)]
+    for path in missing:
+        print(f"파일을 찾을 수 없습니다: {path}", file=sys.stderr)
+    return not missing
+
+def _check_dates(args):
+    """기간 인자 형식 확인 (YYYY-MM-DD)"""
+    from datetime import datetime
+    for value in (getattr(args, 'start', None), getattr(args, 'end', None)):
+        if not value:
+            continue
+        try:
+            datetime.strptime(value, '%Y-%m-%d')
+        except ValueError:
+            print(f"날짜 형식이 올바르지 않습니다 (YYYY-MM-DD): {value}", file=sys.stderr)
+            return False
+    return True
+
+def _open_output(path, encoding='utf-8'):
+    """출력 파일 열기 (경로가 없거나 '-'이면 표준 출력)"""
+    if not path or path == '-':
+        return None
+    return open(path, 'w', encoding=encoding, newline='')
+
+def _write_json(data, path, stdout):
+    out = _open_output(path)
+    text = json.dumps(data, ensure_ascii=False, indent=2)
+    if out is None:
+        print(text, file=stdout)
+    else:
+        with out:
+            out.write(text + '\n')
+
+def _write_results_csv(results, path, stdout):
+    # 엑셀에서 한글이 깨지지 않도록 CSV 파일만 BOM 포함 (JSON은 BOM이 있으면 json.load가 실패)
+    out = _open_output(path, encoding='utf-8-sig')
+    stream = out or stdout
+    try:
+        writer = csv.writer(stream, lineterminator='\n')
+        writer.writerow(RESULT_COLUMNS)
+        writer.writerows(results)
+    finally:
+        if out is not None:
+            out.close()
+
+def _new_analyzer(args):
+    from data_analyzer import DataAnalyzer
+    return DataAnalyzer(use_sidecar=not args.no_cache, profiling=args.profile or bool(args.profile_log))
+
+def cmd_analyze(args, timer):
+    analyzer = timer.run('import', _new_analyzer, args)
+    timer.run('load_pandas', analyzer._load_pandas)
+
+    if len(args.files) == 1:
+        results = timer.run('analyze', analyzer.analyze_csv, args.files[0],
+                            start_date=args.start, end_date=args.end, streaming=args.streaming)
+    else:
+        results = timer.run('analyze', analyzer.analyze_files, args.files,
+                            start_date=args.start, end_date=args.end, max_workers=args.workers)
+
+    if args.format == 'csv':
+        _write_results_csv(results, args.output, args.stdout)
+    else:
+        _write_json({
+            'files': args.files,
+            'start_date': args.start,
+            'end_date': args.end,
+            'results': [dict(zip(('stock', 'profit', 'sell_count', 'currency'), row)) for row in results],
+            'statistics': analyzer.get_statistics(),
+        }, args.output, args.stdout)
+    return analyzer
+
+def cmd_merge(args, timer):
+    from csv_merger import merge_csv_files
+    stats = timer.run('merge', merge_csv_files, args.files, args.output)
+    _write_json(stats, None, args.stdout)
+
+def cmd_daterange(args, timer):
+    analyzer = timer.run('import', _new_analyzer, args)
+    timer.run('load_pandas', analyzer._load_pandas)
+    min_date, max_date = timer.run('daterange', analyzer.get_date_range, args.file)
+    if args.format == 'csv':
+        print(f"{min_date or ''},{max_date or ''}", file=args.stdout)
+    else:
+        _write_json({'file': args.file, 'min_date': min_date, 'max_date': max_date}, None, args.stdout)
+    return analyzer
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='stock-analyzer', description="주식 평가손익 분석기 (명령줄)")
+    parser.add_argument('--timing', action='store_true', help="단계별 소요 시간과 처리량을 stderr에 JSON으로 출력")
+    parser.add_argument('--no-cache', action='store_true', help="디스크 사이드카 캐시를 사용하지 않음")
+    parser.add_argument('--profile', action='store_true', help="분석 단계별 시간/행 수/메모리를 stderr에 출력")
+    parser.add_argument('--profile-log', help="분석 단계별 측정 결과를 추가할 로그 파일 (JSON 줄)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    analyze = sub.add_parser('analyze', help="CSV 파일 분석 (여러 파일이면 합산)")
+    analyze.add_argument('files', nargs='+', help="분석할 CSV 파일")
+    analyze.add_argument('--start', help="시작일 (YYYY-MM-DD)")
+    analyze.add_argument('--end', help="종료일 (YYYY-MM-DD)")
+    analyze.add_argument('--format', choices=['json', 'csv'], default='json')
+    analyze.add_argument('-o', '--output', help="결과 파일 (기본: 표준 출력)")
+    analyze.add_argument('--workers', type=int, help="여러 파일 분석 시 프로세스 수")
+    streaming = analyze.add_mutually_exclusive_group()
+    streaming.add_argument('--streaming', dest='streaming', action='store_true', default=None,
+                           help="항상 청크 단위로 읽기")
+    streaming.add_argument('--no-streaming', dest='streaming', action='store_false',
+                           help="항상 한 번에 읽기")
+    analyze.set_defaults(func=cmd_analyze)
+
+    merge = sub.add_parser('merge', help="CSV 파일 병합 (중복 행 제거)")
+    merge.add_argument('files', nargs='+', help="병합할 CSV 파일")
+    merge.add_argument('-o', '--output', required=True, help="병합 결과 파일")
+    merge.set_defaults(func=cmd_merge)
+
+    daterange = sub.add_parser('daterange', help="'매도' 거래의 날짜 범위 조회")
+    daterange.add_argument('file', help="CSV 파일")
+    daterange.add_argument('--format', choices=['json', 'csv'], default='json')
+    daterange.set_defaults(func=cmd_daterange)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    timer = _Timer()
+
+    if not _check_dates(args):
+        return EXIT_USAGE
+    files = args.files if hasattr(args, 'files') else [args.file]
+    if not _check_files(files):
+        return EXIT_NOT_FOUND
+
+    # 결과(payload)만 실제 표준 출력에 쓰고, 분석기가 print()하는 진단 메시지는 stderr로 보냄
+    args.stdout = sys.stdout
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            analyzer = args.func(args, timer)
+    except KeyboardInterrupt:
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    for profile in (analyzer.profiles if analyzer else []):
+        if args.profile:
+            print(profile.format_text(), file=sys.stderr)
+        if args.profile_log:
+            profile.dump(args.profile_log)
+    if args.timing:
+        print(json.dumps(timer.report(sum(os.path.getsize(path) for path in files)),
+                         ensure_ascii=False), file=sys.stderr)
+    return EXIT_OK
+
+if __name__ == '__main__':
+    # 여러 파일 분석(프로세스 풀)이 실행 파일에서도 동작하도록 필요
+    import multiprocessing
+    multiprocessing.freeze_support()
+    sys.exit(main())
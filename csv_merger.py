@@ -0,0 +1,210 @@
+"""CSV 파일 병합 엔진 (청크 스트리밍, 행 해시 기반 중복 제거)"""
+import os
+from encoding_detector import encoding_candidates, remember_encoding
+
+MERGE_CHUNK_ROWS = 100_000
+# 중복 확인용 행 해시 보관 한도 (행 하나당 16바이트)
+MERGE_MEMORY_LIMIT_BYTES = 512 * 1024 * 1024
+# 행 키의 뒤쪽 64비트를 만드는 해시 키 (16자, pandas 기본 키와 달라야 함)
+SECOND_HASH_KEY = 'stock-merge-key2'
+
+def _row_keys(pd, np, chunk):
+    """
+    행마다 서로 다른 해시 키로 구한 64비트 해시 두 개 (앞, 뒤)를 합친 128비트 키.
+    (64비트 하나만 쓰면 행이 많을 때 서로 다른 행이 같은 해시가 되어 빠질 수 있음)
+    컬럼마다 고유값을 한 번만 구해 두 키로 해시한 뒤, pandas의 hash_pandas_object와 같은 방식으로 컬럼을 합칩니다.
+    """
+    hi = lo = None
+    mult = np.uint64(1000003)
+    for i, col in enumerate(chunk.columns):
+        codes, uniques = pd.factorize(chunk[col])
+        # 결측값(코드 -1)도 하나의 값으로 해시되도록 마지막 칸에 추가 (원장은 빈 칸을 결측값으로 읽음)
+        uniques = np.append(np.asarray(uniques, dtype=object), np.nan)
+        col_hi = pd.util.hash_array(uniques, categorize=False)[codes]
+        col_lo = pd.util.hash_array(uniques, hash_key=SECOND_HASH_KEY, categorize=False)[codes]
+        if hi is None:
+            hi = np.full(len(chunk), 0x345678, dtype=np.uint64)
+            lo = hi.copy()
+        hi ^= col_hi
+        hi *= mult
+        lo ^= col_lo
+        lo *= mult
+        mult += np.uint64(82520 + 2 * (len(chunk.columns) - i))
+    return hi + np.uint64(97531), lo + np.uint64(97531)
+
+class _RowHashSet:
+    """
+    이미 기록한 행의 128비트 키 집합.
+    앞 64비트 순으로 정렬된 uint64 배열 쌍 여러 개로 보관하고 크기가 비슷한 배열끼리 병합하여
+    배열 수를 log 수준으로 유지합니다. (파이썬 set보다 메모리를 훨씬 적게 사용)
+    """
+    def __init__(self, np):
+        self._np = np
+        self.runs = []
+        self.size = 0
+
+    @property
+    def nbytes(self):
+        return self.size * 16
+
+    def contains(self, hi, lo):
+        np = self._np
+        found = np.zeros(len(hi), dtype=bool)
+        for run_hi, run_lo in self.runs:
+            pos = np.minimum(np.searchsorted(run_hi, hi), len(run_hi) - 1)
+            same_hi = run_hi[pos] == hi
+            found |= same_hi & (run_lo[pos] == lo)
+            # 앞 64비트만 같은 키가 있을 때만 (드묾) 같은 앞부분 범위에서 뒤 64비트를 찾음
+            for i in np.flatnonzero(same_hi & ~found):
+                end = np.searchsorted(run_hi, hi[i], side='right')
+                found[i] = lo[i] in run_lo[pos[i]:end]
+        return found
+
+    def add(self, hi, lo):
+        """아직 없는 (서로 다른) 키들을 추가"""
+        np = self._np
+        if not len(hi):
+            return
+        count = len(hi)
+        while self.runs and len(self.runs[-1][0]) <= len(hi):
+            run_hi, run_lo = self.runs.pop()
+            hi, lo = np.concatenate([run_hi, hi]), np.concatenate([run_lo, lo])
+        order = np.argsort(hi)
+        self.runs.append((hi[order], lo[order]))
+        self.size += count
+
+class _EncodingFailed(Exception):
+    """파일을 감지된 인코딩으로 끝까지 읽지 못한 경우 (다른 인코딩으로 다시 시도)"""
+    def __init__(self, path):
+        super().__init__(path)
+        self.path = path
+
+def _read_header(pd, path, encodings):
+    """인코딩 후보를 차례로 시도하여 (인코딩 후보 목록, 컬럼 목록) 반환"""
+    for i, encoding in enumerate(encodings):
+        try:
+            columns = list(pd.read_csv(path, encoding=encoding, nrows=0).columns)
+            return encodings[i:], columns
+        except UnicodeDecodeError:
+            continue
+    raise Exception(f"파일 인코딩을 인식할 수 없습니다: {os.path.basename(path)}")
+
+def check_headers(headers):
+    """
+    모든 파일의 컬럼 구성이 같은지 확인합니다.
+    순서만 다른 경우는 첫 파일 순서로 맞추고, 컬럼 자체가 다르면 예외를 발생시킵니다.
+    """
+    (first_path, first_columns), rest = headers[0], headers[1:]
+    for path, columns in rest:
+        if set(columns) != set(first_columns):
+            missing = [col for col in first_columns if col not in columns]
+            extra = [col for col in columns if col not in first_columns]
+            details = []
+            if missing:
+                details.append(f"없는 컬럼: {', '.join(map(str, missing))}")
+            if extra:
+                details.append(f"추가 컬럼: {', '.join(map(str, extra))}")
+            raise Exception(
+                f"'{os.path.basename(path)}'의 컬럼 구성이 '{os.path.basename(first_path)}'와 다릅니다.\n"
+                + "\n".join(details)
+            )
+    return first_columns
+
+def merge_csv_files(file_paths, output_path, progress_callback=None,
+                    chunk_rows=MERGE_CHUNK_ROWS, memory_limit=MERGE_MEMORY_LIMIT_BYTES):
+    """
+    여러 CSV 파일을 청크 단위로 읽어 중복 행을 제거하며 하나의 파일(utf-8-sig)로 병합합니다.
+    값은 문자열 그대로 비교/기록하므로 코드 앞자리 0 등이 보존됩니다.
+    반환값: {'files', 'rows_in', 'rows_out', 'duplicates', 'output_path'}
+    """
+    import numpy as np
+    import pandas as pd
+
+    file_paths = list(file_paths)
+    if not file_paths:
+        raise Exception("병합할 파일이 없습니다.")
+
+    encodings = {}
+    headers = []
+    for path in file_paths:
+        encodings[path], columns = _read_header(pd, path, encoding_candidates(path))
+        headers.append((path, columns))
+    columns = check_headers(headers)
+
+    # 감지된 인코딩이 파일 중간에서 틀린 경우에만 다음 후보로 처음부터 다시 병합
+    while True:
+        try:
+            stats = _merge_once(pd, np, file_paths, output_path, columns, encodings,
+                                progress_callback, chunk_rows, memory_limit)
+            break
+        except _EncodingFailed as e:
+            encodings[e.path] = encodings[e.path][1:]
+            if not encodings[e.path]:
+                raise Exception(f"파일 인코딩을 인식할 수 없습니다: {os.path.basename(e.path)}")
+
+    for path in file_paths:
+        remember_encoding(path, encodings[path][0])
+    return stats
+
+def _merge_once(pd, np, file_paths, output_path, columns, encodings, progress_callback, chunk_rows, memory_limit):
+    total_bytes = max(sum(os.path.getsize(path) for path in file_paths), 1)
+    done_bytes = 0
+    rows_in = rows_out = 0
+    seen = _RowHashSet(np)
+
+    # 임시 파일에 쓴 뒤 교체 (입력 파일과 같은 경로로 저장해도 안전)
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    tmp_path = os.path.join(output_dir, f".{os.path.basename(output_path)}.{os.urandom(16).hex()}.tmp")
+
+    try:
+        with open(tmp_path, 'w', encoding='utf-8-sig', newline='') as out:
+            header_written = False
+            for file_index, path in enumerate(file_paths):
+                with open(path, 'rb') as f:
+                    reader = pd.read_csv(f, encoding=encodings[path][0], dtype=str,
+                                         na_filter=False, chunksize=chunk_rows)
+                    try:
+                        for chunk in reader:
+                            chunk = chunk[columns]
+                            hi, lo = _row_keys(pd, np, chunk)
+
+                            # 청크 안의 중복과 이전에 기록한 행을 모두 제외
+                            keep = ~pd.DataFrame({'hi': hi, 'lo': lo}).duplicated().to_numpy() & ~seen.contains(hi, lo)
+                            seen.add(hi[keep], lo[keep])
+                            if seen.nbytes > memory_limit:
+                                raise Exception(
+                                    f"중복 확인에 필요한 메모리가 한도({memory_limit // 1048576:,} MB)를 넘었습니다. "
+                                    "파일을 나누어 병합하세요."
+                                )
+
+                            chunk[keep].to_csv(out, header=not header_written, index=False)
+                            header_written = True
+                            rows_in += len(chunk)
+                            rows_out += int(keep.sum())
+
+                            if progress_callback:
+                                pos = done_bytes + min(f.tell(), os.path.getsize(path))
+                                progress_callback(
+                                    100 * pos / total_bytes,
+                                    f"병합 중... ({file_index + 1}/{len(file_paths)}) "
+                                    f"읽은 행 {rows_in:,} / 기록 {rows_out:,} / 중복 {rows_in - rows_out:,}"
+                                )
+                    except UnicodeDecodeError:
+                        raise _EncodingFailed(path)
+                done_bytes += os.path.getsize(path)
+
+            if not header_written:
+                pd.DataFrame(columns=columns).to_csv(out, index=False)
+
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return {
+        'files': len(file_paths),
+        'rows_in': rows_in,
+        'rows_out': rows_out,
+        'duplicates': rows_in - rows_out,
+        'output_path': output_path,
+    }
@@ -1,9 +1,138 @@
 """데이터 분석 관련 기능을 담당하는 모듈 (지연 로딩)"""
+import os
+import sys
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager, redirect_stdout
+from encoding_detector import detect_encoding, encoding_candidates, remember_encoding, forget_encoding
+from sidecar_cache import SidecarCache
+from analysis_profile import AnalysisProfile, NULL_STAGE
+from analysis_jobs import AnalysisCancelled
+from result_model import AnalysisResults
+
+# 파싱된 DataFrame 캐시 기본 한도
+FRAME_CACHE_MAX_ENTRIES = 4
+FRAME_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# 이 크기 이상의 파일은 한 번에 읽지 않고 청크 단위로 스트리밍 분석
+STREAMING_THRESHOLD_BYTES = 128 * 1024 * 1024
+STREAMING_CHUNK_ROWS = 200_000
+# 스트리밍 중 부분 집계를 합칠 주기 (청크 수)
+STREAMING_MERGE_EVERY = 16
+
+# 증분 분석 상태 형식 버전 및 앞부분 해시 계산 시 한 번에 읽는 크기
+INCREMENTAL_STATE_VERSION = 3
+FINGERPRINT_CHUNK_BYTES = 1024 * 1024
+
+# 보관할 단계별 측정 결과 수 (profiling 사용 시)
+PROFILE_HISTORY = 20
+
+# 이름이 고정된 기간 필터/날짜 범위용 컬럼 (분석 컬럼과 함께 읽음)
+DATE_COLUMNS = ('매매구분', '날짜')
+DATE_FORMAT = '%Y.%m.%d'
+# 평가손익을 float64로 읽지 못해 문자열로 다시 읽을 때의 안내 (분석 결과 출력과 섞이지 않도록 stderr)
+PROFIT_FALLBACK_MESSAGE = "평가손익에 숫자가 아닌 값이 있어 평가손익을 문자열로 읽어 변환합니다."
+# 헤더 지문별 컬럼 매핑 캐시 한도 (같은 프로그램에서 내보낸 파일은 헤더가 같음)
+COLUMN_MAP_CACHE_MAX = 64
+_column_maps = OrderedDict()
+_column_maps_lock = threading.Lock()
+
+def header_fingerprint(columns):
+    """헤더(컬럼 이름 목록)의 지문"""
+    return hashlib.sha256('\x1f'.join(map(str, columns)).encode('utf-8')).hexdigest()
+
+def file_fingerprint(file_path, offset):
+    """
+    증분 분석용 파일 지문: 앞부분 [0, offset) 전체의 SHA-256
+    (일부 구간만 해시하면 크기를 유지한 중간 수정을 놓치므로 이전에 읽은 범위를 모두 확인)
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        remaining = offset
+        while remaining > 0:
+            data = f.read(min(remaining, FINGERPRINT_CHUNK_BYTES))
+            if not data:
+                break
+            digest.update(data)
+            remaining -= len(data)
+    return digest.hexdigest()
+
+def ends_with_newline(file_path):
+    """파일의 마지막 줄이 완성되어 있는지 (이후 추가된 행을 offset부터 읽어도 되는지) 확인"""
+    with open(file_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return False
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+class DayIndex:
+    """(날짜, 종목명, 코드)별로 미리 집계한 '매도' 거래 표 (날짜순 정렬)"""
+    def __init__(self, pd, table):
+        self._pandas = pd
+        self.days = pd.DatetimeIndex(table.index.get_level_values(0))
+        self.table = table.droplevel(0)
+        
+    @property
+    def empty(self):
+        return len(self.days) == 0
+        
+    @property
+    def min_date(self):
+        return self.days[0]
+        
+    @property
+    def max_date(self):
+        return self.days[-1]
+        
+    def query(self, start_date=None, end_date=None):
+        """
+        [시작일, 종료일] 기간의 (종목명, 코드)별 집계 반환 (YYYY-MM-DD, 빈 값이면 제한 없음)
+        날짜가 정렬되어 있으므로 이진 탐색으로 구간을 찾아 해당 일별 집계만 합산합니다.
+        """
+        pd = self._pandas
+        
+        lo, hi = 0, len(self.days)
+        if start_date:
+            start_date_dt = pd.to_datetime(start_date, format='%Y-%m-%d', errors='coerce')
+            if pd.notna(start_date_dt):
+                lo = self.days.searchsorted(start_date_dt, side='left')
+        if end_date:
+            end_date_dt = pd.to_datetime(end_date, format='%Y-%m-%d', errors='coerce')
+            if pd.notna(end_date_dt):
+                hi = self.days.searchsorted(end_date_dt, side='right')
+                
+        return self.table.iloc[lo:max(lo, hi)].groupby(level=[0, 1], observed=True).sum()
 
 class DataAnalyzer:
-    def __init__(self):
+    def __init__(self, cache_max_entries=FRAME_CACHE_MAX_ENTRIES, cache_max_bytes=FRAME_CACHE_MAX_BYTES,
+                 use_sidecar=True, sidecar_dir=None, streaming_threshold=STREAMING_THRESHOLD_BYTES,
+                 profiling=False, profile_memory=True):
         self._pandas = None
         self.results = []
+        self.streaming_threshold = streaming_threshold
+        
+        # 파싱된 DataFrame LRU 캐시: {(경로, mtime, 크기): (df, 메모리 사용량)}
+        self.cache_max_entries = cache_max_entries
+        self.cache_max_bytes = cache_max_bytes
+        self._frame_cache = OrderedDict()
+        self._frame_cache_bytes = 0
+        self._cache_lock = threading.Lock()
+        
+        # 디스크 사이드카 캐시 (재실행 시 텍스트 파싱 생략)
+        self._sidecar = SidecarCache(sidecar_dir) if use_sidecar else None
+        # 파일별 일별 집계 인덱스 (LRU, 파일 캐시와 같은 키 사용)
+        self._day_indexes = OrderedDict()
+        
+        # 사이드카를 쓰지 않을 때의 증분 분석 상태 (메모리에만 보관)
+        self._incremental_states = {}
+        
+        # 단계별 측정 (profiling이 True일 때만, 스레드별로 진행 중인 측정을 구분)
+        self.profiling = profiling
+        self.profile_memory = profile_memory  # tracemalloc 사용 (정확하지만 분석이 느려짐)
+        self.profiles = deque(maxlen=PROFILE_HISTORY)
+        self._local = threading.local()
         
     def _load_pandas(self):
         """pandas 지연 로딩"""
@@ -12,36 +141,201 @@ class DataAnalyzer:
             self._pandas = pd
         return self._pandas
         
+    def prewarm(self):
+        """pandas를 백그라운드 스레드에서 미리 불러오기 (첫 날짜 범위 조회/분석이 불러오는 시간을 기다리지 않도록)"""
+        if self._pandas is None:
+            threading.Thread(target=self._load_pandas, daemon=True).start()
+        
+    @property
+    def last_profile(self):
+        """가장 최근 측정 결과 (없으면 None)"""
+        return self.profiles[-1] if self.profiles else None
+        
+    @contextmanager
+    def _profiled(self, label, file_path=None):
+        """profiling이 켜져 있으면 이 블록 안의 단계별 측정 결과를 profiles에 추가"""
+        if not self.profiling or getattr(self._local, 'profile', None) is not None:
+            yield
+            return
+        profile = AnalysisProfile(label, file_path, trace_memory=self.profile_memory).start()
+        self._local.profile = profile
+        try:
+            yield
+        finally:
+            self._local.profile = None
+            profile.finish()
+            self.profiles.append(profile)
+            
+    def _stage(self, name):
+        """단계 측정 컨텍스트 (측정 중이 아니면 아무것도 하지 않음)"""
+        self._check_cancelled()
+        profile = getattr(self._local, 'profile', None)
+        return profile.stage(name) if profile else NULL_STAGE
+        
+    @contextmanager
+    def _cancellable(self, cancel_token):
+        """이 블록 안에서 단계/청크가 시작될 때마다 cancel_token의 취소 요청 확인"""
+        if cancel_token is None or getattr(self._local, 'cancel_token', None) is not None:
+            yield
+            return
+        self._local.cancel_token = cancel_token
+        try:
+            yield
+        finally:
+            self._local.cancel_token = None
+            
+    def _check_cancelled(self):
+        """취소 요청이 있으면 AnalysisCancelled 발생 (단계/청크 경계에서 호출)"""
+        token = getattr(self._local, 'cancel_token', None)
+        if token is not None:
+            token.check()
+        
+    def _cache_key(self, file_path):
+        """캐시 키 (절대 경로, 수정 시각, 파일 크기)"""
+        stat = os.stat(file_path)
+        return (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+        
+    def _cache_get(self, key):
+        """캐시에서 DataFrame 조회 (최근 사용으로 갱신)"""
+        with self._cache_lock:
+            entry = self._frame_cache.get(key)
+            if entry is None:
+                return None
+            self._frame_cache.move_to_end(key)
+            return entry[0]
+            
+    def _cache_put(self, key, df):
+        """DataFrame을 캐시에 저장하고 한도를 넘으면 오래된 항목부터 제거"""
+        size = int(df.memory_usage(deep=True).sum())
+        if size > self.cache_max_bytes:
+            return
+            
+        with self._cache_lock:
+            # 같은 파일의 이전 버전(수정 시각/크기가 다른 항목)은 더 이상 쓸모가 없음
+            for old_key in [k for k in self._frame_cache if k[0] == key[0]]:
+                self._frame_cache_bytes -= self._frame_cache.pop(old_key)[1]
+                
+            self._frame_cache[key] = (df, size)
+            self._frame_cache_bytes += size
+            
+            while self._frame_cache and (len(self._frame_cache) > self.cache_max_entries
+                                         or self._frame_cache_bytes > self.cache_max_bytes):
+                _, (_, old_size) = self._frame_cache.popitem(last=False)
+                self._frame_cache_bytes -= old_size
+                
+    def clear_cache(self):
+        """파싱된 DataFrame 캐시 비우기"""
+        with self._cache_lock:
+            self._frame_cache.clear()
+            self._frame_cache_bytes = 0
+            
+    def _read_csv(self, file_path, progress_callback=None):
+        """
+        CSV 파일을 DataFrame으로 읽어 반환합니다. (캐시 사용)
+        분석과 날짜 필터에 쓰는 컬럼만 읽으며, 같은 파일(경로, 수정 시각, 크기 동일)은 한 번만 파싱합니다.
+        반환된 DataFrame은 캐시와 공유되므로 직접 수정하면 안 됩니다.
+        """
+        pd = self._load_pandas()
+        
+        key = self._cache_key(file_path)
+        df = self._cache_get(key)
+        if df is not None:
+            if progress_callback:
+                progress_callback(30, "캐시된 데이터 사용 중...")
+            return df
+            
+        if self._sidecar:
+            with self._stage('read') as stage:
+                df = self._sidecar.load(file_path, pd)
+                if df is not None:
+                    stage.rows(rows_out=len(df))
+            if df is not None:
+                if progress_callback:
+                    progress_callback(30, "사이드카 캐시에서 불러옴")
+                self._cache_put(key, df)
+                return df
+                
+        if progress_callback:
+            progress_callback(15, "인코딩 감지 중...")
+        with self._stage('encoding'):
+            encodings = encoding_candidates(file_path)
+        
+        for i, encoding in enumerate(encodings):
+            try:
+                if progress_callback:
+                    progress_callback(20 + i * 5, f"파일 읽는 중... ({encoding})")
+                df = self._read_frame(file_path, encoding)
+                break
+            except UnicodeDecodeError:
+                # 감지 결과가 틀린 경우에만 다음 인코딩으로 다시 읽음
+                forget_encoding(file_path)
+                continue
+                
+        if df is not None:
+            remember_encoding(file_path, encoding)
+            self._cache_put(key, df)
+            if self._sidecar:
+                # 사이드카 저장(해시 계산 포함)은 분석을 지연시키지 않도록 백그라운드에서 수행
+                threading.Thread(target=self._save_sidecar, args=(file_path, df), daemon=True).start()
+        return df
+        
+    def _save_sidecar(self, file_path, df):
+        """사이드카 캐시 저장 (실패해도 분석에는 영향 없음)"""
+        try:
+            self._sidecar.save(file_path, df, self._pandas)
+        except Exception as e:
+            print(f"사이드카 캐시 저장 중 오류 발생: {e}")
+        
     def _find_columns(self, df):
-        """필요한 컬럼 찾기"""
+        """필요한 컬럼 찾기 (헤더 지문별로 캐시)"""
+        return self._resolve_columns(list(df.columns))
+        
+    def _resolve_columns(self, columns):
+        """컬럼 이름 목록의 (종목명, 평가손익, 매매구분, 코드) 컬럼 반환 (헤더 지문별로 캐시)"""
+        key = header_fingerprint(columns)
+        with _column_maps_lock:
+            found = _column_maps.get(key)
+            if found is not None:
+                _column_maps.move_to_end(key)
+                return found
+                
+        found = self._match_columns(columns)
+        with _column_maps_lock:
+            _column_maps[key] = found
+            while len(_column_maps) > COLUMN_MAP_CACHE_MAX:
+                _column_maps.popitem(last=False)
+        return found
+        
+    def _match_columns(self, columns):
+        """컬럼 이름 목록에서 필요한 컬럼 찾기"""
         stock_col, profit_col, trade_type_col, code_col = None, None, None, None
         
         # 종목명 컬럼 찾기
-        for col in df.columns:
+        for col in columns:
             if '종목' in str(col) or 'stock' in str(col).lower() or 'name' in str(col).lower():
                 stock_col = col
                 break
                 
         # 평가손익 컬럼 찾기
-        for col in df.columns:
+        for col in columns:
             if '평가손익' in str(col) or '손익' in str(col) or 'profit' in str(col).lower():
                 profit_col = col
                 break
         
         # 매매구분 컬럼 찾기 (선택적)
-        for col in df.columns:
+        for col in columns:
             if '매매' in str(col) or '구분' in str(col) or 'type' in str(col).lower():
                 trade_type_col = col
                 break
                 
         # 코드 컬럼 찾기 (필수)
-        for col in df.columns:
+        for col in columns:
             if '코드' in str(col) or 'code' in str(col).lower():
                 code_col = col
                 break
                 
         if stock_col is None or profit_col is None or code_col is None:
-            available_cols = ", ".join(df.columns.tolist())
+            available_cols = ", ".join(columns)
             missing_cols = []
             if stock_col is None: missing_cols.append('종목명')
             if profit_col is None: missing_cols.append('평가손익')
@@ -50,94 +344,533 @@ class DataAnalyzer:
             
         return stock_col, profit_col, trade_type_col, code_col
         
+    def _read_header(self, file_path, encoding):
+        """헤더 줄만 읽어 컬럼 이름 목록 반환"""
+        return list(self._pandas.read_csv(file_path, encoding=encoding, nrows=0).columns)
+        
+    def _read_schema(self, names, typed=True, dates=True):
+        """
+        헤더에서 pd.read_csv 인자(usecols, dtype 등)를 결정합니다.
+        종목명/평가손익/매매구분/코드 컬럼과 (dates이면) '매매구분'/'날짜'만 읽고,
+        종목명·코드·매매구분은 category로, '날짜'는 읽으면서 바로 datetime으로 변환합니다.
+        typed이면 평가손익은 천 단위 쉼표를 C 파서가 처리하는 float64로,
+        아니면 (숫자로 읽을 수 없는 값이 있을 때) 문자열로 읽어 _clean_profit으로 정리합니다.
+        필요한 컬럼을 찾을 수 없으면 None: 전체를 읽어 이전과 같이 오류 메시지/날짜 범위를 처리합니다.
+        """
+        pd = self._pandas
+        try:
+            stock_col, profit_col, trade_type_col, code_col = self._resolve_columns(names)
+        except Exception:
+            return None
+        wanted = {stock_col, profit_col, trade_type_col, code_col, *(DATE_COLUMNS if dates else ())}
+        usecols = [col for col in names if col in wanted]
+        dtype = {col: 'category' for col in (stock_col, code_col, trade_type_col, '매매구분') if col in usecols}
+        dtype[profit_col] = 'float64' if typed else str
+        schema = {'usecols': usecols, 'dtype': dtype, 'thousands': ','}
+        
+        if '날짜' in usecols:
+            if int(pd.__version__.split('.')[0]) >= 2:
+                # 형식에 맞지 않는 값이 있으면 문자열로 남으며, 날짜 필터에서 이전과 같이 변환됨
+                schema.update(parse_dates=['날짜'], date_format=DATE_FORMAT)
+            else:
+                dtype['날짜'] = str # date_format이 없는 pandas 1.x는 날짜 필터에서 변환
+        return schema
+        
+    def _read_frame(self, file_path, encoding):
+        """
+        헤더 줄을 먼저 읽어 정한 스키마로 파일 전체를 파싱합니다.
+        평가손익을 숫자로 읽을 수 없으면 평가손익만 문자열로 바꿔 다시 읽고 바로 float64로 변환합니다.
+        (C 파서는 실패한 뒤 이어 읽을 수 없으므로 다시 읽어야 하며, 다른 컬럼의 타입은 그대로)
+        """
+        pd = self._pandas
+        with self._stage('columns'):
+            names = self._read_header(file_path, encoding)
+            
+        for typed in (True, False):
+            schema = self._read_schema(names, typed=typed) or {}
+            try:
+                with self._stage('read') as stage:
+                    df = pd.read_csv(file_path, encoding=encoding, **schema)
+                    stage.rows(rows_out=len(df))
+                break
+            except UnicodeDecodeError:
+                raise
+            except ValueError:
+                if not (typed and schema):
+                    raise
+                print(PROFIT_FALLBACK_MESSAGE, file=sys.stderr)
+                
+        if not typed:
+            profit_col = self._resolve_columns(names)[1]
+            with self._stage('cleaning') as stage:
+                df[profit_col] = self._clean_profit(df[profit_col])
+                stage.rows(len(df), len(df))
+        if schema:
+            code_col = self._resolve_columns(names)[3]
+            df[code_col] = self._normalize_codes(df[code_col])
+        return df
+        
+    def _clean_profit(self, series):
+        """평가손익 컬럼을 숫자 배열로 변환 (쉼표/공백 제거, 변환 실패는 0)"""
+        pd = self._pandas
+        
+        if series.dtype.kind in 'iuf':
+            # 이미 숫자로 파싱된 컬럼은 문자열 정리가 필요 없음
+            values = pd.to_numeric(series, errors='coerce')
+        else:
+            # 대부분의 값은 쉼표만 제거하면 바로 변환됨
+            text = series.astype(str)
+            values = pd.to_numeric(text.str.replace(',', '', regex=False), errors='coerce')
+            
+            # 공백 등으로 변환에 실패한 값만 기존 규칙(쉼표/공백 제거 후 strip)으로 다시 정리
+            failed = values.isna() & series.notna()
+            if failed.any():
+                retry = text[failed].str.replace(r'[, ]', '', regex=True).str.strip()
+                values = values.where(~failed, pd.to_numeric(retry, errors='coerce'))
+        return values.fillna(0).to_numpy()
+        
+    def _sell_flags(self, series):
+        """매매구분 컬럼에서 '매도' 여부를 0/1 배열로 계산 (고유값에 대해서만 문자열 검사)"""
+        pd = self._pandas
+        
+        codes, uniques = pd.factorize(series)
+        is_sell = pd.Series(uniques).astype(str).str.contains('매도', regex=False, na=False).to_numpy(dtype='int64')
+        # 결측값(코드 -1)은 매도가 아님
+        return (is_sell.take(codes) if len(uniques) else codes) * (codes >= 0)
+        
+    def _aggregate(self, df, stock_col, profit_col, trade_type_col, code_col, dates=None):
+        """
+        (종목명, 코드)별 평가손익 합계와 매도 횟수를 담은 부분 집계 DataFrame 반환
+        dates가 주어지면 (날짜, 종목명, 코드)별로 집계합니다.
+        """
+        pd = self._pandas
+        
+        with self._stage('cleaning') as stage:
+            profit = self._clean_profit(df[profit_col])
+            if trade_type_col and trade_type_col in df.columns:
+                sell_count = self._sell_flags(df[trade_type_col])
+            else:
+                sell_count = 0
+            stage.rows(len(df), len(df))
+            
+        with self._stage('groupby') as stage:
+            values = pd.DataFrame({'profit': profit, 'sell_count': sell_count}, index=df.index)
+            keys = [df[stock_col], df[code_col]]
+            if dates is not None:
+                keys.insert(0, dates)
+            summed = values.groupby(keys, observed=True).sum()
+            stage.rows(len(df), len(summed))
+        return summed
+        
+    def _format_results(self, summed):
+        """부분 집계를 수익금 내림차순으로 정렬하고 (종목명, 평가손익, 매도 횟수, 통화) 컬럼별 결과로 변환"""
+        with self._stage('formatting') as stage:
+            summed = summed.sort_values(by='profit', ascending=False)
+            
+            # 통화는 코드로 결정되므로 행이 아닌 그룹 키에 대해서만 계산
+            results = AnalysisResults(
+                summed.index.get_level_values(0).to_numpy(dtype=object),
+                summed['profit'].to_numpy(),
+                summed['sell_count'].to_numpy(dtype='int64'),
+                self._currencies(summed.index.get_level_values(1))
+            )
+            stage.rows(len(summed), len(results))
+        return results
+        
+    def _currencies(self, codes):
+        """코드 배열의 통화 배열 반환 (알파벳 코드는 USD, 그 외는 KRW)"""
+        import numpy as np
+        pd = self._pandas
+        if self._numeric_key(codes):
+            return np.full(len(codes), 'KRW', dtype=object)
+        is_usd = pd.Series(codes, dtype=object).str.isalpha().eq(True).to_numpy()
+        return np.where(is_usd, 'USD', 'KRW').astype(object)
+        
+    def _numeric_key(self, values):
+        """키 컬럼(또는 집계 인덱스 수준)이 숫자 타입인지 여부 (category면 범주 값의 타입)"""
+        dtype = values.dtype
+        if isinstance(dtype, self._pandas.CategoricalDtype):
+            dtype = dtype.categories.dtype
+        return dtype.kind in 'iuf'
+        
+    def _numeric_categories(self, codes):
+        """
+        category 코드 컬럼의 범주 값이 모두 숫자로 변환되면 숫자로 바꾼 범주 값, 아니면 None
+        (타입 추론으로 읽었다면 컬럼 전체가 숫자가 되는 경우)
+        """
+        pd = self._pandas
+        categories = codes.cat.categories
+        if not len(categories):
+            return None
+        values = pd.to_numeric(pd.Series(categories, dtype=object), errors='coerce')
+        return None if values.isna().any() else values
+        
+    def _normalize_codes(self, codes):
+        """
+        코드가 모두 숫자면 예전 타입 추론처럼 숫자 코드로 변환합니다.
+        ('005930'과 '5930'이 같은 코드가 됨. 문자가 섞인 컬럼은 문자열 그대로 유지)
+        category의 범주 값만 변환하므로 행 수와 관계없이 빠릅니다.
+        """
+        import numpy as np
+        pd = self._pandas
+        values = self._numeric_categories(codes)
+        if values is None:
+            return codes
+        uniques = pd.Index(values.unique())
+        mapping = uniques.get_indexer(values)
+        old_codes = codes.cat.codes.to_numpy()
+        # 결측값(코드 -1)은 그대로 결측값
+        new_codes = np.where(old_codes >= 0, mapping.take(old_codes, mode='clip'), -1)
+        return pd.Series(pd.Categorical.from_codes(new_codes, uniques), index=codes.index, name=codes.name)
+        
+    def _numeric_code_groups(self, summed):
+        """
+        집계의 코드 수준(마지막 수준)을 숫자로 바꿔 같은 숫자 코드끼리 다시 합산합니다.
+        (청크별 category는 문자열 값이므로 파일 전체의 코드가 숫자였으면 전체 파싱 결과와 맞춤)
+        """
+        pd = self._pandas
+        keys = [summed.index.get_level_values(i) for i in range(summed.index.nlevels)]
+        keys[-1] = pd.Index(pd.to_numeric(pd.Series(keys[-1], dtype=object)).to_numpy())
+        with self._stage('groupby') as stage:
+            merged = summed.groupby(keys, observed=True).sum()
+            merged.index.names = summed.index.names
+            stage.rows(len(summed), len(merged))
+        return merged
+        
     def _calculate_results(self, df, stock_col, profit_col, trade_type_col, code_col):
         """결과 계산 및 통화 결정"""
+        summed = self._aggregate(df, stock_col, profit_col, trade_type_col, code_col)
+        return self._format_results(summed)
+        
+    def _combine_partials(self, partials):
+        """(종목명, 코드)별 부분 집계 여러 개를 하나로 합산"""
         pd = self._pandas
+        if len(partials) == 1:
+            return partials[0]
+        with self._stage('groupby') as stage:
+            combined = pd.concat(partials)
+            summed = combined.groupby(level=list(range(partials[0].index.nlevels)), observed=True).sum()
+            stage.rows(len(combined), len(summed))
+        return summed
         
-        # 데이터 정리
-        df[f'{profit_col}_clean'] = df[profit_col].astype(str).str.replace(',', '').str.replace(' ', '').str.strip()
-        df[f'{profit_col}_clean'] = pd.to_numeric(df[f'{profit_col}_clean'], errors='coerce').fillna(0)
+    def _string_codes(self, summed):
+        """(종목명, 코드)별 집계의 숫자 코드를 문자열 코드로 변환"""
+        pd = self._pandas
+        index = summed.index
+        summed = summed.copy()
+        summed.index = pd.MultiIndex.from_arrays(
+            [index.get_level_values(0), index.get_level_values(1).astype(str)], names=index.names
+        )
+        return summed
         
-        # 매도 횟수 계산
-        if trade_type_col and trade_type_col in df.columns:
-            df['sell_count'] = df[trade_type_col].astype(str).apply(lambda x: 1 if '매도' in x else 0)
-        else:
-            df['sell_count'] = 0
+    def _check_date_columns(self, columns):
+        """날짜 필터링에 필요한 컬럼 확인"""
+        if '매매구분' not in columns:
+            raise Exception("날짜 필터링 중 오류 발생: '매매구분' 열을 찾을 수 없습니다.")
+        if '날짜' not in columns:
+            raise Exception("날짜 필터링 중 오류 발생: '날짜' 열을 찾을 수 없습니다.")
+            
+    def _sell_dates(self, df):
+        """
+        '매도' 거래 중 날짜를 읽을 수 있는 행의 불리언 마스크와 해당 행의 날짜를 반환
+        (DataFrame 복사본을 만들지 않음)
+        """
+        pd = self._pandas
+        
+        try:
+            mask = (df['매매구분'] == '매도').to_numpy(dtype=bool, copy=True)
             
-        # 통화 결정 함수
-        def determine_currency(code):
-            if isinstance(code, str) and code.isalpha():
-                return 'USD'
-            return 'KRW'
+            # '날짜' 열은 매도 행에 대해서만 datetime으로 변환 (파싱 실패 행은 제외)
+            dates = pd.to_datetime(df['날짜'][mask], format=DATE_FORMAT, errors='coerce')
+            valid = dates.notna().to_numpy()
+            mask[mask] = valid
+            return mask, dates[valid]
             
-        df['currency'] = df[code_col].apply(determine_currency)
+        except Exception as e:
+            raise Exception(f"날짜 필터링 중 오류 발생: {e}")
 
-        # 그룹별 집계 (stock_col과 code_col로 그룹화)
-        agg_funcs = {
-            f'{profit_col}_clean': 'sum',
-            'sell_count': 'sum',
-            'currency': 'first' # 그룹 내 통화는 동일하다고 가정
-        }
-        result_df = df.groupby([stock_col, code_col]).agg(agg_funcs)
+    def normalize_trades(self, df):
+        """
+        거래 내역 DataFrame을 거래 원장 저장용 표준 컬럼으로 변환합니다.
+        반환 컬럼: stock, code, trade_type, trade_date(YYYY-MM-DD 또는 None), profit,
+                  is_sell(매매구분에 '매도' 포함), sell_trade(매매구분이 '매도'), currency
+        분석과 마찬가지로 종목명이나 코드가 없는 행은 제외합니다.
+        """
+        pd = self._load_pandas()
+        stock_col, profit_col, trade_type_col, code_col = self._find_columns(df)
+
+        df = df[(df[stock_col].notna() & df[code_col].notna()).to_numpy()]
+        codes = df[code_col].astype(str)
+        trades = pd.DataFrame({
+            'stock': df[stock_col].astype(str),
+            'code': codes,
+            'trade_type': df[trade_type_col].astype(object) if trade_type_col else None,
+            'trade_date': None,
+            'profit': self._clean_profit(df[profit_col]).astype('float64'),
+            'is_sell': self._sell_flags(df[trade_type_col]) if trade_type_col else 0,
+            'sell_trade': (df['매매구분'] == '매도').to_numpy(dtype='int64') if '매매구분' in df.columns else 0,
+            'currency': self._currencies(codes),
+        }, index=df.index)
+
+        if '날짜' in df.columns:
+            dates = pd.to_datetime(df['날짜'], format=DATE_FORMAT, errors='coerce')
+            trades['trade_date'] = dates.dt.strftime('%Y-%m-%d').astype(object).where(dates.notna(), None)
+        if trade_type_col:
+            trades['trade_type'] = trades['trade_type'].where(trades['trade_type'].notna(), None)
+        return trades
+
+    def _build_day_index(self, file_path, progress_callback=None, streaming=None):
+        """파일의 '매도' 거래를 (날짜, 종목명, 코드)별로 집계한 DayIndex 생성"""
+        if self._use_streaming(file_path, streaming):
+            table, _, _, _ = self._stream_aggregate(file_path, progress_callback, by_date=True)
+            return DayIndex(self._pandas, table)
+            
+        if progress_callback:
+            progress_callback(10, "파일 읽는 중...")
+        df = self._read_csv(file_path, progress_callback)
+        if df is None:
+            raise Exception("파일 인코딩을 인식할 수 없습니다.")
+            
+        if progress_callback:
+            progress_callback(50, "날짜 필터링 적용 중...")
+        self._check_date_columns(df.columns)
+        with self._stage('date_filter') as stage:
+            mask, dates = self._sell_dates(df)
+            stage.rows(len(df), len(dates))
+            df = df[mask]
+        
+        if progress_callback:
+            progress_callback(60, "데이터 분석 중...")
+        with self._stage('columns'):
+            columns = self._find_columns(df)
+        
+        if progress_callback:
+            progress_callback(80, "일별 집계 생성 중...")
+        return DayIndex(self._pandas, self._aggregate(df, *columns, dates=dates))
+        
+    def get_day_index(self, file_path, progress_callback=None, streaming=None):
+        """
+        파일별 일별 집계 인덱스 반환 (파일 한 번당 한 번만 생성)
+        이후 기간 변경은 전체 데이터를 다시 읽지 않고 인덱스 구간 조회로 처리됩니다.
+        """
+        self._load_pandas()
+        key = self._cache_key(file_path)
+        with self._cache_lock:
+            index = self._day_indexes.get(key)
+            if index is not None:
+                self._day_indexes.move_to_end(key)
+                return index
+                
+        index = self._build_day_index(file_path, progress_callback, streaming)
+        
+        with self._cache_lock:
+            for old_key in [k for k in self._day_indexes if k[0] == key[0]]:
+                del self._day_indexes[old_key]
+            self._day_indexes[key] = index
+            while len(self._day_indexes) > self.cache_max_entries:
+                self._day_indexes.popitem(last=False)
+        return index
+        
+    def query_date_range(self, file_path, start_date=None, end_date=None):
+        """
+        이미 만들어진 일별 집계 인덱스로 기간 분석 결과를 즉시 반환합니다.
+        인덱스가 아직 없거나 파일이 바뀌었으면 None을 반환합니다.
+        """
+        try:
+            key = self._cache_key(file_path)
+        except OSError:
+            return None
+        with self._cache_lock:
+            index = self._day_indexes.get(key)
+        if index is None:
+            return None
+            
+        results = self._format_results(index.query(start_date, end_date))
+        self.results = results
+        return results
+        
+    def _use_streaming(self, file_path, streaming=None):
+        """
+        스트리밍 분석 사용 여부 (None이면 파일 크기와 캐시 여부로 결정)
+        큰 파일이라도 메모리 캐시나 유효한 사이드카가 있으면 CSV를 다시 파싱하지 않도록 전체 읽기를 사용합니다.
+        """
+        if streaming is not None:
+            return streaming
+        key = self._cache_key(file_path)
+        if key[2] < self.streaming_threshold or self._cache_get(key) is not None:
+            return False
+        return not (self._sidecar and self._sidecar.has(file_path))
+        
+    def _iter_chunks(self, file_path, encoding, progress_callback=None, **read_kwargs):
+        """CSV를 청크 단위로 읽으며 읽은 바이트 기준으로 진행률 보고"""
+        pd = self._pandas
+        
+        size = max(os.path.getsize(file_path), 1)
+        with open(file_path, 'rb') as f:
+            reader = iter(pd.read_csv(f, encoding=encoding, chunksize=STREAMING_CHUNK_ROWS, **read_kwargs))
+            while True:
+                with self._stage('read') as stage:
+                    chunk = next(reader, None)
+                    if chunk is not None:
+                        stage.rows(rows_out=len(chunk))
+                if chunk is None:
+                    break
+                if progress_callback:
+                    pos = min(f.tell(), size)
+                    progress_callback(10 + 80 * pos / size,
+                                      f"파일 읽는 중... ({pos / 1048576:,.0f} / {size / 1048576:,.0f} MB)")
+                yield chunk
+                
+    def _stream_aggregate(self, file_path, progress_callback=None, by_date=False):
+        """
+        파일을 청크 단위로 읽어 (종목명, 코드)별 부분 집계를 합산합니다.
+        전체 DataFrame을 만들지 않으므로 메모리 사용량이 청크 크기로 제한됩니다.
+        여러 청크에서 타입이 달라지지 않도록 종목명/코드는 (문자열 값의) category로 읽고,
+        파일 전체의 코드가 숫자였으면 마지막에 전체 파싱과 같이 숫자 코드로 합칩니다.
+        by_date가 True면 '매도' 거래만 (날짜, 종목명, 코드)별로 집계합니다.
+        반환값: (집계, 인코딩, 전체 컬럼 목록, (종목명, 평가손익, 매매구분, 코드) 컬럼)
+        """
+        pd = self._load_pandas()
+        dated = by_date
+        
+        with self._stage('encoding'):
+            encodings = encoding_candidates(file_path)
+            
+        for encoding in encodings:
+            try:
+                header = pd.read_csv(file_path, encoding=encoding, nrows=0)
+                if dated:
+                    self._check_date_columns(header.columns)
+                with self._stage('columns'):
+                    columns = self._find_columns(header)
+                    
+                names = list(header.columns)
+                summed = self._stream_chunks(file_path, encoding, header, columns, dated,
+                                             self._read_schema(names, dates=dated),
+                                             self._read_schema(names, typed=False, dates=dated), progress_callback)
+                remember_encoding(file_path, encoding)
+                return summed, encoding, list(header.columns), columns
+                
+            except UnicodeDecodeError:
+                forget_encoding(file_path)
+                continue
+                
+        raise Exception("파일 인코딩을 인식할 수 없습니다.")
         
-        # 수익금 기준으로 정렬
-        result_df = result_df.sort_values(by=f'{profit_col}_clean', ascending=False)
+    def _stream_chunks(self, file_path, encoding, header, columns, dated, read_kwargs, fallback_kwargs,
+                       progress_callback=None):
+        """
+        read_kwargs로 청크를 읽으며 부분 집계를 주기적으로 합산합니다.
+        평가손익을 숫자로 읽지 못한 청크가 있으면 이미 집계한 행은 그대로 두고,
+        그 청크부터 나머지만 fallback_kwargs(평가손익은 문자열)로 다시 읽습니다.
+        """
+        pd = self._pandas
         
-        # 결과 포맷팅: (종목명, 평가손익, 매도 횟수, 통화)
-        formatted_results = []
-        for (stock, code), row in result_df.iterrows(): # (stock, code)로 이터레이트
-            formatted_results.append((stock, row[f'{profit_col}_clean'], int(row['sell_count']), row['currency']))
+        # 빈 집계로 시작하여 행이 없는 파일도 같은 형식의 결과를 반환
+        empty = header[read_kwargs['usecols']].astype(read_kwargs['dtype'])
+        if dated:
+            summed = self._aggregate(empty, *columns, dates=pd.to_datetime(empty['날짜']))
+        else:
+            summed = self._aggregate(empty, *columns)
             
-        return formatted_results
+        partials = []
+        done = 0 # 집계한 데이터 행 수 (다시 읽을 때 건너뜀)
+        numeric_codes = True # 지금까지 읽은 코드가 모두 숫자인지 (전체 파싱의 타입 추론과 같은 기준)
+        while True:
+            # 건너뛸 때는 헤더 줄도 건너뛰므로 컬럼 이름을 직접 지정
+            skip = {'skiprows': done + 1, 'header': None, 'names': list(header.columns)} if done else {}
+            try:
+                for chunk in self._iter_chunks(file_path, encoding, progress_callback, **read_kwargs, **skip):
+                    rows = len(chunk)
+                    numeric_codes = numeric_codes and self._numeric_categories(chunk[columns[3]]) is not None
+                    if dated:
+                        with self._stage('date_filter') as stage:
+                            mask, dates = self._sell_dates(chunk)
+                            stage.rows(len(chunk), len(dates))
+                            chunk = chunk[mask]
+                        partials.append(self._aggregate(chunk, *columns, dates=dates))
+                    else:
+                        partials.append(self._aggregate(chunk, *columns))
+                    done += rows
+                    if len(partials) >= STREAMING_MERGE_EVERY:
+                        summed = self._combine_partials([summed] + partials)
+                        partials = []
+                summed = self._combine_partials([summed] + partials)
+                if numeric_codes and len(summed):
+                    summed = self._numeric_code_groups(summed)
+                return summed
+            except UnicodeDecodeError:
+                raise
+            except ValueError:
+                if read_kwargs is fallback_kwargs:
+                    raise
+                print(PROFIT_FALLBACK_MESSAGE, file=sys.stderr)
+                read_kwargs = fallback_kwargs
+        
+    def _stream_date_range(self, file_path):
+        """청크 단위로 읽으며 '매도' 거래의 최소/최대 날짜 계산"""
+        pd = self._pandas
+        
+        for encoding in encoding_candidates(file_path):
+            try:
+                header = pd.read_csv(file_path, encoding=encoding, nrows=0)
+                if '매매구분' not in header.columns or '날짜' not in header.columns:
+                    print("'매매구분' 또는 '날짜' 열을 찾을 수 없습니다. 날짜 범위 추출 불가.")
+                    return None, None
+                    
+                min_date, max_date = None, None
+                for chunk in self._iter_chunks(file_path, encoding, usecols=['매매구분', '날짜']):
+                    dates = pd.to_datetime(chunk.loc[chunk['매매구분'] == '매도', '날짜'], format=DATE_FORMAT, errors='coerce').dropna()
+                    if dates.empty:
+                        continue
+                    min_date = dates.min() if min_date is None else min(min_date, dates.min())
+                    max_date = dates.max() if max_date is None else max(max_date, dates.max())
+                    
+                remember_encoding(file_path, encoding)
+                return min_date, max_date
+                
+            except UnicodeDecodeError:
+                forget_encoding(file_path)
+                continue
+        return None, None
         
     def get_statistics(self):
-        """통계 정보 반환 (통화별 집계)"""
-        if not self.results:
-            return {
-                'total_stocks': 0,
-                'profit_count_KRW': 0,
-                'loss_count_KRW': 0,
-                'total_profit_KRW': 0,
-                'profit_count_USD': 0,
-                'loss_count_USD': 0,
-                'total_profit_USD': 0
-            }
-            
-        total_stocks = len(self.results)
-        profit_count_krw = sum(1 for _, profit, _, currency in self.results if currency == 'KRW' and profit > 0)
-        loss_count_krw = sum(1 for _, profit, _, currency in self.results if currency == 'KRW' and profit < 0)
-        total_profit_krw = sum(profit for _, profit, _, currency in self.results if currency == 'KRW')
-
-        profit_count_usd = sum(1 for _, profit, _, currency in self.results if currency == 'USD' and profit > 0)
-        loss_count_usd = sum(1 for _, profit, _, currency in self.results if currency == 'USD' and profit < 0)
-        total_profit_usd = sum(profit for _, profit, _, currency in self.results if currency == 'USD')
-        
-        return {
-            'total_stocks': total_stocks,
-            'profit_count_KRW': profit_count_krw,
-            'loss_count_KRW': loss_count_krw,
-            'total_profit_KRW': total_profit_krw,
-            'profit_count_USD': profit_count_usd,
-            'loss_count_USD': loss_count_usd,
-            'total_profit_USD': total_profit_usd
-        }
+        """통계 정보 반환 (통화별 집계와 승률, 형식은 result_model.build_statistics 참고)"""
+        # 원장 결과나 UI에서 튜플 목록을 넣은 경우에도 같은 방식으로 계산
+        return AnalysisResults.from_rows(self.results).statistics()
 
     def get_date_range(self, file_path):
         """
         CSV 파일에서 '매도' 거래의 최소 및 최대 날짜를 찾아 반환합니다.
         날짜 형식은 YYYY-MM-DD 입니다.
         """
+        with self._profiled('get_date_range', file_path):
+            return self._date_range(file_path)
+            
+    def _date_range(self, file_path):
         pd = self._load_pandas()
         
-        df = None
-        encodings = ['euc-kr', 'cp949', 'utf-8', 'utf-8-sig']
+        # 일별 집계 인덱스를 미리 만들어 두면 이후 기간 분석은 다시 읽지 않아도 됨
+        try:
+            index = self.get_day_index(file_path)
+            if index.empty:
+                return None, None
+            return index.min_date.strftime('%Y-%m-%d'), index.max_date.strftime('%Y-%m-%d')
+        except Exception as e:
+            # 분석용 컬럼이 없는 파일은 아래에서 날짜 컬럼만으로 범위를 구함
+            print(f"일별 집계 생성 실패, 날짜 범위만 추출: {e}")
         
-        for encoding in encodings:
+        if self._use_streaming(file_path):
             try:
-                df = pd.read_csv(file_path, encoding=encoding)
-                break
-            except UnicodeDecodeError:
-                continue
+                min_date, max_date = self._stream_date_range(file_path)
+            except Exception as e:
+                print(f"날짜 범위 추출 중 오류 발생: {e}")
+                return None, None
+            if min_date is None:
+                return None, None
+            return min_date.strftime('%Y-%m-%d'), max_date.strftime('%Y-%m-%d')
+            
+        df = self._read_csv(file_path)
                 
         if df is None:
             # 파일 읽기 실패 시
@@ -155,7 +888,7 @@ class DataAnalyzer:
             if '날짜' not in df.columns:
                 print("'날짜' 열을 찾을 수 없습니다. 날짜 범위 추출 불가.")
                 return None, None
-            df['날짜'] = pd.to_datetime(df['날짜'], format='%Y.%m.%d', errors='coerce')
+            df['날짜'] = pd.to_datetime(df['날짜'], format=DATE_FORMAT, errors='coerce')
             df.dropna(subset=['날짜'], inplace=True) # 파싱 실패한 행 제거
 
             if df.empty:
@@ -170,79 +903,236 @@ class DataAnalyzer:
             print(f"날짜 범위 추출 중 오류 발생: {e}")
             return None, None
 
-    def analyze_csv(self, file_path, progress_callback=None, start_date=None, end_date=None):
-        """CSV 파일 분석 (날짜 필터링 기능 추가)"""
-        pd = self._load_pandas()
+    def _load_incremental_state(self, file_path):
+        """저장된 증분 분석 상태 조회 (형식이 다르면 None)"""
+        if self._sidecar:
+            state = self._sidecar.load_state(file_path)
+        else:
+            state = self._incremental_states.get(os.path.abspath(file_path))
+        if not state or state.get('version') != INCREMENTAL_STATE_VERSION:
+            return None
+        return state
         
-        if progress_callback:
-            progress_callback(10, "파일 읽는 중...")
+    def _save_incremental_state(self, file_path, encoding, names, columns, numeric_keys, summed):
+        """현재까지의 (종목명, 코드)별 집계와 읽은 위치를 저장"""
+        offset = os.path.getsize(file_path)
+        if not ends_with_newline(file_path):
+            return # 마지막 줄이 아직 완성되지 않았으면 이어 붙을 수 있으므로 저장하지 않음
+                
+        state = {
+            'version': INCREMENTAL_STATE_VERSION,
+            'encoding': encoding,
+            'offset': offset,
+            'fingerprint': file_fingerprint(file_path, offset),
+            'names': list(names),
+            'columns': list(columns),
+            'numeric_keys': list(numeric_keys),
+            'aggregates': [list(row) for row in zip(
+                summed.index.get_level_values(0).tolist(),
+                summed.index.get_level_values(1).tolist(),
+                summed['profit'].tolist(),
+                summed['sell_count'].tolist()
+            )]
+        }
+        try:
+            if self._sidecar:
+                self._sidecar.save_state(file_path, state)
+            else:
+                self._incremental_states[os.path.abspath(file_path)] = state
+        except (OSError, TypeError, ValueError) as e:
+            print(f"증분 분석 상태 저장 실패: {e}")
             
-        # CSV 파일 읽기 (여러 인코딩 시도)
-        df = None
-        encodings = ['euc-kr', 'cp949', 'utf-8', 'utf-8-sig']
+    def _read_tail(self, file_path, state):
+        """이전 분석 이후 추가된 부분만 파싱 (이전과 같은 타입으로 읽을 수 없으면 None)"""
+        pd = self._pandas
         
-        for i, encoding in enumerate(encodings):
-            try:
+        stock_col, _, _, code_col = state['columns']
+        key_cols = [(stock_col, state['numeric_keys'][0]), (code_col, state['numeric_keys'][1])]
+        
+        try:
+            with open(file_path, 'rb') as f, self._stage('read') as stage:
+                f.seek(state['offset'])
+                tail = pd.read_csv(f, header=None, names=state['names'], encoding=state['encoding'],
+                                   usecols=[col for col in state['columns'] if col is not None],
+                                   dtype={col: str for col, numeric in key_cols if not numeric})
+                stage.rows(rows_out=len(tail))
+        except (UnicodeDecodeError, ValueError) as e:
+            print(f"추가된 부분 파싱 실패, 전체 다시 분석: {e}")
+            return None
+            
+        # 숫자였던 키 컬럼에 문자가 추가되면 전체 파싱 결과의 타입도 달라지므로 다시 계산해야 함
+        for col, numeric in key_cols:
+            if numeric and len(tail) and tail[col].dtype.kind not in 'iuf':
+                return None
+        return tail
+        
+    def _aggregate_incremental(self, file_path, progress_callback=None, streaming=None):
+        """
+        날짜 필터 없는 (종목명, 코드)별 집계를 증분 방식으로 계산합니다.
+        파일 뒤에 행이 추가되기만 했다면 추가된 부분만 읽어 저장된 집계에 합산하고,
+        앞부분이 바뀌었거나 상태가 없으면 전체를 다시 계산합니다.
+        """
+        pd = self._load_pandas()
+        
+        size = os.path.getsize(file_path)
+        state = self._load_incremental_state(file_path)
+        if state and state['offset'] <= size and file_fingerprint(file_path, state['offset']) == state['fingerprint']:
+            stored = pd.DataFrame(
+                [row[2:] for row in state['aggregates']],
+                columns=['profit', 'sell_count'],
+                index=pd.MultiIndex.from_tuples([tuple(row[:2]) for row in state['aggregates']], names=[None, None])
+            )
+            
+            if size == state['offset']:
                 if progress_callback:
-                    progress_callback(20 + i * 5, f"인코딩 시도 중... ({encoding})")
-                df = pd.read_csv(file_path, encoding=encoding)
-                break
-            except UnicodeDecodeError:
-                continue
+                    progress_callback(80, "변경 없음, 저장된 집계 사용 중...")
+                return stored
                 
-        if df is None:
-            raise Exception("파일 인코딩을 인식할 수 없습니다.")
-            
-        # 날짜 필터링 로직
-        if start_date or end_date:
             if progress_callback:
-                progress_callback(50, "날짜 필터링 적용 중...")
+                progress_callback(30, f"추가된 부분만 읽는 중... ({size - state['offset']:,} 바이트)")
+            tail = self._read_tail(file_path, state)
             
-            try:
-                # '매매구분' 열 확인
-                if '매매구분' not in df.columns:
-                    raise Exception("'매매구분' 열을 찾을 수 없습니다.")
+            if tail is not None:
+                if progress_callback:
+                    progress_callback(80, "결과 계산 중...")
+                stock_col, profit_col, trade_type_col, code_col = state['columns']
+                partial = self._aggregate(tail, stock_col, profit_col, trade_type_col, code_col)
+                summed = self._combine_partials([stored, partial])
+                self._save_incremental_state(file_path, state['encoding'], state['names'],
+                                             state['columns'], state['numeric_keys'], summed)
+                return summed
                 
-                # '날짜' 열 확인
-                if '날짜' not in df.columns:
-                    raise Exception("'날짜' 열을 찾을 수 없습니다.")
-
-                # '매매구분'이 '매도'인 경우만 필터링
-                df = df[df['매매구분'] == '매도'].copy()
-
-                # '날짜' 열을 datetime 객체로 변환
-                df['날짜'] = pd.to_datetime(df['날짜'], format='%Y.%m.%d', errors='coerce')
-                df.dropna(subset=['날짜'], inplace=True) # 파싱 실패한 행 제거
-
-                # 시작일 필터링
-                if start_date:
-                    start_date_dt = pd.to_datetime(start_date, format='%Y-%m-%d', errors='coerce')
-                    if pd.notna(start_date_dt):
-                        df = df[df['날짜'] >= start_date_dt]
-
-                # 종료일 필터링
-                if end_date:
-                    end_date_dt = pd.to_datetime(end_date, format='%Y-%m-%d', errors='coerce')
-                    if pd.notna(end_date_dt):
-                        df = df[df['날짜'] <= end_date_dt]
+        # 전체 다시 계산
+        if self._use_streaming(file_path, streaming):
+            summed, encoding, names, columns = self._stream_aggregate(file_path, progress_callback)
+            numeric_keys = [self._numeric_key(summed.index.get_level_values(i)) for i in (0, 1)]
+            self._save_incremental_state(file_path, encoding, names, columns, numeric_keys, summed)
+            return summed
             
-            except Exception as e:
-                raise Exception(f"날짜 필터링 중 오류 발생: {e}")
-
         if progress_callback:
-            progress_callback(60, "데이터 분석 중...")
+            progress_callback(10, "파일 읽는 중...")
+        df = self._read_csv(file_path, progress_callback)
+        if df is None:
+            raise Exception("파일 인코딩을 인식할 수 없습니다.")
             
-        # 컬럼 찾기 및 분석
-        stock_col, profit_col, trade_type_col, code_col = self._find_columns(df)
+        if progress_callback:
+            progress_callback(60, "데이터 분석 중...")
+        with self._stage('columns'):
+            columns = self._find_columns(df)
+        stock_col, profit_col, trade_type_col, code_col = columns
         
         if progress_callback:
             progress_callback(80, "결과 계산 중...")
+        summed = self._aggregate(df, stock_col, profit_col, trade_type_col, code_col)
+        
+        # 추가된 부분은 헤더 없이 읽으므로 (읽지 않은 컬럼을 포함한) 전체 헤더 이름을 저장
+        encoding = detect_encoding(file_path)
+        numeric_keys = [self._numeric_key(df[col]) for col in (stock_col, code_col)]
+        self._save_incremental_state(file_path, encoding, self._read_header(file_path, encoding), columns, numeric_keys, summed)
+        return summed
+        
+    def _summarize(self, file_path, progress_callback=None, start_date=None, end_date=None, streaming=None):
+        """파일 하나의 (종목명, 코드)별 집계 반환 (기간이 없으면 증분 집계, 있으면 일별 인덱스 조회)"""
+        if not (start_date or end_date):
+            # 날짜 필터가 없으면 이전 분석 이후 추가된 행만 읽어 누적 집계에 합산
+            return self._aggregate_incremental(file_path, progress_callback, streaming)
+            
+        # 일별 집계 인덱스에서 기간 구간만 합산 (인덱스는 파일당 한 번만 생성)
+        index = self.get_day_index(file_path, progress_callback, streaming)
+        if progress_callback:
+            progress_callback(90, "기간 집계 중...")
+        with self._stage('groupby') as stage:
+            summed = index.query(start_date, end_date)
+            stage.rows(rows_out=len(summed))
+        return summed
+        
+    def analyze_csv(self, file_path, progress_callback=None, start_date=None, end_date=None, streaming=None,
+                    cancel_token=None):
+        """
+        CSV 파일 분석 (날짜 필터링 기능 추가)
+        streaming이 True면 청크 단위로 읽어 메모리 사용량을 제한하고,
+        None이면 파일 크기(streaming_threshold 이상)에 따라 자동으로 결정합니다.
+        cancel_token(analysis_jobs.CancelToken)이 취소되면 다음 단계/청크에서 AnalysisCancelled로 중단합니다.
+        """
+        self._load_pandas()
+        
+        with self._cancellable(cancel_token), self._profiled('analyze_csv', file_path):
+            summed = self._summarize(file_path, progress_callback, start_date, end_date, streaming)
+            results = self._format_results(summed)
+        
+        if progress_callback:
+            progress_callback(100, "분석 완료!")
+            
+        self.results = results
+        return results
+        
+    def analyze_files(self, file_paths, progress_callback=None, start_date=None, end_date=None, max_workers=None,
+                      cancel_token=None):
+        """
+        여러 CSV 파일을 프로세스 풀에서 병렬로 집계한 뒤 합산하여 분석합니다.
+        결과 형식은 analyze_csv와 같은 (종목명, 평가손익, 매도 횟수, 통화) 목록입니다.
+        각 파일은 스트리밍 방식으로 읽으며, 코드가 숫자인 파일과 문자가 섞인 파일을 함께 분석하면
+        숫자 코드를 문자열로 바꿔 합산합니다. (코드 타입이 섞인 인덱스는 정렬/비교할 수 없음)
+        cancel_token이 취소되면 남은 파일 작업을 취소하고 AnalysisCancelled로 중단합니다.
+        """
+        self._load_pandas()
+        file_paths = list(file_paths)
+        if not file_paths:
+            raise Exception("분석할 파일이 없습니다.")
             
-        # 데이터 정리 및 계산
-        results = self._calculate_results(df, stock_col, profit_col, trade_type_col, code_col)
+        with self._cancellable(cancel_token):
+            return self._analyze_files(file_paths, progress_callback, start_date, end_date, max_workers)
+            
+    def _analyze_files(self, file_paths, progress_callback, start_date, end_date, max_workers):
+        max_workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+        partials = []
+        
+        if max_workers == 1:
+            for i, path in enumerate(file_paths):
+                self._check_cancelled()
+                partials.append(self._summarize(path, None, start_date, end_date, streaming=True))
+                if progress_callback:
+                    progress_callback(90 * (i + 1) / len(file_paths), f"파일 분석 중... ({i + 1}/{len(file_paths)})")
+        else:
+            from concurrent.futures import ProcessPoolExecutor, as_completed
+            
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(_summarize_file, path, start_date, end_date): path for path in file_paths}
+                for done, future in enumerate(as_completed(futures), 1):
+                    try:
+                        self._check_cancelled()
+                    except AnalysisCancelled:
+                        # 아직 시작하지 않은 파일 작업은 취소 (실행 중인 작업은 끝날 때까지 기다림)
+                        for pending in futures:
+                            pending.cancel()
+                        raise
+                    try:
+                        partials.append(future.result())
+                    except Exception as e:
+                        raise Exception(f"{os.path.basename(futures[future])} 분석 중 오류 발생: {e}")
+                    if progress_callback:
+                        progress_callback(90 * done / len(file_paths), f"파일 분석 중... ({done}/{len(file_paths)})")
+                        
+        if progress_callback:
+            progress_callback(95, "결과 합산 중...")
+        numeric = [self._numeric_key(partial.index.get_level_values(1)) for partial in partials]
+        if any(numeric) and not all(numeric):
+            partials = [self._string_codes(partial) if is_numeric else partial
+                        for partial, is_numeric in zip(partials, numeric)]
+        results = self._format_results(self._combine_partials(partials))
         
         if progress_callback:
             progress_callback(100, "분석 완료!")
             
         self.results = results
-        return results
\ No newline at end of file
+        return results
+
+def _summarize_file(file_path, start_date=None, end_date=None):
+    """프로세스 풀 작업 함수: 파일 하나의 (종목명, 코드)별 부분 집계 반환"""
+    analyzer = DataAnalyzer(use_sidecar=False)
+    # 작업 프로세스의 진단 메시지가 부모 프로세스의 표준 출력(명령줄 결과)과 섞이지 않도록 stderr로 보냄
+    with redirect_stdout(sys.stderr):
+        if start_date or end_date:
+            return analyzer._summarize(file_path, None, start_date, end_date, streaming=True)
+        # 작업이 끝나면 버려지는 분석기이므로 증분 상태(파일 전체 해시 포함)를 만들지 않고 바로 집계
+        return analyzer._stream_aggregate(file_path)[0]
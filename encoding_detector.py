@@ -0,0 +1,108 @@
+"""CSV 파일 인코딩 감지 모듈 (BOM 및 바이트 샘플 기반)"""
+import os
+import codecs
+import threading
+
+# 한 구간에서 읽어 볼 최대 바이트 수
+SAMPLE_SIZE = 64 * 1024
+# 파일 앞부분 외에 추가로 살펴볼 구간 수 (파일 전체에 고르게 분포)
+EXTRA_SAMPLES = 4
+# 감지 실패 시 시도할 인코딩 순서 (cp949는 euc-kr의 상위 집합)
+FALLBACK_ENCODINGS = ['cp949', 'utf-8', 'utf-8-sig']
+
+# 파일별 감지 결과: {절대 경로: (mtime, 크기, 인코딩)}
+_detected = {}
+_lock = threading.Lock()
+
+def _file_key(file_path):
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size
+
+def _read_samples(f, file_size):
+    """파일 앞부분과 중간 구간들의 바이트 샘플을 읽어 (데이터, 파일 끝 여부) 목록으로 반환"""
+    samples = []
+    head = f.read(SAMPLE_SIZE)
+    samples.append((head, f.tell() >= file_size))
+
+    if file_size <= SAMPLE_SIZE:
+        return samples
+
+    for i in range(1, EXTRA_SAMPLES + 1):
+        pos = file_size * i // (EXTRA_SAMPLES + 1)
+        if pos < SAMPLE_SIZE:
+            continue
+        f.seek(pos)
+        f.readline() # 멀티바이트 문자 중간에서 시작하지 않도록 다음 줄부터 읽기
+        data = f.read(SAMPLE_SIZE)
+        if data:
+            samples.append((data, f.tell() >= file_size))
+    return samples
+
+def _decodes(samples, encoding):
+    """모든 샘플이 주어진 인코딩으로 디코딩되는지 확인 (샘플 끝의 잘린 문자는 허용)"""
+    for data, at_eof in samples:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            decoder.decode(data, final=at_eof)
+        except UnicodeDecodeError:
+            return False
+    return True
+
+def _sniff(file_path, file_size):
+    """BOM과 바이트 샘플로 인코딩 추정 (판단 불가 시 None)"""
+    with open(file_path, 'rb') as f:
+        bom = f.read(4)
+        if bom.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        if bom.startswith(codecs.BOM_UTF16_LE) or bom.startswith(codecs.BOM_UTF16_BE):
+            return 'utf-16'
+
+        f.seek(0)
+        samples = _read_samples(f, file_size)
+
+    if all(data.isascii() for data, _ in samples):
+        # ASCII만 있으면 어느 인코딩이든 동일하므로 Magic Split 기본값(cp949) 사용
+        return 'cp949'
+
+    # UTF-8은 우연히 유효할 가능성이 낮으므로 먼저 확인
+    for encoding in ('utf-8', 'cp949'):
+        if _decodes(samples, encoding):
+            return encoding
+    return None
+
+def detect_encoding(file_path):
+    """
+    파일의 인코딩을 감지하여 반환합니다. 판단할 수 없으면 None을 반환합니다.
+    결과는 파일(경로, 수정 시각, 크기)별로 기억하여 다시 읽지 않습니다.
+    """
+    path, mtime, size = _file_key(file_path)
+    with _lock:
+        cached = _detected.get(path)
+    if cached and cached[:2] == (mtime, size):
+        return cached[2]
+
+    encoding = _sniff(file_path, size)
+    if encoding:
+        remember_encoding(file_path, encoding)
+    return encoding
+
+def remember_encoding(file_path, encoding):
+    """실제 파싱에 성공한 인코딩을 기억"""
+    path, mtime, size = _file_key(file_path)
+    with _lock:
+        _detected[path] = (mtime, size, encoding)
+
+def forget_encoding(file_path):
+    """기억된 인코딩 제거 (감지 결과로 파싱에 실패한 경우)"""
+    with _lock:
+        _detected.pop(os.path.abspath(file_path), None)
+
+def encoding_candidates(file_path):
+    """
+    시도할 인코딩 목록을 반환합니다.
+    감지된 인코딩이 맨 앞에 오며, 나머지는 감지가 틀린 경우를 위한 대비용입니다.
+    """
+    detected = detect_encoding(file_path)
+    candidates = [detected] if detected else []
+    candidates.extend(enc for enc in FALLBACK_ENCODINGS if enc not in candidates)
+    return candidates
@@ -1,7 +1,7 @@
 """파일 처리 관련 기능을 담당하는 모듈"""
 import os
 from tkinter import filedialog, messagebox
-import pandas as pd
+from csv_merger import merge_csv_files
 
 class FileHandler:
     def __init__(self):
@@ -77,39 +77,34 @@ class FileHandler:
                     messagebox.showinfo("알림", "병합하려면 2개 이상의 파일을 선택해야 합니다.", parent=parent)
                 return
 
-            df_list = []
             for path in file_paths:
                 # FileHandler 내의 validate_file을 재사용
                 if not self.validate_file(path):
                     # 유효성 검사 실패 메시지는 validate_file 내부에서 처리됨
                     return 
 
-                try:
-                    df = pd.read_csv(path, encoding='cp949', engine='python')
-                except UnicodeDecodeError:
-                    df = pd.read_csv(path, encoding='utf-8', engine='python')
-                df_list.append(df)
-
-            if not df_list:
+            # 저장 위치 선택 (기본값: 첫 번째 파일과 같은 폴더의 merged_data.csv)
+            output_path = filedialog.asksaveasfilename(
+                parent=parent,
+                title="병합 결과 저장",
+                initialdir=os.path.dirname(file_paths[0]),
+                initialfile="merged_data.csv",
+                defaultextension=".csv",
+                filetypes=[("CSV files", "*.csv")]
+            )
+            if not output_path:
                 return
 
-            # 데이터프레임 병합
-            merged_df = pd.concat(df_list, ignore_index=True)
-            
-            # 중복 행 제거 (모든 열이 동일한 경우)
-            deduplicated_df = merged_df.drop_duplicates()
-            
-            # 결과 저장
-            output_filename = "merged_data.csv"
-            deduplicated_df.to_csv(output_filename, index=False, encoding='utf-8-sig')
+            # 청크 단위로 읽으며 중복 행을 제거하여 바로 기록
+            stats = merge_csv_files(file_paths, output_path)
             
             messagebox.showinfo(
                 "성공",
-                f"{len(file_paths)}개의 파일이 성공적으로 병합되었습니다.\n"
-                f"총 {len(merged_df)}개 행 -> 중복 제거 후 {len(deduplicated_df)}개 행.\n"
-                f"결과가 '{output_filename}'에 저장되었습니다.",
+                f"{stats['files']}개의 파일이 성공적으로 병합되었습니다.\n"
+                f"총 {stats['rows_in']:,}개 행 -> 중복 {stats['duplicates']:,}개 제거 후 {stats['rows_out']:,}개 행.\n"
+                f"결과가 '{stats['output_path']}'에 저장되었습니다.",
                 parent=parent
             )
 
         except Exception as e:
-            messagebox.showerror("병합 오류", f"파일 병합 중 오류가 발생했습니다:\n{e}", parent=parent)
\ No newline at end of file
+            messagebox.showerror("병합 오류", f"파일 병합 중 오류가 발생했습니다:\n{e}", parent=parent)
@@ -1,8 +1,106 @@
 """최적화된 주식 분석기 메인 진입점"""
+import time
+# 시작 시간 측정 기준 (가능한 한 먼저 기록)
+_STARTED = time.perf_counter()
+
+import os
+import sys
+import json
 import tkinter as tk
 from tkinter import messagebox
-import time
 import threading
+from datetime import datetime
+
+# 실행 파일(또는 소스) 폴더: 시작 시간 기록 파일은 updater.log와 같은 위치에 저장
+if getattr(sys, 'frozen', False):
+    APP_DIR = os.path.dirname(sys.executable)
+else:
+    APP_DIR = os.path.dirname(os.path.abspath(__file__))
+STARTUP_LOG = os.path.join(APP_DIR, 'startup.log')
+
+def record_startup(version, marks):
+    """
+    시작 단계별 경과 시간(초)을 출력하고 startup.log에 JSON 한 줄로 추가합니다.
+    first_interactive_s: 프로그램 시작부터 메인 창이 그려지고 입력을 받을 수 있게 된 시점까지
+    """
+    entry = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'version': version,
+        **{name: round(seconds, 3) for name, seconds in marks.items()},
+    }
+    print(f"시작 시간: 첫 화면까지 {entry['first_interactive_s']:.3f}초")
+    try:
+        with open(STARTUP_LOG, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"시작 시간 기록 실패: {e}")
+
+def start_update_check(root, app):
+    """백그라운드에서 업데이트 확인 (시간 제한 있음), 새 버전이 있으면 메인 창에 알림 표시"""
+    def check_worker():
+        try:
+            from auto_updater import check_for_updates
+            update_info = check_for_updates()
+        except Exception as e:
+            # 업데이트 확인 실패는 프로그램 사용에 영향을 주지 않도록 기록만 함
+            print(f"업데이트 확인 오류: {e}")
+            return
+        if update_info:
+            app.main_queue.post(app.show_update_notice, update_info, lambda: install_update(root, app, update_info))
+
+    threading.Thread(target=check_worker, daemon=True).start()
+
+def install_update(root, app, update_info):
+    """사용자 확인 후 업데이트 다운로드 및 설치 (다운로드는 백그라운드)"""
+    from auto_updater import download_and_install_update, run_updater_and_exit
+    from ui_components import UpdateProgressDialog
+
+    release_notes = update_info.get('release_notes', '릴리즈 노트를 불러올 수 없습니다.')
+    msg = (
+        f"새로운 버전 ({update_info['latest_version']})이 있습니다. 업데이트 하시겠습니까?\n\n"
+        f"릴리즈 노트:\n{release_notes}"
+    )
+    if not messagebox.askyesno("업데이트 확인", msg, parent=root):
+        return
+
+    progress_dialog = UpdateProgressDialog(root)
+
+    def run_update_in_background():
+        """백그라운드에서 업데이트 다운로드 및 준비, UI 업데이트는 메인 스레드에서 예약"""
+        try:
+            # 매니페스트가 있으면 변경된 파일만 받음 (진행률은 대화상자의 채널을 통해 메인 스레드에서 표시)
+            script_path = download_and_install_update(
+                update_info['download_url'],
+                manifest_url=update_info.get('manifest_url'),
+                expected_version=update_info['latest_version'],
+                download_size=update_info.get('download_size'),
+                download_sha256=update_info.get('download_sha256'),
+                progress_callback=progress_dialog.report_download
+            )
+
+            if script_path:
+                progress_dialog.update_text("업데이트 준비가 끝났습니다.\n프로그램을 다시 시작합니다...")
+                # 사용자가 메시지를 볼 수 있도록 잠시 대기
+                time.sleep(1)
+                # 메인 스레드에서 프로그램 종료 및 업데이터 실행 예약
+                app.main_queue.post(run_updater_and_exit, script_path)
+            else:
+                # 에러 메시지 표시 및 다이얼로그 닫기를 메인 스레드에서 예약
+                def show_error_and_close():
+                    progress_dialog.close()
+                    messagebox.showerror("업데이트 실패", "업데이트 파일을 다운로드하거나 준비하는 데 실패했습니다.", parent=root)
+                app.main_queue.post(show_error_and_close)
+
+        except Exception as e:
+            # 예외 발생 시 에러 메시지 표시 및 다이얼로그 닫기를 메인 스레드에서 예약
+            def show_exception_and_close(err):
+                progress_dialog.close()
+                messagebox.showerror("업데이트 오류", f"업데이트 중 오류가 발생했습니다: {err}\n\n자세한 내용은 updater.log 파일을 확인하세요.", parent=root)
+            app.main_queue.post(show_exception_and_close, e)
+
+    # 백그라운드에서 업데이트 실행
+    update_thread = threading.Thread(target=run_update_in_background, daemon=True)
+    update_thread.start()
 
 def create_main_app():
     """메인 애플리케이션 생성 (지연 로딩)"""
@@ -11,8 +109,10 @@ def create_main_app():
         from ui_components import MainUI
         from file_handler import FileHandler
         from data_analyzer import DataAnalyzer
+        from trade_ledger import TradeLedger
         from _version import __version__
-        
+        marks = {'imports_s': time.perf_counter() - _STARTED}
+
         # tkinterdnd2 호환 루트 생성 시도
         try:
             import tkinterdnd2 as tkdnd
@@ -22,141 +122,41 @@ def create_main_app():
             # tkinterdnd2가 없으면 일반 Tk 사용
             root = tk.Tk()
             print("일반 Tk 루트 생성 (드래그 앤 드롭 비활성화)")
-        
+
         # 컴포넌트 초기화
         file_handler = FileHandler()
         data_analyzer = DataAnalyzer()
-        
+        ledger = TradeLedger(analyzer=data_analyzer)
+
         # UI 생성
-        app = MainUI(root, file_handler, data_analyzer, __version__)
-        
+        app = MainUI(root, file_handler, data_analyzer, __version__, ledger=ledger)
+        marks['ui_s'] = time.perf_counter() - _STARTED
+
+        def on_first_idle():
+            # 첫 화면이 그려지고 이벤트 루프가 입력을 처리할 수 있게 된 시점
+            marks['first_interactive_s'] = time.perf_counter() - _STARTED
+            record_startup(__version__, marks)
+            # 시작 경로에서 뺀 작업 (pandas 미리 불러오기, 달력 위젯, 원장 결과)
+            app.finish_startup()
+            # 업데이트 확인은 창이 뜬 뒤 백그라운드에서 (네트워크가 느려도 시작을 지연시키지 않음)
+            start_update_check(root, app)
+        root.after_idle(on_first_idle)
+
         # 메인 루프 시작
         root.mainloop()
-        
+
     except Exception as e:
         print(f"오류 발생: {e}")
         import traceback
         traceback.print_exc()
         input("엔터를 눌러 종료...")
 
-def show_simple_splash():
-    """간단한 스플래시 스크린"""
-    splash_root = tk.Tk()
-    splash_root.title("로딩 중...")
-    splash_root.geometry("300x150")
-    splash_root.resizable(False, False)
-    
-    # 화면 중앙에 위치
-    splash_root.update_idletasks()
-    x = (splash_root.winfo_screenwidth() // 2) - 150
-    y = (splash_root.winfo_screenheight() // 2) - 75
-    splash_root.geometry(f"300x150+{x}+{y}")
-    
-    # 스플래시 내용
-    splash_root.configure(bg='#2c3e50')
-    
-    title_label = tk.Label(splash_root, 
-                          text="주식 분석기", 
-                          font=('Arial', 14, 'bold'),
-                          fg='white', bg='#2c3e50')
-    title_label.pack(pady=30)
-    
-    status_label = tk.Label(splash_root,
-                           text="로딩 중...",
-                           font=('Arial', 10),
-                           fg='#ecf0f1', bg='#2c3e50')
-    status_label.pack()
-    
-    # 스플래시 표시
-    splash_root.update()
-    
-    # 잠시 대기 (로딩 시뮬레이션)
-    time.sleep(1)
-    
-    # 스플래시 닫기
-    splash_root.destroy()
-
 def main():
     """애플리케이션 진입점"""
     try:
-        # 스플래시 스크린 표시
-        show_simple_splash()
-        
-        # --- 업데이트 확인 로직 시작 ---
-        hidden_root = tk.Tk()
-        hidden_root.withdraw()
-
-        try:
-            from auto_updater import check_for_updates, download_and_install_update, run_updater_and_exit
-            from ui_components import UpdateProgressDialog
-
-            update_info = check_for_updates()
-            
-            if update_info:
-                release_notes = update_info.get('release_notes', '릴리즈 노트를 불러올 수 없습니다.')
-                msg = (
-                    f"새로운 버전 ({update_info['latest_version']})이 있습니다. 업데이트 하시겠습니까?\n\n"
-                    f"릴리즈 노트:\n{release_notes}"
-                )
-                
-                if messagebox.askyesno("업데이트 확인", msg, parent=hidden_root):
-                    progress_dialog = UpdateProgressDialog(hidden_root)
-                    
-                    def run_update_in_background():
-                        """백그라운드에서 업데이트 다운로드 및 준비, UI 업데이트는 메인 스레드에서 예약"""
-                        try:
-                            # 이 함수는 백그라운드 스레드에서 실행되므로 직접 UI를 업데이트하지 않음
-                            # progress_dialog.update_text("업데이트 파일을 다운로드 중입니다...") -> 직접 호출 대신 예약 필요
-                            
-                            script_path = download_and_install_update(update_info['download_url'])
-                            
-                            if script_path:
-                                # 사용자가 메시지를 볼 수 있도록 잠시 대기
-                                time.sleep(1) 
-                                # 메인 스레드에서 프로그램 종료 및 업데이터 실행 예약
-                                hidden_root.after(0, run_updater_and_exit, script_path)
-                            else:
-                                # 에러 메시지 표시 및 다이얼로그 닫기를 메인 스레드에서 예약
-                                def show_error_and_close():
-                                    progress_dialog.close()
-                                    messagebox.showerror("업데이트 실패", "업데이트 파일을 다운로드하거나 준비하는 데 실패했습니다.", parent=hidden_root)
-                                hidden_root.after(0, show_error_and_close)
-                                
-                        except Exception as e:
-                            # 예외 발생 시 에러 메시지 표시 및 다이얼로그 닫기를 메인 스레드에서 예약
-                            def show_exception_and_close(err):
-                                progress_dialog.close()
-                                messagebox.showerror("업데이트 오류", f"업데이트 중 오류가 발생했습니다: {err}", parent=hidden_root)
-                            hidden_root.after(0, show_exception_and_close, e)
-
-                    # 백그라운드에서 업데이트 실행
-                    update_thread = threading.Thread(target=run_update_in_background, daemon=True)
-                    update_thread.start()
-                    
-                    # 업데이트 다이얼로그가 떠있는 동안 hidden_root의 메인 루프를 실행
-                    hidden_root.mainloop()
-                    return # 업데이트가 시작되면 메인 앱을 실행하지 않고 종료
-
-        except Exception as e:
-            # Log the error and show a message to the user
-            error_msg = f"업데이트 확인 중 오류가 발생했습니다:\n\n{e}\n\n자세한 내용은 updater.log 파일을 확인하세요."
-            try:
-                # Try to use the logger from the updater module
-                from auto_updater import logging
-                logging.error("Update check failed in main.py", exc_info=True)
-            except ImportError:
-                # If updater is not even there, just print
-                print("Could not import updater to log error.")
-            
-            messagebox.showerror("업데이트 확인 오류", error_msg, parent=hidden_root)
-        
-        finally:
-            hidden_root.destroy()
-        # --- 업데이트 확인 로직 종료 ---
-
-        # 메인 앱 실행
+        # 메인 앱 실행 (스플래시/업데이트 확인 대기 없이 바로 표시)
         create_main_app()
-        
+
     except Exception as e:
         print(f"메인 함수 오류: {e}")
         import traceback
@@ -164,4 +164,9 @@ def main():
         input("엔터를 눌러 종료...")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # PyInstaller 실행 파일에서 병렬 분석용 프로세스 풀이 동작하도록 필요
+    # (소스 실행에서는 아무 일도 하지 않으므로 실행 파일일 때만 불러옴)
+    if getattr(sys, 'frozen', False):
+        import multiprocessing
+        multiprocessing.freeze_support()
+    main()
@@ -1 +1,3 @@
-pyinstaller --noconsole --clean main.py
\ No newline at end of file
+pyinstaller --noconsole --clean main.py
+rem Delta update files: attach everything in dist\release (manifest.json + files named by SHA-256) to the GitHub release
+python -c "import auto_updater, _version; auto_updater.build_release_manifest(r'dist\main', r'dist\release', _version.__version__)"
\ No newline at end of file
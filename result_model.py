@@ -0,0 +1,117 @@
+"""분석 결과를 컬럼별 배열로 보관하는 결과 모델과 통화별 통계"""
+
+# 결과에 없더라도 통계에 항상 포함하는 통화 (기존 통계 키 호환)
+BASE_CURRENCIES = ('KRW', 'USD')
+
+def build_statistics(currencies, stock_counts, profit_counts, loss_counts, totals):
+    """
+    통화별 집계 값으로 통계 사전을 만듭니다. (분석 결과와 거래 원장이 같은 형식을 사용)
+    통화마다 profit_count_/loss_count_/total_profit_/stock_count_/win_rate_{통화} 키가 있고,
+    승률은 손익이 0이 아닌 종목 중 수익 종목의 비율(0~1, 해당 종목이 없으면 None)입니다.
+    """
+    stats = {'total_stocks': 0}
+    for currency in BASE_CURRENCIES:
+        stats.update({f'profit_count_{currency}': 0, f'loss_count_{currency}': 0, f'total_profit_{currency}': 0,
+                      f'stock_count_{currency}': 0, f'win_rate_{currency}': None})
+
+    order = list(BASE_CURRENCIES)
+    profit_total = loss_total = 0
+    for currency, stocks, profit_count, loss_count, total in zip(
+            currencies, stock_counts, profit_counts, loss_counts, totals):
+        stocks, profit_count, loss_count = int(stocks), int(profit_count), int(loss_count)
+        if currency not in order:
+            order.append(currency)
+        stats['total_stocks'] += stocks
+        stats[f'stock_count_{currency}'] = stocks
+        stats[f'profit_count_{currency}'] = profit_count
+        stats[f'loss_count_{currency}'] = loss_count
+        stats[f'total_profit_{currency}'] = total.item() if hasattr(total, 'item') else total
+        stats[f'win_rate_{currency}'] = _win_rate(profit_count, loss_count)
+        profit_total += profit_count
+        loss_total += loss_count
+
+    stats['win_rate'] = _win_rate(profit_total, loss_total)
+    stats['currencies'] = order
+    return stats
+
+def _win_rate(profit_count, loss_count):
+    decided = profit_count + loss_count
+    return profit_count / decided if decided else None
+
+class AnalysisResults:
+    """
+    (종목명, 평가손익, 매도 횟수, 통화) 분석 결과를 컬럼별 numpy 배열로 보관합니다.
+    반복/인덱싱/len()은 이전의 튜플 목록과 같이 동작하므로 기존 코드는 그대로 사용할 수 있습니다.
+    """
+    __slots__ = ('stocks', 'profits', 'sell_counts', 'currencies')
+
+    def __init__(self, stocks=(), profits=(), sell_counts=(), currencies=()):
+        import numpy as np
+        self.stocks = _object_array(np, stocks)
+        self.profits = np.asarray(profits)
+        if self.profits.dtype.kind not in 'iuf':
+            self.profits = self.profits.astype('float64')
+        self.sell_counts = np.asarray(sell_counts, dtype='int64')
+        self.currencies = _object_array(np, currencies)
+        if not len(self.stocks) == len(self.profits) == len(self.sell_counts) == len(self.currencies):
+            raise Exception("분석 결과 컬럼의 길이가 서로 다릅니다.")
+
+    @classmethod
+    def from_rows(cls, rows):
+        """(종목명, 평가손익, 매도 횟수, 통화) 튜플 목록으로 생성 (이미 AnalysisResults면 그대로 반환)"""
+        if isinstance(rows, cls):
+            return rows
+        rows = list(rows)
+        return cls([row[0] for row in rows], [row[1] for row in rows],
+                   [row[2] for row in rows], [row[3] for row in rows])
+
+    def __len__(self):
+        return len(self.profits)
+
+    def __iter__(self):
+        """호환용 튜플 보기: 파이썬 기본 타입 (종목명, 평가손익, 매도 횟수, 통화) 튜플을 차례로 반환"""
+        return zip(self.stocks.tolist(), self.profits.tolist(), self.sell_counts.tolist(), self.currencies.tolist())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return AnalysisResults(self.stocks[index], self.profits[index],
+                                   self.sell_counts[index], self.currencies[index])
+        return (self.stocks[index], self.profits[index].item(),
+                self.sell_counts[index].item(), self.currencies[index])
+
+    def __eq__(self, other):
+        try:
+            return list(self) == [tuple(row) for row in other]
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return f"AnalysisResults({len(self)}개 종목)"
+
+    def tolist(self):
+        """(종목명, 평가손익, 매도 횟수, 통화) 튜플 목록"""
+        return list(self)
+
+    def statistics(self):
+        """통화 수와 관계없이 통화별 종목 수/수익·손실 종목 수/평가손익 합계/승률을 배열 연산 한 번으로 계산"""
+        import numpy as np
+        import pandas as pd
+        # 통화를 번호로 바꾼 뒤(해시 기반, 정렬 없음) 번호별 개수/합계를 bincount로 구함 (합계는 결과 순서대로 더함)
+        index, currencies = pd.factorize(self.currencies)
+        n = len(currencies)
+        return build_statistics(
+            currencies.tolist(),
+            np.bincount(index, minlength=n),
+            np.bincount(index[self.profits > 0], minlength=n),
+            np.bincount(index[self.profits < 0], minlength=n),
+            # 정수 평가손익은 합계도 정수로 (이전 튜플 목록의 sum()과 같은 타입)
+            np.bincount(index, weights=self.profits, minlength=n).astype(self.profits.dtype),
+        )
+
+def _object_array(np, values):
+    """문자열 등을 길이 고정 문자열이 아닌 object 배열로 보관 (원래 값과 타입 유지)"""
+    if isinstance(values, np.ndarray) and values.dtype == object:
+        return values
+    array = np.empty(len(values), dtype=object)
+    array[:] = list(values)
+    return array
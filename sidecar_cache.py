@@ -0,0 +1,241 @@
+"""파싱된 CSV를 바이너리 사이드카 파일로 저장/복원하는 모듈"""
+import os
+import json
+import hashlib
+import importlib.util
+
+# 사이드카 형식이 바뀌면 올려서 이전 캐시를 무효화
+FORMAT_VERSION = 2
+# 보관할 최대 사이드카 수 (오래 사용하지 않은 것부터 삭제)
+MAX_ENTRIES = 20
+META_FILE = 'meta.json'
+# 증분 분석 상태 파일 (사이드카 데이터와 별도로 유지)
+STATE_FILE = 'incremental.json'
+
+def default_cache_dir():
+    """기본 사이드카 저장 위치"""
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'stock-analyzer', 'frames')
+
+def file_sha256(file_path, chunk_size=1024 * 1024):
+    """파일 전체의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class SidecarCache:
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self._has_arrow = importlib.util.find_spec('pyarrow') is not None
+
+    def _entry_dir(self, file_path):
+        name = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, name)
+
+    def _read_meta(self, entry_dir):
+        try:
+            with open(os.path.join(entry_dir, META_FILE), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get('version') == FORMAT_VERSION else None
+
+    def _write_json(self, entry_dir, name, data):
+        # 임시 파일에 쓴 뒤 교체하여 중간에 종료되어도 깨진 파일이 남지 않도록 함
+        tmp_path = os.path.join(entry_dir, f"{name}.{os.urandom(16).hex()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, os.path.join(entry_dir, name))
+
+    def _write_meta(self, entry_dir, meta):
+        self._write_json(entry_dir, META_FILE, meta)
+
+    def load_state(self, file_path):
+        """원본 파일에 대해 저장된 증분 분석 상태 반환 (없으면 None)"""
+        try:
+            with open(os.path.join(self._entry_dir(file_path), STATE_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_state(self, file_path, state):
+        """증분 분석 상태 저장"""
+        entry_dir = self._entry_dir(file_path)
+        os.makedirs(entry_dir, exist_ok=True)
+        self._write_json(entry_dir, STATE_FILE, state)
+
+    def _is_valid(self, file_path, entry_dir, meta):
+        """원본 파일이 사이드카 생성 이후 바뀌지 않았는지 확인"""
+        stat = os.stat(file_path)
+        if stat.st_size != meta['size']:
+            return False
+        if stat.st_mtime_ns == meta['mtime_ns']:
+            return True
+
+        # 수정 시각만 바뀐 경우(복사 등) 내용 해시로 확인
+        if file_sha256(file_path) != meta['sha256']:
+            return False
+        meta['mtime_ns'] = stat.st_mtime_ns
+        self._write_meta(entry_dir, meta)
+        return True
+
+    def has(self, file_path):
+        """원본 파일에 대해 유효한 사이드카가 있는지 확인 (데이터는 읽지 않음)"""
+        entry_dir = self._entry_dir(file_path)
+        meta = self._read_meta(entry_dir)
+        if meta is None:
+            return False
+        try:
+            return self._is_valid(file_path, entry_dir, meta)
+        except (OSError, KeyError):
+            return False
+
+    def load(self, file_path, pd):
+        """유효한 사이드카가 있으면 DataFrame으로 복원하여 반환, 없으면 None"""
+        entry_dir = self._entry_dir(file_path)
+        meta = self._read_meta(entry_dir)
+        if meta is None:
+            return None
+
+        try:
+            if not self._is_valid(file_path, entry_dir, meta):
+                return None
+            # 최근 사용 시각 갱신 (보관 한도 초과 시 정리 순서 기준)
+            os.utime(os.path.join(entry_dir, META_FILE))
+            if meta['format'] == 'feather':
+                return pd.read_feather(os.path.join(entry_dir, meta['data']))
+            return self._load_npy(entry_dir, meta, pd)
+        except Exception as e:
+            print(f"사이드카 캐시 읽기 실패: {e}")
+            return None
+
+    def save(self, file_path, df, pd):
+        """DataFrame을 사이드카로 저장 (지원하지 않는 형태면 저장하지 않음)"""
+        stat = os.stat(file_path)
+        entry_dir = self._entry_dir(file_path)
+        os.makedirs(entry_dir, exist_ok=True)
+
+        token = os.urandom(6).hex()
+        meta = {
+            'version': FORMAT_VERSION,
+            'source': os.path.abspath(file_path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': file_sha256(file_path),
+        }
+
+        try:
+            if self._has_arrow:
+                meta['format'] = 'feather'
+                meta['data'] = f"{token}.feather"
+                df.to_feather(os.path.join(entry_dir, meta['data']))
+            else:
+                meta['format'] = 'npy'
+                if not self._save_npy(entry_dir, token, df, meta, pd):
+                    self._remove_data(entry_dir, lambda name: name.startswith(token))
+                    return False
+        except Exception as e:
+            print(f"사이드카 캐시 저장 실패: {e}")
+            self._remove_data(entry_dir, lambda name: name.startswith(token))
+            return False
+
+        # 메타를 마지막에 교체해야 읽는 쪽이 항상 완성된 데이터를 참조함
+        self._write_meta(entry_dir, meta)
+        self._remove_data(entry_dir, lambda name: not name.startswith(token))
+        self._prune()
+        return True
+
+    def _save_npy(self, entry_dir, token, df, meta, pd):
+        """컬럼별 npy 파일로 저장. 문자열/category 컬럼은 (코드, 고유값) 쌍으로 압축"""
+        import numpy as np
+
+        if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+            return False
+
+        columns = []
+        for i, col in enumerate(df.columns):
+            series = df[col]
+            prefix = os.path.join(entry_dir, f"{token}_{i}")
+            entry = {'name': col, 'dtype': str(series.dtype)}
+
+            if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufmM':
+                np.save(f"{prefix}_values.npy", series.to_numpy())
+                entry['kind'] = 'values'
+            elif isinstance(series.dtype, pd.CategoricalDtype):
+                categories = series.cat.categories
+                if categories.dtype.kind in 'iuf':
+                    # 숫자로 정규화된 코드 컬럼은 범주 값을 숫자 배열 그대로 저장
+                    uniques = categories.to_numpy()
+                else:
+                    uniques = np.asarray(categories, dtype=object)
+                    if not all(isinstance(v, str) for v in uniques):
+                        return False
+                    uniques = uniques.astype(str)
+                np.save(f"{prefix}_codes.npy", series.cat.codes.to_numpy().astype(np.int32))
+                np.save(f"{prefix}_uniques.npy", uniques)
+                entry['kind'] = 'categorical'
+            elif series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+                codes, uniques = pd.factorize(series)
+                uniques = np.asarray(uniques, dtype=object)
+                if not all(isinstance(v, str) for v in uniques):
+                    return False # 문자열 외의 값이 섞인 컬럼은 그대로 복원할 수 없음
+                np.save(f"{prefix}_codes.npy", codes.astype(np.int32))
+                np.save(f"{prefix}_uniques.npy", uniques.astype(str))
+                entry['kind'] = 'factorized'
+            else:
+                return False
+            columns.append(entry)
+
+        meta['data'] = token
+        meta['rows'] = len(df)
+        meta['columns'] = columns
+        return True
+
+    def _load_npy(self, entry_dir, meta, pd):
+        import numpy as np
+
+        data = {}
+        for i, entry in enumerate(meta['columns']):
+            prefix = os.path.join(entry_dir, f"{meta['data']}_{i}")
+            if entry['kind'] == 'values':
+                data[entry['name']] = pd.Series(np.load(f"{prefix}_values.npy"), dtype=entry['dtype'])
+            elif entry['kind'] == 'categorical':
+                categories = np.load(f"{prefix}_uniques.npy")
+                if categories.dtype.kind == 'U':
+                    categories = categories.astype(object)
+                data[entry['name']] = pd.Series(pd.Categorical.from_codes(np.load(f"{prefix}_codes.npy"), categories))
+            else:
+                codes = np.load(f"{prefix}_codes.npy")
+                uniques = np.load(f"{prefix}_uniques.npy").astype(object)
+                values = uniques.take(codes) if len(uniques) else np.empty(len(codes), dtype=object)
+                values[codes < 0] = np.nan
+                data[entry['name']] = pd.Series(values, dtype=entry['dtype'])
+        return pd.DataFrame(data, index=pd.RangeIndex(meta['rows']))
+
+    def _remove_data(self, entry_dir, predicate):
+        """조건에 맞는 데이터 파일 삭제 (메타 파일은 제외)"""
+        for name in os.listdir(entry_dir):
+            if name in (META_FILE, STATE_FILE) or not predicate(name):
+                continue
+            try:
+                os.remove(os.path.join(entry_dir, name))
+            except OSError:
+                pass
+
+    def _prune(self):
+        """보관 한도를 넘으면 가장 오래 사용하지 않은 사이드카 삭제"""
+        import shutil
+
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, name)
+            used = [os.path.getmtime(os.path.join(entry_dir, f)) for f in (META_FILE, STATE_FILE)
+                    if os.path.exists(os.path.join(entry_dir, f))]
+            if used:
+                entries.append((max(used), entry_dir))
+
+        entries.sort()
+        for _, entry_dir in entries[:-MAX_ENTRIES]:
+            shutil.rmtree(entry_dir, ignore_errors=True)
@@ -0,0 +1 @@
+"""테스트 (python -m pytest tests 또는 python -m unittest discover tests)"""
@@ -0,0 +1,50 @@
+"""테스트용 로컬 HTTP 서버 (127.0.0.1의 빈 포트에서 별도 스레드로 실행)"""
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    """받은 요청(경로, 헤더)을 server.requests에 기록하는 요청 처리기 (콘솔 로그 없음)"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        self.handle_get()
+
+    def handle_get(self):
+        self.send_error(404)
+
+    def send_body(self, body, status=200, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class LocalServer:
+    """with 문으로 사용: 들어가면 서버를 시작하고, 나오면 종료합니다."""
+    def __init__(self, handler_class):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler_class)
+        self.httpd.daemon_threads = True
+        self.httpd.requests = []
+        self._thread = threading.Thread(target=self.httpd.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    def url(self, path='/'):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self._thread.join()
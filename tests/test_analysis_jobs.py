@@ -0,0 +1,130 @@
+"""백그라운드 작업 관리 테스트: 완료/오류/취소 콜백이 메인 스레드 대기열을 통해 전달되는지"""
+import os
+import sys
+import queue
+import threading
+import unittest
+from unittest import mock
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from analysis_jobs import JobManager
+
+class FakeWidget:
+    """after()로 예약된 함수를 기록만 하는 위젯 (화면 없이 메인 스레드 대기열 시험)"""
+    def __init__(self):
+        self.scheduled = []
+        self.after_threads = set()
+
+    def after(self, ms, func):
+        self.after_threads.add(threading.current_thread())
+        self.scheduled.append(func)
+        return f"after#{len(self.scheduled)}"
+
+    def after_cancel(self, after_id):
+        self.scheduled.clear()
+
+    def run_scheduled(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for func in scheduled:
+            func()
+
+class JobManagerTest(unittest.TestCase):
+    def setUp(self):
+        # 메인 스레드 역할: 작업 스레드는 대기열에 넣기만 하고 테스트가 꺼내 실행
+        self.pending = queue.SimpleQueue()
+        self.jobs = JobManager(self.pending.put)
+        self.events = []
+
+    def run_pending(self, count=1):
+        for _ in range(count):
+            self.pending.get(timeout=5)()
+
+    def submit(self, work):
+        return self.jobs.submit(work, on_done=lambda result: self.events.append(('done', result)),
+                                on_error=lambda error: self.events.append(('error', error)),
+                                cleanup=lambda: self.events.append(('cleanup',)))
+
+    def test_done(self):
+        self.submit(lambda token: 42)
+        self.run_pending()
+        self.assertEqual(self.events, [('cleanup',), ('done', 42)])
+        self.assertFalse(self.jobs.running)
+
+    def test_error_runs_cleanup_and_on_error(self):
+        def fail(token):
+            raise ValueError("읽기 실패")
+        self.submit(fail)
+        self.run_pending()
+        self.assertEqual(self.events[0], ('cleanup',))
+        self.assertEqual(self.events[1][0], 'error')
+        self.assertIsInstance(self.events[1][1], ValueError)
+        self.assertEqual(str(self.events[1][1]), "읽기 실패")
+        self.assertFalse(self.jobs.running)
+
+    def test_superseded_job_only_cleans_up(self):
+        started = queue.SimpleQueue()
+        release = queue.SimpleQueue()
+        def slow(token):
+            started.put(True)
+            release.get(timeout=5)
+            return 'old'
+        self.submit(slow)
+        started.get(timeout=5)
+        self.submit(lambda token: 'new')
+        self.run_pending()
+        release.put(True)
+        self.run_pending()
+        self.assertEqual(self.events.count(('cleanup',)), 2)
+        self.assertEqual([event for event in self.events if event[0] != 'cleanup'], [('done', 'new')])
+
+    def test_cancelled_job_only_cleans_up(self):
+        def cancellable(token):
+            self.jobs.cancel()
+            token.check()
+            return 'never'
+        self.submit(cancellable)
+        self.run_pending()
+        self.assertEqual(self.events, [('cleanup',)])
+        self.assertFalse(self.jobs.running)
+
+class MainThreadQueueTest(unittest.TestCase):
+    def test_jobs_finish_through_queue_without_after_from_workers(self):
+        from ui_components import MainThreadQueue
+        widget = FakeWidget()
+        main_queue = MainThreadQueue(widget).start()
+        jobs = JobManager(main_queue.post)
+        events = []
+        finished = threading.Event()
+
+        def fail(token):
+            raise ValueError("원장 읽기 실패")
+        jobs.submit(fail, on_done=events.append, on_error=lambda e: (events.append(str(e)), finished.set()),
+                    cleanup=lambda: events.append('cleanup'))
+        for _ in range(250):
+            widget.run_scheduled()
+            if finished.wait(0.02):
+                break
+
+        self.assertEqual(events, ['cleanup', "원장 읽기 실패"])
+        # after()는 메인 스레드(이 테스트 스레드)에서만 호출됨
+        self.assertEqual(widget.after_threads, {threading.current_thread()})
+        main_queue.close()
+        self.assertEqual(widget.scheduled, [])
+
+    def test_error_in_posted_call_does_not_stop_queue(self):
+        from ui_components import MainThreadQueue
+        widget = FakeWidget()
+        main_queue = MainThreadQueue(widget).start()
+        calls = []
+        main_queue.post(lambda: 1 / 0)
+        main_queue.post(calls.append, 'next')
+        with mock.patch('traceback.print_exc'):
+            widget.run_scheduled()
+        self.assertEqual(calls, ['next'])
+        self.assertEqual(len(widget.scheduled), 1) # 다음 주기 예약은 유지
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+"""CSV 병합 테스트: 고정 CSV 두 개를 병합한 결과 파일과 중복 제거 통계"""
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from csv_merger import merge_csv_files
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# merge_a.csv + merge_b.csv (b는 컬럼 순서가 다르고, a와 겹치는 행 1개와 b 안의 중복 행 1개가 있음)
+MERGED = (
+    '날짜,종목명,코드,매매구분,평가손익\n'
+    '2024.01.02,삼성전자,005930,매도,"1,000"\n'
+    '2024.01.02,애플,AAPL,매도,150.5\n'
+    '2024.02.01,카카오,035720,매도,"-2,000"\n'
+    '2024.02.01,카카오,035720,매수,500\n'
+    # 값은 문자열 그대로 비교하므로 코드 '5930'은 '005930'과 다른 행
+    '2024.01.02,삼성전자,5930,매도,"1,000"\n'
+)
+
+class MergeFixtureTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.output = os.path.join(self.tmp_dir, 'merged.csv')
+
+    def merge(self, **kwargs):
+        return merge_csv_files([os.path.join(DATA_DIR, 'merge_a.csv'), os.path.join(DATA_DIR, 'merge_b.csv')],
+                               self.output, **kwargs)
+
+    def read_output(self):
+        with open(self.output, 'r', encoding='utf-8-sig', newline='') as f:
+            return f.read().replace('\r\n', '\n')
+
+    def test_merge_removes_duplicates(self):
+        stats = self.merge()
+        self.assertEqual((stats['files'], stats['rows_in'], stats['rows_out'], stats['duplicates']), (2, 7, 5, 2))
+        self.assertEqual(self.read_output(), MERGED)
+
+    def test_small_chunks_give_same_output(self):
+        # 청크 경계를 넘는 중복도 이전에 기록한 행으로 걸러짐
+        stats = self.merge(chunk_rows=1)
+        self.assertEqual(stats['duplicates'], 2)
+        self.assertEqual(self.read_output(), MERGED)
+
+    def test_memory_limit(self):
+        with self.assertRaises(Exception):
+            self.merge(memory_limit=16)
+        self.assertFalse(os.path.exists(self.output))
+        self.assertEqual(os.listdir(self.tmp_dir), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+"""CSV 분석 테스트: 작은 CSV 파일의 분석 결과를 고정하여 읽기 방식(전체/스트리밍/증분)에 관계없이 같은지 확인"""
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import data_analyzer
+from data_analyzer import DataAnalyzer
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+def data_path(name):
+    return os.path.join(DATA_DIR, name)
+
+def rows(results):
+    """결과를 순서와 관계없이 비교할 수 있는 (종목명, 평가손익, 매도 횟수, 통화) 목록으로 변환"""
+    return sorted((stock, float(profit), int(count), currency) for stock, profit, count, currency in results)
+
+# tests/data/trades.csv의 분석 결과 (trades_cp949.csv는 같은 거래를 cp949로 저장하고 평가손익 하나에 공백을 넣은 파일)
+ALL_TRADES = [
+    ('NAVER', 0.0, 1, 'KRW'), ('SK하이닉스', 3500.0, 1, 'KRW'), ('삼성전자', 13000.0, 2, 'KRW'),
+    ('애플', 130.5, 1, 'USD'), ('카카오', -1500.0, 1, 'KRW'), ('테슬라', -80.25, 1, 'USD'),
+]
+# 기간 분석은 '매도' 거래만 대상
+JAN_FEB_SELLS = [
+    ('삼성전자', 1000.0, 1, 'KRW'), ('애플', 150.5, 1, 'USD'), ('카카오', -2000.0, 1, 'KRW'), ('테슬라', -80.25, 1, 'USD'),
+]
+FROM_MARCH_SELLS = [('NAVER', 0.0, 1, 'KRW'), ('SK하이닉스', 7000.0, 1, 'KRW')]
+ALL_TRADES_STATISTICS = {
+    'total_stocks': 6, 'currencies': ['KRW', 'USD'], 'win_rate': 0.6,
+    'profit_count_KRW': 2, 'loss_count_KRW': 1, 'total_profit_KRW': 15000.0, 'stock_count_KRW': 4,
+    'win_rate_KRW': 2 / 3,
+    'profit_count_USD': 1, 'loss_count_USD': 1, 'total_profit_USD': 50.25, 'stock_count_USD': 2, 'win_rate_USD': 0.5,
+}
+
+class AnalysisFixtureTest(unittest.TestCase):
+    """고정 CSV의 분석 결과가 인코딩/읽기 방식(전체, 스트리밍)에 관계없이 알려진 값과 같은지"""
+    FILES = ('trades.csv', 'trades_cp949.csv')
+
+    def setUp(self):
+        # 작은 파일도 여러 청크로 나뉘고 중간 합산이 일어나도록 청크 크기를 줄임
+        for name, value in (('STREAMING_CHUNK_ROWS', 3), ('STREAMING_MERGE_EVERY', 2)):
+            patcher = mock.patch.object(data_analyzer, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def cases(self):
+        for name in self.FILES:
+            for streaming in (False, True):
+                with self.subTest(file=name, streaming=streaming):
+                    yield data_path(name), streaming
+
+    def test_analyze_csv(self):
+        for path, streaming in self.cases():
+            analyzer = DataAnalyzer(use_sidecar=False)
+            self.assertEqual(rows(analyzer.analyze_csv(path, streaming=streaming)), ALL_TRADES)
+            self.assertEqual(analyzer.get_statistics(), ALL_TRADES_STATISTICS)
+
+    def test_date_filter(self):
+        for path, streaming in self.cases():
+            analyzer = DataAnalyzer(use_sidecar=False)
+            results = analyzer.analyze_csv(path, start_date='2024-01-01', end_date='2024-02-29', streaming=streaming)
+            self.assertEqual(rows(results), JAN_FEB_SELLS)
+            self.assertEqual(analyzer.get_statistics()['total_profit_USD'], 70.25)
+            self.assertEqual(rows(analyzer.analyze_csv(path, start_date='2024-03-01', streaming=streaming)),
+                             FROM_MARCH_SELLS)
+
+    def test_query_date_range_uses_day_index(self):
+        for path, streaming in self.cases():
+            analyzer = DataAnalyzer(use_sidecar=False)
+            # 일별 인덱스가 만들어지기 전에는 None
+            self.assertIsNone(analyzer.query_date_range(path, '2024-01-01', '2024-02-29'))
+            analyzer.analyze_csv(path, start_date='2024-01-01', streaming=streaming)
+            self.assertEqual(rows(analyzer.query_date_range(path, '2024-01-01', '2024-02-29')), JAN_FEB_SELLS)
+            self.assertEqual(rows(analyzer.query_date_range(path, '2024-03-01', None)), FROM_MARCH_SELLS)
+            self.assertEqual(analyzer.get_statistics()['total_profit_KRW'], 7000.0)
+
+    def test_get_date_range(self):
+        for path, streaming in self.cases():
+            analyzer = DataAnalyzer(use_sidecar=False, streaming_threshold=0 if streaming else 1 << 40)
+            self.assertEqual(tuple(analyzer.get_date_range(path)), ('2023-11-30', '2024-04-01'))
+
+class CodeGroupingTest(unittest.TestCase):
+    """코드가 모두 숫자인 파일은 예전 타입 추론처럼 '005930'과 '5930'을 같은 코드로 합산"""
+    NUMERIC = [('SK하이닉스', -200.0, 0, 'KRW'), ('삼성전자', 1600.0, 2, 'KRW')]
+    MIXED = [('삼성전자', 500.0, 1, 'KRW'), ('삼성전자', 1000.0, 1, 'KRW'), ('애플', -200.0, 1, 'USD')]
+
+    def analyze(self, name, **kwargs):
+        return rows(DataAnalyzer(use_sidecar=False).analyze_csv(data_path(name), **kwargs))
+
+    def test_numeric_codes_are_merged(self):
+        for streaming in (False, True):
+            with self.subTest(streaming=streaming):
+                self.assertEqual(self.analyze('numeric_codes.csv', streaming=streaming), self.NUMERIC)
+                self.assertEqual(
+                    self.analyze('numeric_codes.csv', start_date='2024-01-01', end_date='2024-01-03', streaming=streaming),
+                    [('삼성전자', 1500.0, 2, 'KRW')]
+                )
+
+    def test_codes_with_letters_stay_strings(self):
+        for streaming in (False, True):
+            with self.subTest(streaming=streaming):
+                self.assertEqual(self.analyze('mixed_codes.csv', streaming=streaming), self.MIXED)
+                self.assertEqual(
+                    self.analyze('mixed_codes.csv', start_date='2024-01-01', end_date='2024-12-31', streaming=streaming),
+                    self.MIXED
+                )
+
+    def test_appended_rows_follow_code_type(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        for streaming in (False, True):
+            for line, expected in (
+                ('2024.01.06,삼성전자,5930,매도,7\n', [('SK하이닉스', -200.0, 0, 'KRW'), ('삼성전자', 1607.0, 3, 'KRW')]),
+                # 문자 코드가 추가되면 파일 전체가 문자열 코드가 되므로 다시 계산
+                ('2024.01.06,애플,AAPL,매도,7\n', [('SK하이닉스', -200.0, 0, 'KRW'), ('삼성전자', 500.0, 1, 'KRW'),
+                                                 ('삼성전자', 1100.0, 1, 'KRW'), ('애플', 7.0, 1, 'USD')]),
+            ):
+                with self.subTest(streaming=streaming, line=line):
+                    path = os.path.join(tmp_dir, 'trades.csv')
+                    shutil.copyfile(data_path('numeric_codes.csv'), path)
+                    analyzer = DataAnalyzer(use_sidecar=False)
+                    self.assertEqual(rows(analyzer.analyze_csv(path, streaming=streaming)), self.NUMERIC)
+                    with open(path, 'a', encoding='utf-8') as f:
+                        f.write(line)
+                    self.assertEqual(rows(analyzer.analyze_csv(path, streaming=streaming)), expected)
+
+    def test_files_with_different_code_types(self):
+        results = DataAnalyzer(use_sidecar=False).analyze_files(
+            [data_path('numeric_codes.csv'), data_path('mixed_codes.csv')], max_workers=1
+        )
+        # 숫자 코드는 문자열로 바뀌어 같은 문자열 코드('5930')와 합산
+        self.assertEqual(rows(results), [
+            ('SK하이닉스', -200.0, 0, 'KRW'), ('삼성전자', 1000.0, 1, 'KRW'),
+            ('삼성전자', 2100.0, 3, 'KRW'), ('애플', -200.0, 1, 'USD'),
+        ])
+
+class WorkerTest(unittest.TestCase):
+    """프로세스 풀 작업 함수는 결과만 반환하고 버려지므로 증분 상태를 만들지 않음"""
+    def setUp(self):
+        self.analyzer = DataAnalyzer(use_sidecar=False)
+        self.analyzer._load_pandas()
+
+    def test_worker_skips_incremental_state(self):
+        with mock.patch.object(data_analyzer, 'file_fingerprint', side_effect=AssertionError("해시 계산")):
+            summed = data_analyzer._summarize_file(data_path('numeric_codes.csv'))
+        self.assertEqual(rows(self.analyzer._format_results(summed)), CodeGroupingTest.NUMERIC)
+
+    def test_worker_with_date_range(self):
+        summed = data_analyzer._summarize_file(data_path('numeric_codes.csv'), '2024-01-01', '2024-01-03')
+        self.assertEqual(rows(self.analyzer._format_results(summed)), [('삼성전자', 1500.0, 2, 'KRW')])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""거래 원장 테스트: 가져오기 중복 제거와 원장 집계 결과"""
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import trade_ledger
+from csv_merger import _row_keys
+from trade_ledger import TradeLedger
+from tests.test_data_analyzer import ALL_TRADES, ALL_TRADES_STATISTICS, JAN_FEB_SELLS, FROM_MARCH_SELLS, rows
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+class LedgerRowKeyTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.ledger = TradeLedger(os.path.join(self.tmp_dir, 'ledger.sqlite3'))
+        self.addCleanup(self.ledger.close)
+
+    def write_csv(self, name, text):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def test_same_rows_from_other_file_are_duplicates(self):
+        self.ledger.import_csv(os.path.join(DATA_DIR, 'numeric_codes.csv'))
+        copy = shutil.copyfile(os.path.join(DATA_DIR, 'numeric_codes.csv'), os.path.join(self.tmp_dir, 'copy.csv'))
+        stats = self.ledger.import_csv(copy)
+        self.assertEqual((stats['rows_read'], stats['rows_inserted'], stats['duplicates']), (4, 0, 4))
+        self.assertEqual(self.ledger.count(), 4)
+
+    def test_rows_with_same_first_half_key_are_kept(self):
+        # 앞 64비트가 모두 같아도 뒤 64비트가 다르면 서로 다른 거래
+        def same_hi(pd, np, chunk):
+            hi, lo = _row_keys(pd, np, chunk)
+            return np.zeros_like(hi), lo
+
+        path = self.write_csv('trades.csv', '날짜,종목명,코드,매매구분,평가손익\n'
+                                            '2024.01.02,삼성전자,005930,매도,100\n'
+                                            '2024.01.03,삼성전자,005930,매도,200\n'
+                                            '2024.01.03,삼성전자,005930,매도,200\n')
+        with mock.patch.object(trade_ledger, '_row_keys', side_effect=same_hi):
+            stats = self.ledger.import_csv(path)
+        self.assertEqual((stats['rows_inserted'], stats['duplicates']), (2, 1))
+        self.assertEqual(list(self.ledger.results()), [('삼성전자', 300.0, 2, 'KRW')])
+
+    def test_missing_values_do_not_alias_other_values(self):
+        # 결측값이 다른 값과 같은 키가 되면 다른 거래가 중복으로 빠짐
+        path = self.write_csv('trades.csv', '날짜,종목명,코드,매매구분,평가손익,메모\n'
+                                            '2024.01.02,삼성전자,005930,매도,100,a\n'
+                                            '2024.01.02,삼성전자,005930,매도,100,\n')
+        stats = self.ledger.import_csv(path)
+        self.assertEqual((stats['rows_inserted'], stats['duplicates']), (2, 0))
+
+class LedgerFixtureTest(unittest.TestCase):
+    """고정 CSV를 원장에 가져온 결과가 CSV 분석 결과와 같은지"""
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.ledger = TradeLedger(os.path.join(self.tmp_dir, 'ledger.sqlite3'))
+        self.addCleanup(self.ledger.close)
+
+    def test_import_matches_analysis(self):
+        stats = self.ledger.import_csv(os.path.join(DATA_DIR, 'trades.csv'))
+        self.assertEqual(stats, {'rows_read': 11, 'rows_inserted': 11, 'duplicates': 0, 'skipped': 0,
+                                 'incremental': False})
+        self.assertEqual(rows(self.ledger.results()), ALL_TRADES)
+        self.assertEqual(self.ledger.get_statistics(), ALL_TRADES_STATISTICS)
+        self.assertEqual(tuple(self.ledger.get_date_range()), ('2023-11-30', '2024-04-01'))
+        self.assertEqual(rows(self.ledger.results('2024-01-01', '2024-02-29')), JAN_FEB_SELLS)
+        self.assertEqual(rows(self.ledger.results('2024-03-01', None)), FROM_MARCH_SELLS)
+
+    def test_other_encoding_of_same_trades(self):
+        self.ledger.import_csv(os.path.join(DATA_DIR, 'trades.csv'))
+        stats = self.ledger.import_csv(os.path.join(DATA_DIR, 'trades_cp949.csv'))
+        # 원본 값(' 7,000')이 다른 행 하나만 새 거래
+        self.assertEqual((stats['rows_read'], stats['rows_inserted'], stats['duplicates']), (11, 1, 10))
+        self.assertIn(('SK하이닉스', 10500.0, 2, 'KRW'), rows(self.ledger.results()))
+
+    def test_appended_rows_are_imported_incrementally(self):
+        path = shutil.copyfile(os.path.join(DATA_DIR, 'trades.csv'), os.path.join(self.tmp_dir, 'trades.csv'))
+        self.ledger.import_csv(path)
+        self.assertEqual(self.ledger.import_csv(path)['rows_read'], 0)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('2024.04.03,NAVER,035420,매도,"2,500",\n')
+        stats = self.ledger.import_csv(path)
+        self.assertEqual((stats['rows_read'], stats['rows_inserted'], stats['incremental']), (1, 1, True))
+        self.assertIn(('NAVER', 2500.0, 2, 'KRW'), rows(self.ledger.results()))
+
+if __name__ == '__main__':
+    unittest.main()
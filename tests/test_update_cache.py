@@ -0,0 +1,142 @@
+"""릴리즈 확인 캐시 테스트: TTL 안의 재사용, ETag/Last-Modified 조건부 요청(304), 손상/없는 캐시 파일"""
+import os
+import sys
+import json
+import tempfile
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import auto_updater
+from tests.local_server import LocalServer, RecordingHandler
+
+RELEASE = {
+    'tag_name': 'v2.0.0',
+    'body': '변경 사항',
+    'html_url': 'https://example.invalid/releases/v2.0.0', # 캐시에는 저장하지 않는 항목
+    'assets': [{'name': 'stock.zip', 'browser_download_url': 'https://example.invalid/stock.zip',
+                'size': 1234, 'digest': 'sha256:' + '0' * 64, 'download_count': 7}],
+}
+ETAG = '"release-v2"'
+LAST_MODIFIED = 'Sat, 17 Oct 2026 09:00:00 GMT'
+
+class ReleaseHandler(RecordingHandler):
+    """ETag/Last-Modified가 일치하는 조건부 요청에는 304, 그 외에는 릴리즈 JSON으로 응답"""
+    etag = ETAG
+    last_modified = LAST_MODIFIED
+
+    def handle_get(self):
+        if (self.etag and self.headers.get('If-None-Match') == self.etag) or \
+                (self.last_modified and self.headers.get('If-Modified-Since') == self.last_modified):
+            self.send_response(304)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        headers = {'Content-Type': 'application/json'}
+        if self.etag:
+            headers['ETag'] = self.etag
+        if self.last_modified:
+            headers['Last-Modified'] = self.last_modified
+        self.send_body(json.dumps(RELEASE).encode(), headers=headers)
+
+class LastModifiedOnlyHandler(ReleaseHandler):
+    etag = None
+
+class FetchLatestReleaseTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self._tmp.name, 'update_cache.json')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def fetch(self, server, ttl=60):
+        return auto_updater.fetch_latest_release(server.url('/releases/latest'), timeout=5, ttl=ttl,
+                                                 cache_file=self.cache_file)
+
+    def read_cache(self):
+        with open(self.cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_missing_cache_fetches_and_saves_summary(self):
+        with LocalServer(ReleaseHandler) as server:
+            release = self.fetch(server)
+            self.assertEqual(len(server.requests), 1)
+            self.assertNotIn('If-None-Match', server.requests[0][1])
+            self.assertNotIn('If-Modified-Since', server.requests[0][1])
+
+        self.assertEqual(release['tag_name'], 'v2.0.0')
+        self.assertEqual(release['assets'], [{'name': 'stock.zip', 'browser_download_url': 'https://example.invalid/stock.zip',
+                                              'size': 1234, 'digest': 'sha256:' + '0' * 64}])
+        cache = self.read_cache()
+        self.assertEqual(cache['release'], release)
+        self.assertEqual(cache['etag'], ETAG)
+        self.assertEqual(cache['last_modified'], LAST_MODIFIED)
+
+    def test_within_ttl_reuses_cache_without_request(self):
+        with LocalServer(ReleaseHandler) as server:
+            first = self.fetch(server)
+            second = self.fetch(server)
+            self.assertEqual(len(server.requests), 1)
+        self.assertEqual(first, second)
+
+    def test_expired_cache_sends_etag_and_reuses_on_304(self):
+        with LocalServer(ReleaseHandler) as server:
+            first = self.fetch(server)
+            checked_at = self.read_cache()['checked_at']
+            second = self.fetch(server, ttl=0) # 0이면 항상 서버에 확인
+            self.assertEqual(len(server.requests), 2)
+            headers = server.requests[1][1]
+        self.assertEqual(headers.get('If-None-Match'), ETAG)
+        self.assertEqual(headers.get('If-Modified-Since'), LAST_MODIFIED)
+        self.assertEqual(second, first)
+        self.assertGreaterEqual(self.read_cache()['checked_at'], checked_at)
+
+    def test_last_modified_only_reuses_on_304(self):
+        with LocalServer(LastModifiedOnlyHandler) as server:
+            first = self.fetch(server)
+            self.assertIsNone(self.read_cache()['etag'])
+            second = self.fetch(server, ttl=0)
+            headers = server.requests[1][1]
+        self.assertNotIn('If-None-Match', headers)
+        self.assertEqual(headers.get('If-Modified-Since'), LAST_MODIFIED)
+        self.assertEqual(second, first)
+
+    def test_expired_ttl_by_age(self):
+        with LocalServer(ReleaseHandler) as server:
+            self.fetch(server)
+            cache = self.read_cache()
+            cache['checked_at'] -= 120
+            auto_updater.save_update_cache(cache, self.cache_file)
+            self.fetch(server, ttl=60)
+            self.assertEqual(len(server.requests), 2)
+            self.assertEqual(server.requests[1][1].get('If-None-Match'), ETAG)
+
+    def test_corrupt_cache_is_ignored_and_replaced(self):
+        for content in ('{"checked_at": 1', '[]', '{"checked_at": 9e99, "release": "v1"}'):
+            with self.subTest(content=content):
+                with open(self.cache_file, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                self.assertIsNone(auto_updater.load_update_cache(self.cache_file))
+                with LocalServer(ReleaseHandler) as server:
+                    release = self.fetch(server)
+                    self.assertEqual(len(server.requests), 1)
+                    self.assertNotIn('If-None-Match', server.requests[0][1])
+                self.assertEqual(release['tag_name'], 'v2.0.0')
+                self.assertEqual(self.read_cache()['release'], release)
+
+    def test_server_error_without_cache_returns_none(self):
+        with LocalServer(RecordingHandler) as server: # 모든 요청에 404
+            self.assertIsNone(self.fetch(server))
+        self.assertFalse(os.path.exists(self.cache_file))
+
+    def test_unreachable_server_returns_none(self):
+        with LocalServer(ReleaseHandler) as server:
+            url = server.url('/releases/latest')
+        # 서버를 닫은 뒤의 주소로 요청
+        self.assertIsNone(auto_updater.fetch_latest_release(url, timeout=5, ttl=60, cache_file=self.cache_file))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+"""업데이트 파일 다운로드 테스트: 연결이 끊기는 로컬 서버에서 Range 이어받기, Range를 무시하는 서버, 재시도 초과, SHA-256 불일치"""
+import os
+import re
+import sys
+import random
+import hashlib
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import auto_updater
+from tests.local_server import LocalServer, RecordingHandler
+
+PAYLOAD = random.Random(0).randbytes(300_000)
+PAYLOAD_SHA256 = hashlib.sha256(PAYLOAD).hexdigest()
+DROP_AFTER = 100_000
+
+class FileHandler(RecordingHandler):
+    """
+    PAYLOAD를 내려주는 서버. Range 요청에는 206으로 요청한 위치부터 응답하고,
+    drop_requests번째 요청까지는 drop_after바이트만 보낸 뒤 연결을 끊습니다. (Content-Length는 전체 길이)
+    """
+    drop_requests = 1
+    drop_after = DROP_AFTER
+    honor_range = True
+
+    def handle_get(self):
+        start = 0
+        match = re.fullmatch(r'bytes=(\d+)-', self.headers.get('Range', ''))
+        if match and self.honor_range:
+            start = int(match.group(1))
+        body = PAYLOAD[start:]
+        self.send_response(206 if start else 200)
+        if start:
+            self.send_header('Content-Range', f"bytes {start}-{len(PAYLOAD) - 1}/{len(PAYLOAD)}")
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if len(self.server.requests) <= self.drop_requests:
+            self.wfile.write(body[:self.drop_after])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+class IgnoreRangeHandler(FileHandler):
+    honor_range = False
+
+class AlwaysDropHandler(FileHandler):
+    drop_requests = float('inf')
+    drop_after = 10_000
+
+class NoDropHandler(FileHandler):
+    drop_requests = 0
+
+def _range_start(headers):
+    match = re.fullmatch(r'bytes=(\d+)-', headers.get('Range', ''))
+    return int(match.group(1)) if match else None
+
+class DownloadFileTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dest = os.path.join(self._tmp.name, 'stock.zip')
+        self.reports = []
+        self.progress = auto_updater.TransferProgress(len(PAYLOAD), lambda *report: self.reports.append(report))
+        # 재시도 대기 없이 실행
+        patcher = mock.patch.object(auto_updater.time, 'sleep')
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def download(self, server, sha256=PAYLOAD_SHA256, retries=3):
+        return auto_updater.download_file(server.url('/stock.zip'), self.dest, sha256=sha256, size=len(PAYLOAD),
+                                          progress=self.progress, timeout=5, retries=retries)
+
+    def read_dest(self):
+        with open(self.dest, 'rb') as f:
+            return f.read()
+
+    def test_resumes_with_range_after_drop(self):
+        with LocalServer(FileHandler) as server:
+            self.assertEqual(self.download(server), self.dest)
+            requests = list(server.requests)
+
+        self.assertEqual(len(requests), 2)
+        self.assertIsNone(_range_start(requests[0][1]))
+        start = _range_start(requests[1][1])
+        self.assertIsNotNone(start)
+        self.assertTrue(0 < start <= DROP_AFTER)
+        self.assertEqual(self.read_dest(), PAYLOAD)
+        self.assertFalse(os.path.exists(f"{self.dest}.part"))
+        self.assertEqual(self.sleep.call_count, 1)
+        # 이어받은 양만큼만 다시 받음
+        self.assertEqual(self.progress.done, len(PAYLOAD))
+        self.assertEqual(self.progress._transferred, len(PAYLOAD))
+        self.assertEqual(self.reports[-1][:2], (len(PAYLOAD), len(PAYLOAD)))
+
+    def test_resumes_leftover_part_file(self):
+        with open(f"{self.dest}.part", 'wb') as f:
+            f.write(PAYLOAD[:1000])
+        with LocalServer(NoDropHandler) as server:
+            self.download(server)
+            requests = list(server.requests)
+
+        self.assertEqual([_range_start(headers) for _, headers in requests], [1000])
+        self.assertEqual(self.read_dest(), PAYLOAD)
+        self.assertEqual(self.progress.done, len(PAYLOAD))
+        self.assertEqual(self.progress._transferred, len(PAYLOAD) - 1000)
+
+    def test_restarts_when_server_ignores_range(self):
+        with LocalServer(IgnoreRangeHandler) as server:
+            self.download(server)
+            requests = list(server.requests)
+
+        self.assertEqual(len(requests), 2)
+        self.assertIsNotNone(_range_start(requests[1][1]))
+        self.assertEqual(self.read_dest(), PAYLOAD)
+        # 200 응답으로 처음부터 다시 받으면 진행률도 처음부터 다시 셈
+        self.assertEqual(self.progress.done, len(PAYLOAD))
+        self.assertTrue(all(0 <= done <= len(PAYLOAD) for done, *_ in self.reports))
+
+    def test_gives_up_after_retries(self):
+        with LocalServer(AlwaysDropHandler) as server:
+            with self.assertRaisesRegex(Exception, 'after 2 retries'):
+                self.download(server, retries=2)
+            requests = list(server.requests)
+
+        self.assertEqual(len(requests), 3)
+        self.assertEqual(self.sleep.call_count, 2)
+        self.assertFalse(os.path.exists(self.dest))
+        # 받은 부분은 다음 실행에서 이어받도록 남겨 둠
+        with open(f"{self.dest}.part", 'rb') as f:
+            part = f.read()
+        self.assertTrue(part and PAYLOAD.startswith(part))
+
+    def test_rejects_sha256_mismatch(self):
+        with LocalServer(FileHandler) as server:
+            with self.assertRaisesRegex(Exception, 'Integrity check failed'):
+                self.download(server, sha256='0' * 64)
+
+        self.assertFalse(os.path.exists(self.dest))
+        self.assertFalse(os.path.exists(f"{self.dest}.part"))
+
+    def test_skips_existing_file_with_matching_sha256(self):
+        with open(self.dest, 'wb') as f:
+            f.write(PAYLOAD)
+        with LocalServer(FileHandler) as server:
+            self.download(server)
+            self.assertEqual(server.requests, [])
+        self.assertEqual(self.progress.done, len(PAYLOAD))
+        self.assertEqual(self.progress._transferred, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,270 @@
+"""가져온 거래 내역을 SQLite에 누적 보관하는 거래 원장 모듈 (선택 기능)"""
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from encoding_detector import encoding_candidates, remember_encoding, forget_encoding
+from data_analyzer import DataAnalyzer, file_fingerprint, ends_with_newline
+from csv_merger import _row_keys
+from result_model import AnalysisResults, build_statistics
+
+# 원장 스키마가 바뀌면 올려서 이전 원장을 다시 만들도록 함
+LEDGER_SCHEMA_VERSION = 2
+LEDGER_CHUNK_ROWS = 100_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY,
+    row_key_hi INTEGER NOT NULL,
+    row_key_lo INTEGER NOT NULL,
+    stock TEXT NOT NULL,
+    code TEXT NOT NULL,
+    trade_type TEXT,
+    trade_date TEXT,
+    profit REAL NOT NULL,
+    is_sell INTEGER NOT NULL,
+    sell_trade INTEGER NOT NULL,
+    currency TEXT NOT NULL
+);
+-- 원본 행 전체(컬럼 이름순)의 128비트 키 (CSV 병합과 같은 키): 같은 거래를 다시 가져오면 무시됨
+CREATE UNIQUE INDEX IF NOT EXISTS ux_trades_row_key ON trades(row_key_hi, row_key_lo);
+-- 전체 집계와 기간 집계가 테이블을 읽지 않고 인덱스만으로 처리되도록 필요한 컬럼을 모두 포함
+CREATE INDEX IF NOT EXISTS ix_trades_stock ON trades(stock, code, profit, is_sell, currency);
+CREATE INDEX IF NOT EXISTS ix_trades_sell_date ON trades(sell_trade, trade_date, stock, code, profit, is_sell, currency);
+
+CREATE TABLE IF NOT EXISTS imports (
+    path TEXT PRIMARY KEY,
+    encoding TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    names TEXT NOT NULL,
+    imported_at TEXT NOT NULL
+);
+"""
+
+_INSERT = """
+INSERT OR IGNORE INTO trades
+    (row_key_hi, row_key_lo, stock, code, trade_type, trade_date, profit, is_sell, sell_trade, currency)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def default_ledger_path():
+    """기본 원장 파일 위치"""
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'stock-analyzer', 'ledger.sqlite3')
+
+def _valid_date(value):
+    """YYYY-MM-DD 형식이면 그대로, 아니면 None (빈 값/잘못된 값은 제한 없음)"""
+    if not value:
+        return None
+    try:
+        datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        return None
+    return value
+
+class TradeLedger:
+    """
+    여러 CSV 파일의 거래를 중복 없이 누적하는 SQLite 원장.
+    결과/기간/통계는 인덱스를 사용하는 SQL 집계로 계산하므로 CSV를 다시 읽지 않습니다.
+    """
+    def __init__(self, db_path=None, analyzer=None):
+        self.db_path = db_path or default_ledger_path()
+        self.analyzer = analyzer or DataAnalyzer(use_sidecar=False)
+        self._conn = None
+        # 분석은 작업 스레드에서 실행되므로 연결 하나를 잠금으로 공유
+        self._lock = threading.RLock()
+
+    def exists(self):
+        """원장 파일이 이미 만들어져 있는지 (원장을 쓰지 않는 사용자는 파일이 생기지 않음)"""
+        return os.path.exists(self.db_path)
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, LEDGER_SCHEMA_VERSION):
+                conn.executescript("DROP TABLE IF EXISTS trades; DROP TABLE IF EXISTS imports;")
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {LEDGER_SCHEMA_VERSION}")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def count(self):
+        """원장에 저장된 거래 수"""
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+
+    def clear(self):
+        """원장의 모든 거래와 가져오기 기록 삭제"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM trades")
+                conn.execute("DELETE FROM imports")
+
+    def import_csv(self, file_path, progress_callback=None, cancel_token=None):
+        """
+        CSV 파일의 거래를 원장에 추가합니다. 이미 있는 거래(같은 원본 행)는 무시됩니다.
+        이전에 가져온 파일 뒤에 행이 추가되기만 했다면 추가된 부분만 읽습니다.
+        (이전에 읽은 앞부분 전체의 해시가 같을 때만, 앞부분이 바뀌었으면 전체를 다시 읽음)
+        cancel_token이 취소되면 청크 사이에서 중단하고 이번 가져오기 전체를 되돌립니다.
+        반환값: {'rows_read', 'rows_inserted', 'duplicates', 'skipped', 'incremental'}
+        (skipped: 종목명이나 코드가 없어 원장에 넣지 않은 행)
+        """
+        path = os.path.abspath(file_path)
+        size = os.path.getsize(path)
+
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT encoding, offset, fingerprint, names FROM imports WHERE path = ?",
+                               (path,)).fetchone()
+
+            if row and row[1] <= size and file_fingerprint(path, row[1]) == json.loads(row[2]):
+                if row[1] == size:
+                    return {'rows_read': 0, 'rows_inserted': 0, 'duplicates': 0, 'skipped': 0, 'incremental': True}
+                plans = [(row[0], row[1], json.loads(row[3]))]
+            else:
+                # 처음 가져오거나 앞부분이 바뀐 파일: 전체를 읽되 기존 거래는 유일 인덱스로 걸러짐
+                plans = [(encoding, 0, None) for encoding in encoding_candidates(path)]
+
+            for encoding, offset, names in plans:
+                try:
+                    stats = self._import_from(conn, path, encoding, offset, names, progress_callback, cancel_token)
+                except UnicodeDecodeError:
+                    forget_encoding(path)
+                    continue
+                stats['incremental'] = offset > 0
+                if offset == 0:
+                    remember_encoding(path, encoding)
+                return stats
+
+        raise Exception("파일 인코딩을 인식할 수 없습니다.")
+
+    def _import_from(self, conn, path, encoding, offset, names, progress_callback, cancel_token=None):
+        """offset 위치부터 읽어 한 트랜잭션으로 추가 (실패하면 전체 취소)"""
+        import numpy as np
+        import pandas as pd
+
+        size = max(os.path.getsize(path), 1)
+        rows_read = 0
+        skipped = 0
+        before = conn.total_changes
+
+        try:
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                # 원본 값 그대로 해시하도록 문자열로 읽음 (코드 앞자리 0 보존)
+                read_kwargs = {'header': None, 'names': names} if names else {}
+                reader = pd.read_csv(f, encoding=encoding, dtype=str, chunksize=LEDGER_CHUNK_ROWS, **read_kwargs)
+                for chunk in reader:
+                    if cancel_token:
+                        cancel_token.check()
+                    if names is None:
+                        names = list(chunk.columns)
+                    rows_read += len(chunk)
+
+                    # SQLite 정수는 부호 있는 64비트이므로 같은 비트를 int64로 저장
+                    hi, lo = _row_keys(pd, np, chunk[sorted(chunk.columns)])
+                    row_keys = pd.DataFrame({'hi': hi.view('int64'), 'lo': lo.view('int64')}, index=chunk.index)
+                    trades = self.analyzer.normalize_trades(chunk)
+                    skipped += len(chunk) - len(trades)
+                    row_keys = row_keys.loc[trades.index]
+                    conn.executemany(_INSERT, zip(
+                        row_keys['hi'].tolist(),
+                        row_keys['lo'].tolist(),
+                        trades['stock'].tolist(),
+                        trades['code'].tolist(),
+                        trades['trade_type'].tolist(),
+                        trades['trade_date'].tolist(),
+                        trades['profit'].tolist(),
+                        trades['is_sell'].tolist(),
+                        trades['sell_trade'].tolist(),
+                        trades['currency'].tolist(),
+                    ))
+
+                    if progress_callback:
+                        pos = min(f.tell(), size)
+                        progress_callback(90 * pos / size, f"원장에 추가 중... (읽은 행 {rows_read:,})")
+
+            if names is None:
+                names = list(pd.read_csv(path, encoding=encoding, nrows=0).columns)
+            inserted = conn.total_changes - before
+
+            # 마지막 줄이 완성된 경우에만 다음 가져오기를 이 위치부터 이어서 할 수 있음
+            end = os.path.getsize(path)
+            if ends_with_newline(path):
+                conn.execute(
+                    "INSERT OR REPLACE INTO imports (path, encoding, offset, fingerprint, names, imported_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (path, encoding, end, json.dumps(file_fingerprint(path, end)),
+                     json.dumps(names, ensure_ascii=False), datetime.now().isoformat(timespec='seconds'))
+                )
+            else:
+                conn.execute("DELETE FROM imports WHERE path = ?", (path,))
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+        if progress_callback:
+            progress_callback(100, "원장 추가 완료!")
+        return {'rows_read': rows_read, 'rows_inserted': inserted, 'duplicates': rows_read - skipped - inserted,
+                'skipped': skipped}
+
+    def _filter(self, start_date=None, end_date=None):
+        """기간 조건 SQL과 인자 (기간이 있으면 '매도' 거래만 대상)"""
+        start_date, end_date = _valid_date(start_date), _valid_date(end_date)
+        if not (start_date or end_date):
+            return "", ()
+        where, params = ["sell_trade = 1", "trade_date IS NOT NULL"], []
+        if start_date:
+            where.append("trade_date >= ?")
+            params.append(start_date)
+        if end_date:
+            where.append("trade_date <= ?")
+            params.append(end_date)
+        return "WHERE " + " AND ".join(where), tuple(params)
+
+    def results(self, start_date=None, end_date=None):
+        """원장 전체(또는 기간)의 (종목명, 평가손익, 매도 횟수, 통화) 컬럼별 결과 (수익금 내림차순)"""
+        where, params = self._filter(start_date, end_date)
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT stock, SUM(profit) AS total, SUM(is_sell), MAX(currency) FROM trades {where} "
+                "GROUP BY stock, code ORDER BY total DESC, stock, code",
+                params
+            ).fetchall()
+        return AnalysisResults.from_rows((stock, total, int(sells), currency) for stock, total, sells, currency in rows)
+
+    def get_date_range(self):
+        """원장에 있는 '매도' 거래의 최소/최대 날짜 (YYYY-MM-DD, 없으면 None, None)"""
+        with self._lock:
+            return self._connect().execute(
+                "SELECT MIN(trade_date), MAX(trade_date) FROM trades "
+                "WHERE sell_trade = 1 AND trade_date IS NOT NULL"
+            ).fetchone()
+
+    def get_statistics(self, start_date=None, end_date=None):
+        """통계 정보 반환 (DataAnalyzer.get_statistics와 같은 형식, 통화별 집계)"""
+        where, params = self._filter(start_date, end_date)
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT currency, COUNT(*), SUM(total > 0), SUM(total < 0), SUM(total) FROM ("
+                f"SELECT MAX(currency) AS currency, SUM(profit) AS total FROM trades {where} GROUP BY stock, code"
+                ") GROUP BY currency",
+                params
+            ).fetchall()
+
+        # 행: (통화, 종목 수, 수익 종목 수, 손실 종목 수, 평가손익 합계)
+        columns = list(zip(*rows)) if rows else [()] * 5
+        return build_statistics(*columns)
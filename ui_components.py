@@ -1,28 +1,131 @@
 """UI 컴포넌트를 담당하는 모듈"""
 import tkinter as tk
 from tkinter import ttk, messagebox
+import queue
 import threading
-from tkcalendar import DateEntry # tkcalendar에서 DateEntry 임포트
+from analysis_jobs import JobManager
+from result_model import AnalysisResults
+
+# 진행률 표시 갱신 주기 (밀리초, 약 20fps)
+PROGRESS_FRAME_MS = 50
+
+class ProgressChannel:
+    """
+    작업 스레드의 진행률 보고를 메인 스레드로 전달하는 채널.
+    작업 스레드는 report()로 큐에 넣기만 하고, 메인 스레드가 root.after로 일정 주기마다
+    쌓인 보고를 모두 꺼내 가장 최근 값만 표시합니다. (보고가 아무리 잦아도 화면 갱신은 주기당 한 번)
+    """
+    def __init__(self, widget, target, interval_ms=PROGRESS_FRAME_MS):
+        self.widget = widget
+        self.target = target  # 메인 스레드에서 호출할 함수 (값, 텍스트)
+        self.interval_ms = interval_ms
+        self._queue = queue.SimpleQueue()
+        self._after_id = None
+        self._text = ""
+        
+    def report(self, value, text=""):
+        """진행률 보고 (어느 스레드에서나 호출 가능, Tk를 건드리지 않음)"""
+        self._queue.put((value, text))
+        
+    def start(self):
+        self._after_id = self.widget.after(self.interval_ms, self._poll)
+        return self
+        
+    def _drain(self):
+        """
+        쌓인 보고를 모두 꺼내 (보고 여부, 가장 최근 값) 반환 (텍스트는 마지막으로 받은 비어 있지 않은 값).
+        값은 None일 수 있음 (예: 전체 크기를 모르는 다운로드, 문구만 바꾸는 보고)
+        """
+        reported, latest = False, None
+        while True:
+            try:
+                value, text = self._queue.get_nowait()
+            except queue.Empty:
+                return reported, latest
+            reported = True
+            if value is not None:
+                latest = value
+            if text:
+                self._text = text
+                
+    def _poll(self):
+        reported, value = self._drain()
+        if reported:
+            self.target(value, self._text)
+        self._after_id = self.widget.after(self.interval_ms, self._poll)
+        
+    def close(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+class MainThreadQueue:
+    """
+    작업 스레드가 메인 스레드에서 실행할 함수를 넘기는 대기열.
+    Tkinter는 다른 스레드에서의 호출(root.after 포함)을 보장하지 않으므로, 작업 스레드는 post()로 넣기만 하고
+    메인 스레드가 root.after로 일정 주기마다 쌓인 함수를 모두 꺼내 차례로 실행합니다. (ProgressChannel과 같은 방식)
+    """
+    def __init__(self, widget, interval_ms=PROGRESS_FRAME_MS):
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self._queue = queue.SimpleQueue()
+        self._after_id = None
+        
+    def post(self, func, *args):
+        """메인 스레드에서 func(*args) 실행 예약 (어느 스레드에서나 호출 가능, Tk를 건드리지 않음)"""
+        self._queue.put((func, args))
+        
+    def start(self):
+        self._after_id = self.widget.after(self.interval_ms, self._poll)
+        return self
+        
+    def _poll(self):
+        while True:
+            try:
+                func, args = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func(*args)
+            except Exception:
+                # 한 함수의 오류로 이후 예약된 함수 실행이 멈추지 않도록 기록만 함
+                import traceback
+                traceback.print_exc()
+        self._after_id = self.widget.after(self.interval_ms, self._poll)
+        
+    def close(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
 
 class ProgressDialog:
-    def __init__(self, parent, title="처리 중..."):
+    def __init__(self, parent, title="처리 중...", on_cancel=None):
+        self.on_cancel = on_cancel  # 있으면 취소 버튼 표시
+        self.height = 150 if on_cancel else 120
+        self._closed = False
         self.dialog = tk.Toplevel(parent)
         self.dialog.title(title)
-        self.dialog.geometry("300x120")
+        self.dialog.geometry(f"300x{self.height}")
         self.dialog.resizable(False, False)
         self.dialog.transient(parent)
         self.dialog.grab_set()
+        if on_cancel:
+            self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
         
         # 화면 중앙에 위치
         self.center_dialog(parent)
         
         self.setup_ui()
         
+        # 작업 스레드는 report()로만 진행률을 보고 (화면 갱신은 메인 스레드에서)
+        self.channel = ProgressChannel(self.dialog, self.update).start()
+        self.report = self.channel.report
+        
     def center_dialog(self, parent):
         parent.update_idletasks()
         x = parent.winfo_x() + (parent.winfo_width() // 2) - 150
-        y = parent.winfo_y() + (parent.winfo_height() // 2) - 60
-        self.dialog.geometry(f"300x120+{x}+{y}")
+        y = parent.winfo_y() + (parent.winfo_height() // 2) - self.height // 2
+        self.dialog.geometry(f"300x{self.height}+{x}+{y}")
         
     def setup_ui(self):
         frame = ttk.Frame(self.dialog, padding="20")
@@ -37,23 +140,280 @@ class ProgressDialog:
         self.percent_label = ttk.Label(frame, text="0%")
         self.percent_label.pack()
         
+        if self.on_cancel:
+            ttk.Button(frame, text="취소", command=self.cancel).pack(pady=(10, 0))
+        
     def update(self, value, text=""):
+        """진행률 표시 (메인 스레드 전용, 작업 스레드에서는 report 사용)"""
         self.progress['value'] = value
         self.percent_label.config(text=f"{int(value)}%")
         if text:
             self.status_label.config(text=text)
-        self.dialog.update()
+        
+    def cancel(self):
+        """작업 취소 요청 후 바로 닫기 (작업은 다음 단계/청크에서 중단됨)"""
+        self.on_cancel()
+        self.close()
         
     def close(self):
+        # 취소로 먼저 닫힌 뒤 작업 종료 시 다시 호출될 수 있음
+        if self._closed:
+            return
+        self._closed = True
+        self.channel.close()
         self.dialog.destroy()
 
+class ResultTableModel:
+    """
+    분석 결과의 원시 값(평가손익 float, 매도 횟수 int, 통화)을 컬럼별 배열로 보관하는 표 모델.
+    정렬은 행 순서(permutation)만 바꾸고, 화면에 보이는 행만 그때그때 문자열로 변환합니다.
+    """
+    def __init__(self, results):
+        import numpy as np
+        self._np = np
+        
+        # 분석 결과의 컬럼 배열을 그대로 사용 (튜플 목록이면 컬럼으로 변환)
+        results = AnalysisResults.from_rows(results)
+        count = len(results)
+        self.stocks = results.stocks
+        self.profits = results.profits
+        self.sell_counts = results.sell_counts
+        self.is_usd = results.currencies == 'USD'
+        self.ranks = np.arange(1, count + 1)
+        self.order = np.arange(count)  # 표시 순서 -> 모델 행 번호
+        self._sort_keys = {}           # 컬럼별 정렬 키 (순위 제외, 모델이 바뀌지 않으므로 한 번만 계산)
+        
+    def __len__(self):
+        return len(self.order)
+        
+    def __getitem__(self, position):
+        """표시 위치의 (값 튜플, 태그 튜플)"""
+        i = self.order[position]
+        profit = self.profits[i]
+        if self.is_usd[i]:
+            profit_str = f"${profit:,.2f}" # 달러는 소수점 둘째 자리까지
+        else: # KRW
+            profit_str = f"{profit:,.0f}원"
+        if profit > 0:
+            profit_str = f"+{profit_str}"
+            
+        tag = 'profit' if profit >= 0 else 'loss'
+        return (int(self.ranks[i]), self.stocks[i], profit_str, int(self.sell_counts[i])), (tag,)
+        
+    def _sort_key(self, col):
+        if col == '순위':
+            return self.ranks
+        key = self._sort_keys.get(col)
+        if key is None:
+            if col == '평가손익':
+                key = self.profits
+            elif col == '매도 횟수':
+                key = self.sell_counts
+            else:
+                # 문자열은 정렬된 고유값의 번호로 바꿔 두면 이후 정렬이 정수 비교가 됨
+                key = self._np.unique(self._np.array([str(s) for s in self.stocks]), return_inverse=True)[1]
+            self._sort_keys[col] = key
+        return key
+        
+    def sort(self, col, reverse=False):
+        """
+        현재 표시 순서를 기준으로 안정 정렬 (값이 같으면 이전 순서 유지)
+        순위가 아닌 컬럼으로 정렬하면 순위를 새 표시 순서로 다시 매깁니다.
+        """
+        np = self._np
+        key = self._sort_key(col)[self.order]
+        if reverse:
+            # 뒤집어서 안정 정렬한 뒤 다시 뒤집어야 같은 값끼리 이전 순서가 유지됨
+            perm = len(key) - 1 - np.argsort(key[::-1], kind='stable')[::-1]
+        else:
+            perm = np.argsort(key, kind='stable')
+        self.order = self.order[perm]
+        if col != '순위':
+            self.ranks[self.order] = np.arange(1, len(self.order) + 1)
+
+class VirtualTable:
+    """
+    보이는 행 수만큼만 Treeview 항목을 만들고, 스크롤하면 항목의 값만 바꿔 표시하는 표.
+    전체 행은 메모리의 모델(rows)에만 있으므로 행 수와 관계없이 표시 비용이 일정합니다.
+    rows는 len()과 위치 인덱싱으로 (값 튜플, 태그 튜플)을 돌려주는 시퀀스입니다.
+    """
+    def __init__(self, parent, columns, height=15):
+        self.tree = ttk.Treeview(parent, columns=columns, show='headings', height=height)
+        # 스크롤바는 Treeview가 아니라 모델 위치를 조절
+        self.scrollbar = ttk.Scrollbar(parent, orient='vertical', command=self.yview)
+        self.rows = []     # [(값 튜플, 태그 튜플)]
+        self.offset = 0    # 맨 위에 보이는 행의 모델 위치
+        self.visible = height
+        self._items = []   # 화면에 표시 중인 Treeview 항목 (재사용)
+        
+        self.tree.bind('<Configure>', self._on_configure)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-3))  # Linux 휠
+        self.tree.bind('<Button-5>', lambda e: self.scroll(3))
+        self.tree.bind('<Prior>', lambda e: self.scroll(-self.visible))
+        self.tree.bind('<Next>', lambda e: self.scroll(self.visible))
+        self.tree.bind('<Home>', lambda e: self._move_to(0))
+        self.tree.bind('<End>', lambda e: self._move_to(len(self.rows)))
+        
+    def set_rows(self, rows, keep_position=False):
+        """표시할 전체 행 설정 (keep_position이 False면 맨 위로 이동)"""
+        self.rows = rows
+        if not keep_position:
+            self.offset = 0
+        self._move_to(self.offset, force=True)
+        
+    def refresh(self):
+        """현재 위치의 행들로 화면 항목 갱신"""
+        count = max(0, min(self.visible, len(self.rows) - self.offset))
+        while len(self._items) < count:
+            self._items.append(self.tree.insert('', 'end'))
+        if len(self._items) > count:
+            self.tree.delete(*self._items[count:])
+            del self._items[count:]
+            
+        for position, item in enumerate(self._items, self.offset):
+            values, tags = self.rows[position]
+            self.tree.item(item, values=values, tags=tags)
+            
+        total = len(self.rows)
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + count) / total)
+        else:
+            self.scrollbar.set(0, 1)
+            
+    def scroll(self, amount):
+        self._move_to(self.offset + amount)
+        return 'break'
+        
+    def _move_to(self, offset, force=False):
+        offset = max(0, min(offset, len(self.rows) - self.visible))
+        if offset != self.offset or force:
+            self.offset = offset
+            # 항목이 다른 행을 표시하게 되므로 선택 해제
+            self.tree.selection_remove(self.tree.selection())
+            self.refresh()
+        return 'break'
+        
+    def yview(self, *args):
+        """스크롤바 명령 처리 ('moveto' 비율 / 'scroll' 개수 단위)"""
+        if args[0] == 'moveto':
+            self._move_to(int(round(float(args[1]) * len(self.rows))))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            self.scroll(amount * self.visible if args[2] == 'pages' else amount)
+            
+    def _on_mousewheel(self, event):
+        return self.scroll(-3 if event.delta > 0 else 3)
+        
+    def _on_configure(self, event):
+        """창 크기가 바뀌면 보이는 행 수를 다시 계산"""
+        style = ttk.Style()
+        row_height = int(style.lookup('Treeview', 'rowheight') or 20)
+        bbox = self.tree.bbox(self._items[0]) if self._items else None
+        header_height = bbox[1] if bbox else row_height + 5
+        visible = max(1, (event.height - header_height) // row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self._move_to(self.offset, force=True)
+
+class DebugPanel:
+    """분석 단계별 측정 결과를 보여주는 창 (F12)"""
+    def __init__(self, parent, data_analyzer):
+        self.data_analyzer = data_analyzer
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("분석 성능 측정")
+        self.dialog.geometry("760x420")
+        self.dialog.transient(parent)
+        
+        self.setup_ui()
+        self.refresh()
+        
+    def setup_ui(self):
+        frame = ttk.Frame(self.dialog, padding="10")
+        frame.pack(expand=True, fill='both')
+        
+        options = ttk.Frame(frame)
+        options.pack(fill='x', pady=(0, 10))
+        
+        self.profiling_var = tk.BooleanVar(value=self.data_analyzer.profiling)
+        ttk.Checkbutton(options, text="단계별 측정 사용", variable=self.profiling_var,
+                        command=self.on_option_changed).pack(side='left')
+        self.memory_var = tk.BooleanVar(value=self.data_analyzer.profile_memory)
+        ttk.Checkbutton(options, text="메모리 측정 (분석이 느려짐)", variable=self.memory_var,
+                        command=self.on_option_changed).pack(side='left', padx=(20, 0))
+        
+        ttk.Button(options, text="로그 파일로 저장", command=self.save_log).pack(side='right')
+        ttk.Button(options, text="지우기", command=self.clear).pack(side='right', padx=(0, 10))
+        ttk.Button(options, text="새로고침", command=self.refresh).pack(side='right', padx=(0, 10))
+        
+        self.text = tk.Text(frame, wrap='none', font=('Consolas', 9), state='disabled')
+        scrollbar = ttk.Scrollbar(frame, orient='vertical', command=self.text.yview)
+        self.text.configure(yscrollcommand=scrollbar.set)
+        self.text.pack(side='left', expand=True, fill='both')
+        scrollbar.pack(side='right', fill='y')
+        
+    def on_option_changed(self):
+        self.data_analyzer.profiling = self.profiling_var.get()
+        self.data_analyzer.profile_memory = self.memory_var.get()
+        
+    def refresh(self):
+        """최근 측정 결과를 최신순으로 표시"""
+        profiles = list(self.data_analyzer.profiles)
+        if profiles:
+            content = "\n\n".join(profile.format_text() for profile in reversed(profiles))
+        elif self.data_analyzer.profiling:
+            content = "측정 결과가 없습니다. 파일을 분석하면 여기에 표시됩니다."
+        else:
+            content = "'단계별 측정 사용'을 선택한 뒤 파일을 분석하세요."
+            
+        self.text.config(state='normal')
+        self.text.delete('1.0', 'end')
+        self.text.insert('1.0', content)
+        self.text.config(state='disabled')
+        
+    def clear(self):
+        self.data_analyzer.profiles.clear()
+        self.refresh()
+        
+    def save_log(self):
+        """측정 결과를 로그 파일에 추가 (한 줄에 JSON 하나)"""
+        from tkinter import filedialog
+        
+        profiles = list(self.data_analyzer.profiles)
+        if not profiles:
+            messagebox.showinfo("알림", "저장할 측정 결과가 없습니다.", parent=self.dialog)
+            return
+        path = filedialog.asksaveasfilename(parent=self.dialog, title="측정 결과 저장",
+                                            initialfile="analysis_profile.log",
+                                            defaultextension=".log",
+                                            filetypes=[("Log files", "*.log"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            for profile in profiles:
+                profile.dump(path)
+        except OSError as e:
+            messagebox.showerror("오류", f"로그 파일 저장 실패: {e}", parent=self.dialog)
+            return
+        messagebox.showinfo("저장 완료", f"측정 결과 {len(profiles)}건을 저장했습니다.\n{path}", parent=self.dialog)
+
 class MainUI:
-    def __init__(self, root, file_handler, data_analyzer, version="N/A"):
+    def __init__(self, root, file_handler, data_analyzer, version="N/A", ledger=None):
         self.root = root
         self.file_handler = file_handler
         self.data_analyzer = data_analyzer
         self.version = version
+        self.ledger = ledger  # 거래 원장 (선택 기능, 없으면 None)
         self.sort_state = {}  # 정렬 상태 저장
+        self._analyzed_file = None  # 마지막으로 분석 결과를 표시한 파일
+        self._ledger_mode = False  # 현재 결과가 거래 원장 기준인지 여부
+        self._debug_panel = None
+        
+        # 작업 스레드의 결과는 이 대기열로만 메인 스레드에 전달 (작업 스레드에서 root.after를 호출하지 않음)
+        self.main_queue = MainThreadQueue(self.root).start()
+        
+        # 분석/원장 추가 작업 (새 작업이 시작되면 이전 작업은 취소되고 결과는 버려짐)
+        self.jobs = JobManager(self.main_queue.post)
         
         # 드래그 앤 드롭 지연 로딩
         self._tkdnd = None
@@ -62,6 +422,28 @@ class MainUI:
         self.setup_window()
         self.setup_ui()
         
+        # 분석 성능 측정 창
+        self.root.bind('<F12>', self.show_debug_panel)
+        
+    def finish_startup(self):
+        """
+        첫 화면이 표시된 뒤 호출: 시작 경로에서 뺀 무거운 작업을 시작합니다.
+        (pandas/달력 모듈 미리 불러오기, 이전 원장 결과 조회)
+        모듈 로딩과 원장 조회는 백그라운드에서 하고, 위젯 생성과 결과 표시만 메인 스레드에서 합니다.
+        """
+        # 사용자가 파일을 고르는 동안 백그라운드에서 pandas를 불러옴
+        self.data_analyzer.prewarm()
+        threading.Thread(target=self._prewarm_date_entries, daemon=True).start()
+        
+        # 이전에 만든 원장이 있으면 CSV를 읽지 않고 원장 결과를 표시 (exists()는 파일 존재만 확인)
+        if self.ledger and self.ledger.exists():
+            self.show_ledger()
+            
+    def _prewarm_date_entries(self):
+        """작업 스레드에서 tkcalendar(babel 포함)를 불러온 뒤 날짜 위젯 생성은 메인 스레드에 예약"""
+        import tkcalendar # 모듈 로딩만 (위젯은 메인 스레드에서 생성)
+        self.main_queue.post(self._ensure_date_entries)
+        
     def _load_tkdnd(self):
         """tkinterdnd2 지연 로딩"""
         if self._tkdnd is None:
@@ -75,6 +457,14 @@ class MainUI:
                 return False
         return True
         
+    def show_debug_panel(self, event=None):
+        """분석 단계별 측정 창 열기 (이미 열려 있으면 앞으로 가져와 새로고침)"""
+        if self._debug_panel and self._debug_panel.dialog.winfo_exists():
+            self._debug_panel.refresh()
+            self._debug_panel.dialog.lift()
+            return
+        self._debug_panel = DebugPanel(self.root, self.data_analyzer)
+        
     def setup_window(self):
         self.root.title("주식 평가손익 분석기")
         self.root.geometry("800x600")
@@ -127,21 +517,22 @@ class MainUI:
                                      command=self.analyze_file, state='disabled')
         self.analyze_btn.grid(row=1, column=2, sticky=tk.EW)
         
-        # 날짜 필터 영역
-        date_frame = ttk.Frame(file_frame)
-        date_frame.grid(row=2, column=0, columnspan=5, pady=(10, 0), sticky=tk.W) # columnspan 3 -> 5
-
-        ttk.Label(date_frame, text="시작일:").grid(row=0, column=0, padx=(0, 5))
-        self.start_date_entry = DateEntry(date_frame, width=12, background='darkblue',
-                                      foreground='white', borderwidth=2, locale='ko_KR') # DateEntry 사용
-        self.start_date_entry.grid(row=0, column=1)
-        # ttk.Label(date_frame, text="(YYYY-MM-DD)").grid(row=0, column=2, padx=(2, 20)) # 제거
+        if self.ledger:
+            self.ledger_add_btn = ttk.Button(file_frame, text="원장에 추가",
+                                            command=self.import_to_ledger, state='disabled')
+            self.ledger_add_btn.grid(row=1, column=3, padx=(10, 0), sticky=tk.EW)
+            
+            ledger_show_btn = ttk.Button(file_frame, text="원장 보기", command=self.show_ledger)
+            ledger_show_btn.grid(row=1, column=4, padx=(10, 0), sticky=tk.EW)
+        
+        # 날짜 필터 영역 (날짜 입력 위젯은 첫 화면 표시 후 _ensure_date_entries에서 생성)
+        self.date_frame = ttk.Frame(file_frame)
+        self.date_frame.grid(row=2, column=0, columnspan=5, pady=(10, 0), sticky=tk.W) # columnspan 3 -> 5
 
-        ttk.Label(date_frame, text="종료일:").grid(row=0, column=2, padx=(20, 5)) # column 3 -> 2, padx 조정
-        self.end_date_entry = DateEntry(date_frame, width=12, background='darkblue',
-                                    foreground='white', borderwidth=2, locale='ko_KR') # DateEntry 사용
-        self.end_date_entry.grid(row=0, column=3) # column 4 -> 3
-        # ttk.Label(date_frame, text="(YYYY-MM-DD)").grid(row=0, column=5) # 제거
+        ttk.Label(self.date_frame, text="시작일:").grid(row=0, column=0, padx=(0, 5))
+        ttk.Label(self.date_frame, text="종료일:").grid(row=0, column=2, padx=(20, 5)) # column 3 -> 2, padx 조정
+        self.start_date_entry = None
+        self.end_date_entry = None
 
         # 현재 파일 표시
         self.file_label = ttk.Label(file_frame, text="선택된 파일: 없음")
@@ -156,13 +547,32 @@ class MainUI:
         file_frame.columnconfigure(3, weight=1) # 추가
         file_frame.columnconfigure(4, weight=1) # 추가
         
+    def _ensure_date_entries(self):
+        """날짜 입력 위젯 생성 (tkcalendar는 babel까지 불러와 느리므로 처음 필요할 때 불러옴)"""
+        if self.start_date_entry is not None:
+            return
+        from tkcalendar import DateEntry # tkcalendar에서 DateEntry 임포트
+        
+        self.start_date_entry = DateEntry(self.date_frame, width=12, background='darkblue',
+                                      foreground='white', borderwidth=2, locale='ko_KR') # DateEntry 사용
+        self.start_date_entry.grid(row=0, column=1)
+        
+        self.end_date_entry = DateEntry(self.date_frame, width=12, background='darkblue',
+                                    foreground='white', borderwidth=2, locale='ko_KR') # DateEntry 사용
+        self.end_date_entry.grid(row=0, column=3) # column 4 -> 3
+        
+        # 날짜 변경 시 일별 집계 인덱스로 결과 즉시 갱신
+        self.start_date_entry.bind('<<DateEntrySelected>>', self.on_date_changed)
+        self.end_date_entry.bind('<<DateEntrySelected>>', self.on_date_changed)
+        
     def setup_result_area(self, parent):
         result_frame = ttk.LabelFrame(parent, text="분석 결과 (헤더를 클릭하여 정렬)", padding="10")
         result_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 20))
         
-        # 트리뷰 (테이블)
+        # 트리뷰 (테이블, 보이는 행만 표시)
         columns = ('순위', '종목명', '평가손익', '매도 횟수')
-        self.tree = ttk.Treeview(result_frame, columns=columns, show='headings', height=15)
+        self.table = VirtualTable(result_frame, columns, height=15)
+        self.tree = self.table.tree
         
         # 헤더 설정 및 정렬 이벤트 바인딩
         for col in columns:
@@ -174,12 +584,8 @@ class MainUI:
         self.tree.column('평가손익', width=150, anchor='e')
         self.tree.column('매도 횟수', width=100, anchor='center')
         
-        # 스크롤바
-        scrollbar = ttk.Scrollbar(result_frame, orient='vertical', command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        
         self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.table.scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         
         # 통계 정보
         self.stats_label = ttk.Label(result_frame, text="")
@@ -192,34 +598,31 @@ class MainUI:
         """상태바 설정"""
         version_label = ttk.Label(self.root, text=f"Version: {self.version}", relief='sunken', anchor='e')
         version_label.grid(row=1, column=0, sticky='ew', padx=5, pady=2)
+        
+    def show_update_notice(self, update_info, on_update):
+        """새 버전 알림 표시 (창을 막지 않음, 업데이트 버튼을 누르면 on_update 호출)"""
+        notice = tk.Frame(self.root, bg='#fff3cd', relief='ridge', bd=1)
+        notice.grid(row=2, column=0, sticky='ew', padx=5, pady=(0, 2))
+        notice.columnconfigure(0, weight=1)
+        
+        tk.Label(notice, text=f"새로운 버전 ({update_info['latest_version']})을 사용할 수 있습니다.",
+                 bg='#fff3cd', anchor='w').grid(row=0, column=0, sticky='ew', padx=5)
+        
+        def update_now():
+            notice.destroy()
+            on_update()
+            
+        ttk.Button(notice, text="업데이트", command=update_now).grid(row=0, column=1, padx=2, pady=2)
+        ttk.Button(notice, text="닫기", command=notice.destroy).grid(row=0, column=2, padx=2, pady=2)
 
     def sort_column(self, col):
         """컬럼 헤더를 클릭하여 테이블 정렬"""
         reverse = self.sort_state.get(col, False)
         
-        # 데이터 가져오기
-        data = [(self.tree.set(item, col), item) for item in self.tree.get_children('')]
-        
-        # 데이터 타입에 따른 정렬
-        if col in ['평가손익', '매도 횟수', '순위']:
-            # 숫자 형식 정리 및 변환
-            def safe_float(s):
-                try:
-                    return float(s.replace('+', '').replace('원', '').replace('$', '').replace(',', ''))
-                except (ValueError, AttributeError):
-                    return 0
-            data.sort(key=lambda x: safe_float(x[0]), reverse=reverse)
-        else: # 문자열 정렬
-            data.sort(key=lambda x: x[0], reverse=reverse)
-            
-        # 정렬된 순서대로 아이템 재배치
-        for index, (_, item) in enumerate(data):
-            self.tree.move(item, '', index)
-            
-        # 순위 재설정 (정렬 기준이 순위가 아닐 때)
-        if col != '순위':
-            for index, (_, item) in enumerate(data):
-                self.tree.set(item, '순위', index + 1)
+        # 모델의 원시 값으로 정렬 (순위 재설정 포함) 후 보이는 행만 한 번에 다시 그림
+        if self.table.rows:
+            self.table.rows.sort(col, reverse)
+            self.table.refresh()
 
         # 다음 정렬 순서 설정
         self.sort_state[col] = not reverse
@@ -283,15 +686,23 @@ class MainUI:
             
     def update_file_display(self, file_path):
         """파일 표시 업데이트 및 날짜 필드 자동 채우기"""
+        # 이전 파일의 분석 결과는 더 이상 필요 없음
+        self.jobs.cancel()
         filename = self.file_handler.get_filename(file_path)
         self.file_label.config(text=f"선택된 파일: {filename}")
+        self._ledger_mode = False
         self.analyze_btn.config(state='normal')
+        if self.ledger:
+            self.ledger_add_btn.config(state='normal')
         self.drop_area.config(text=f"파일 로드됨: {filename}\n분석 버튼을 클릭하세요", 
                              bg='#d4edda')
         
         # 날짜 필드 자동 채우기
-        min_date, max_date = self.data_analyzer.get_date_range(file_path)
+        self.set_date_range(*self.data_analyzer.get_date_range(file_path))
         
+    def set_date_range(self, min_date, max_date):
+        """DateEntry에 날짜 범위 설정 (YYYY-MM-DD, 없으면 비움)"""
+        self._ensure_date_entries()
         if min_date and max_date:
             # DateEntry 위젯에 날짜 설정
             # DateEntry의 set_date 메서드는 datetime.date 객체를 기대한다.
@@ -303,88 +714,178 @@ class MainUI:
             self.start_date_entry.set_date(None)
             self.end_date_entry.set_date(None)
                              
+    def get_date_filter(self):
+        """DateEntry에서 (시작일, 종료일)을 YYYY-MM-DD 문자열로 가져오기"""
+        self._ensure_date_entries()
+        start_date = self.start_date_entry.get_date().strftime('%Y-%m-%d') if self.start_date_entry.get_date() else ""
+        end_date = self.end_date_entry.get_date().strftime('%Y-%m-%d') if self.end_date_entry.get_date() else ""
+        return start_date, end_date
+        
+    def on_date_changed(self, event=None):
+        """날짜 변경 시 이미 분석한 파일이면 일별 집계 인덱스로 결과를 즉시 갱신"""
+        if self._ledger_mode:
+            self.jobs.cancel()
+            self.show_ledger_results(*self.get_date_filter())
+            return
+            
+        file_path = self.file_handler.current_file
+        if not file_path or file_path != self._analyzed_file:
+            return
+            
+        start_date, end_date = self.get_date_filter()
+        if not (start_date or end_date):
+            return # 기간 없는 분석은 전체 거래 기준이므로 분석 버튼으로 실행
+            
+        results = self.data_analyzer.query_date_range(file_path, start_date, end_date)
+        if results is not None:
+            # 이전 기간으로 진행 중인 분석 결과가 나중에 덮어쓰지 않도록 취소
+            self.jobs.cancel()
+            self.update_results(results)
+            
     def analyze_file(self):
         """파일 분석 (백그라운드)"""
-        if not self.file_handler.current_file:
+        file_path = self.file_handler.current_file
+        if not file_path:
             messagebox.showerror("오류", "파일을 먼저 선택하세요.")
             return
 
         # 날짜 값 가져오기 (DateEntry에서 날짜 가져오기)
-        start_date = self.start_date_entry.get_date().strftime('%Y-%m-%d') if self.start_date_entry.get_date() else ""
-        end_date = self.end_date_entry.get_date().strftime('%Y-%m-%d') if self.end_date_entry.get_date() else ""
+        start_date, end_date = self.get_date_filter()
             
         # 진행률 대화상자 표시
-        progress_dialog = ProgressDialog(self.root, "파일 분석 중...")
-        
-        def analyze_worker():
-            try:
-                # 분석 실행
-                results = self.data_analyzer.analyze_csv(
-                    self.file_handler.current_file,
-                    progress_callback=progress_dialog.update,
-                    start_date=start_date,
-                    end_date=end_date
-                )
-                
-                # UI 업데이트 (메인 스레드에서)
-                self.root.after(0, lambda: self.update_results(results, progress_dialog))
-                
-            except Exception as e:
-                self.root.after(0, lambda: self.handle_error(str(e), progress_dialog))
-                
-        # 백그라운드에서 분석 실행
-        thread = threading.Thread(target=analyze_worker, daemon=True)
-        thread.start()
+        progress_dialog = ProgressDialog(self.root, "파일 분석 중...", on_cancel=self.jobs.cancel)
+        
+        def analyze_worker(cancel_token):
+            return self.data_analyzer.analyze_csv(
+                file_path,
+                progress_callback=progress_dialog.report,
+                start_date=start_date,
+                end_date=end_date,
+                cancel_token=cancel_token
+            )
+            
+        # 백그라운드에서 분석 실행 (UI 업데이트는 메인 스레드에서, 가장 최근 작업의 결과만)
+        self.jobs.submit(
+            analyze_worker,
+            on_done=lambda results: self.update_results(results, file_path=file_path),
+            on_error=lambda e: self.handle_error(str(e)),
+            cleanup=progress_dialog.close
+        )
+        
+    def import_to_ledger(self):
+        """현재 파일의 거래를 원장에 추가 (백그라운드, 이미 있는 거래는 제외)"""
+        file_path = self.file_handler.current_file
+        if not file_path:
+            messagebox.showerror("오류", "파일을 먼저 선택하세요.")
+            return
+            
+        progress_dialog = ProgressDialog(self.root, "원장에 추가 중...", on_cancel=self.jobs.cancel)
+        
+        # 취소하면 이번 가져오기 전체가 되돌려짐
+        self.jobs.submit(
+            lambda cancel_token: self.ledger.import_csv(
+                file_path, progress_callback=progress_dialog.report, cancel_token=cancel_token),
+            on_done=self.on_ledger_imported,
+            on_error=lambda e: self.handle_error(str(e)),
+            cleanup=progress_dialog.close
+        )
+        
+    def on_ledger_imported(self, stats, progress_dialog=None):
+        """원장 추가 결과 안내 후 원장 기준 결과 표시"""
+        if progress_dialog:
+            progress_dialog.close()
+        messagebox.showinfo(
+            "원장 추가 완료",
+            f"읽은 행: {stats['rows_read']:,}개\n"
+            f"추가된 거래: {stats['rows_inserted']:,}개\n"
+            f"이미 있는 거래(제외): {stats['duplicates']:,}개"
+            + (f"\n종목명/코드가 없는 행(제외): {stats['skipped']:,}개" if stats.get('skipped') else "")
+        )
+        self.show_ledger()
+        
+    def show_ledger(self):
+        """
+        원장 전체 기간과 결과를 표시 (모두 SQL 집계로 계산하므로 CSV를 읽지 않음)
+        조회는 백그라운드에서 하고 결과는 메인 스레드에서 표시합니다. (그사이 분석을 시작하면 버려짐)
+        """
+        def ledger_worker(cancel_token):
+            count = self.ledger.count()
+            date_range = self.ledger.get_date_range()
+            cancel_token.check()
+            return count, date_range, self.ledger.results(), self.ledger.get_statistics()
+            
+        self.jobs.submit(
+            ledger_worker,
+            on_done=self.on_ledger_loaded,
+            on_error=lambda e: print(f"거래 원장 읽기 실패: {e}")
+        )
+        
+    def on_ledger_loaded(self, snapshot):
+        """원장 조회 결과 (거래 수, 날짜 범위, 결과, 통계) 표시"""
+        count, date_range, results, stats = snapshot
+        self.set_date_range(*date_range)
+        self._ledger_mode = True
+        self.file_label.config(text=f"거래 원장: {count:,}건")
+        self.update_results(results, stats=stats)
+        
+    def show_ledger_results(self, start_date=None, end_date=None):
+        """원장에서 (기간) 결과와 통계를 조회하여 표시"""
+        results = self.ledger.results(start_date, end_date)
+        self.update_results(results, stats=self.ledger.get_statistics(start_date, end_date))
+        
+    def update_results(self, results, progress_dialog=None, file_path=None, stats=None):
+        """결과 업데이트 (stats가 없으면 분석 결과로 통계 계산)"""
+        if progress_dialog:
+            progress_dialog.close()
+        if file_path:
+            self._analyzed_file = file_path
+            self._ledger_mode = False
         
-    def update_results(self, results, progress_dialog):
-        """결과 업데이트"""
-        progress_dialog.close()
+        # 취소된 작업이 분석기의 결과를 덮어썼을 수 있으므로 표시하는 결과로 맞춤
+        self.data_analyzer.results = results
         
-        # 기존 결과 삭제
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-            
-        # 새 결과 추가
-        for i, (stock_name, profit, sell_count, currency_type) in enumerate(results, 1):
-            if currency_type == 'USD':
-                profit_str = f"${profit:,.2f}" # 달러는 소수점 둘째 자리까지
-                if profit > 0:
-                    profit_str = f"+{profit_str}"
-            else: # KRW
-                profit_str = f"{profit:,.0f}원"
-                if profit > 0:
-                    profit_str = f"+{profit_str}"
-                
-            tag = 'profit' if profit >= 0 else 'loss'
-            values = (i, stock_name, profit_str, sell_count)
-            self.tree.insert('', 'end', values=values, tags=(tag,))
+        # 새 결과로 모델 구성 (화면에는 보이는 행만 표시)
+        self.table.set_rows(ResultTableModel(results))
             
         # 색상 태그 설정
         self.tree.tag_configure('profit', foreground='red')
         self.tree.tag_configure('loss', foreground='blue')
         
         # 통계 정보 업데이트
-        stats = self.data_analyzer.get_statistics()
+        if stats is None:
+            stats = self.data_analyzer.get_statistics()
         stats_text = f"총 {stats['total_stocks']}개 종목"
         
-        # KRW 통계가 있을 경우
-        if stats['total_profit_KRW'] != 0 or stats['profit_count_KRW'] != 0 or stats['loss_count_KRW'] != 0:
-            stats_text += f" | (KRW) 수익: {stats['profit_count_KRW']}개, 손실: {stats['loss_count_KRW']}개, 총 평가손익: {stats['total_profit_KRW']:,.0f}원"
-            
-        # USD 통계가 있을 경우
-        if stats['total_profit_USD'] != 0 or stats['profit_count_USD'] != 0 or stats['loss_count_USD'] != 0:
-            stats_text += f" | (USD) 수익: {stats['profit_count_USD']}개, 손실: {stats['loss_count_USD']}개, 총 평가손익: ${stats['total_profit_USD']:,.2f}"
+        # 거래가 있는 통화별로 표시 (KRW는 원 단위, 그 외는 소수점 둘째 자리까지)
+        for currency in stats.get('currencies', ('KRW', 'USD')):
+            total = stats[f'total_profit_{currency}']
+            if total == 0 and stats[f'profit_count_{currency}'] == 0 and stats[f'loss_count_{currency}'] == 0:
+                continue
+            if currency == 'KRW':
+                total_str = f"{total:,.0f}원"
+            elif currency == 'USD':
+                total_str = f"${total:,.2f}"
+            else:
+                total_str = f"{total:,.2f} {currency}"
+            stats_text += f" | ({currency}) 수익: {stats[f'profit_count_{currency}']}개, 손실: {stats[f'loss_count_{currency}']}개, 총 평가손익: {total_str}"
+            win_rate = stats.get(f'win_rate_{currency}')
+            if win_rate is not None:
+                stats_text += f", 승률: {win_rate:.1%}"
 
         self.stats_label.config(text=stats_text)
         
+        if self._debug_panel and self._debug_panel.dialog.winfo_exists():
+            self._debug_panel.refresh()
+            
         # 초기 정렬 상태 설정
         self.sort_state = {}
         self.sort_column('평가손익') # 기본으로 평가손익 내림차순 정렬
         self.sort_column('평가손익') # 한번 더 호출하여 내림차순(▲)으로 표시
         
-    def handle_error(self, error_msg, progress_dialog):
+    def handle_error(self, error_msg, progress_dialog=None):
         """에러 처리"""
-        progress_dialog.close()
+        if progress_dialog:
+            progress_dialog.close()
         messagebox.showerror("오류", f"파일 분석 중 오류가 발생했습니다:\n{error_msg}")
 
 class UpdateProgressDialog:
@@ -400,6 +901,9 @@ class UpdateProgressDialog:
         
         self.setup_ui()
         
+        # 다운로드 스레드는 report_download()로만 진행률을 보고 (화면 갱신은 메인 스레드에서)
+        self.channel = ProgressChannel(self.dialog, self.update_progress).start()
+        
     def center_dialog(self, parent):
         parent.update_idletasks()
         x = parent.winfo_x() + (parent.winfo_width() // 2) - 175
@@ -418,9 +922,35 @@ class UpdateProgressDialog:
         self.progress.start(10)
         
     def update_text(self, text):
-        self.status_label.config(text=text)
-        self.dialog.update()
+        """상태 문구 변경 (작업 스레드에서 호출 가능, 표시는 채널을 통해 메인 스레드에서)"""
+        self.channel.report(None, text)
+        
+    def report_download(self, done, total, rate, eta):
+        """다운로드 진행률 보고 (작업 스레드에서 호출 가능, auto_updater.TransferProgress 콜백 형식)"""
+        mb = 1024 * 1024
+        text = f"업데이트 파일 다운로드 중...\n{done / mb:,.1f}"
+        if total:
+            text += f" / {total / mb:,.1f}"
+        text += " MB"
+        if rate:
+            text += f" ({rate / mb:,.1f} MB/s"
+            if eta is not None:
+                minutes, seconds = divmod(int(eta), 60)
+                text += f", 남은 시간 {minutes}:{seconds:02d}"
+            text += ")"
+        self.channel.report(100 * done / total if total else None, text)
+        
+    def update_progress(self, value, text=""):
+        """진행률 표시 (메인 스레드 전용). 전체 크기를 알면 막대를 진행률 표시로 전환"""
+        if value is not None:
+            if str(self.progress['mode']) != 'determinate':
+                self.progress.stop()
+                self.progress.config(mode='determinate', maximum=100)
+            self.progress['value'] = value
+        if text:
+            self.status_label.config(text=text)
         
     def close(self):
+        self.channel.close()
         self.progress.stop()
         self.dialog.destroy()
\ No newline at end of file